@@ -0,0 +1,55 @@
+"""
+Сравнение разбора страницы как str (тело ответа сначала целиком декодируется, как делает 'response.text()')
+и как bytes (режим 'raw_body': декодируются только найденные куски). Корпус - сохраненные страницы из
+tests/parser/ebayPages. Для каждой страницы выводится время разбора и пиковая память по tracemalloc.
+
+Запуск: python -m benchmarks.bench_bytes_parse [кол-во повторов]
+"""
+import sys
+import time
+import logging
+import tracemalloc
+from pathlib import Path
+from checker_plus.parser import parse_page
+
+PAGES_DIR = Path(__file__).parent.parent / "tests" / "parser" / "ebayPages"
+FIELDS = {
+    "supplier_price": True, "supplier_shipping": True, "supplier_qty": True, "supplier_days": True,
+    "supplier_name": True, "part_number": True, "product_dimensions": True, "color": True, "title": True
+}
+
+
+def parse_str(body: bytes):
+    return parse_page(body.decode("utf-8"), "drop", FIELDS)
+
+
+def parse_bytes(body: bytes):
+    return parse_page(body, "drop", FIELDS)
+
+
+def measure(func, body: bytes, repeat: int) -> tuple[float, float]:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(body)
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+
+    tracemalloc.start()
+    func(body)
+    peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(repeat: int = 10):
+    logging.getLogger("EbayParser").setLevel(logging.ERROR)
+    for path in sorted(PAGES_DIR.glob("*.html")):
+        body = path.read_bytes()
+        assert parse_str(body) == parse_bytes(body)
+        str_time, str_peak = measure(parse_str, body, repeat)
+        bytes_time, bytes_peak = measure(parse_bytes, body, repeat)
+        print(f"{path.name:32} {len(body):>9} bytes  "
+              f"str: {str_time:8.3f} ms {str_peak:6.2f} MB  bytes: {bytes_time:8.3f} ms {bytes_peak:6.2f} MB")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,68 @@
+"""
+Сравнение пропускной способности запросов: новая 'aiohttp.ClientSession' на каждую ссылку (старое поведение
+'Checker.request') против общей сессии из 'SessionManager'. Запросы идут на локальный mock сервер.
+
+Запуск: python -m benchmarks.bench_session [кол-во запросов] [одновременных запросов]
+"""
+import sys
+import time
+import asyncio
+import aiohttp
+from aiohttp import web
+from checker_plus.checker import Checker
+
+PAGE = "<html><head><title>Mock Item | eBay</title></head><body>" + "x" * 50_000 + "</body></html>"
+
+
+async def start_mock_server() -> tuple[web.AppRunner, str]:
+    async def handler(_request):
+        return web.Response(text=PAGE, content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/itm/{item_id}", handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+async def request_new_session(link: str) -> str:
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
+        async with session.get(link) as response:
+            return await response.text()
+
+
+async def run(fetch, links: list, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(link):
+        async with semaphore:
+            return await fetch(link)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(bounded(link) for link in links))
+    return len(links) / (time.perf_counter() - start)
+
+
+async def main(total: int = 2000, concurrency: int = 50):
+    runner, base_url = await start_mock_server()
+    links = [f"{base_url}/itm/{i}" for i in range(total)]
+
+    checker = Checker(proxies=[], user_agents=[], shop_config={"session": {"limit": concurrency}},
+                      exceptions=[], exceptions_repricer=[])
+    try:
+        before = await run(request_new_session, links, concurrency)
+        after = await run(lambda link: checker.request(link, None), links, concurrency)
+    finally:
+        await checker.session_manager.close()
+        await runner.cleanup()
+
+    print(f"requests={total} concurrency={concurrency}")
+    print(f"session per request: {before:8.1f} req/s")
+    print(f"shared session:      {after:8.1f} req/s  (x{after / before:.2f})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*(int(arg) for arg in sys.argv[1:3])))
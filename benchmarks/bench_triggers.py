@@ -0,0 +1,53 @@
+"""
+Сравнение поиска триггеров: пять отдельных вызовов 'Parser.find' с 're.IGNORECASE' против одного вызова
+'TriggerScanner'. Корпус - сохраненные страницы из tests/parser/ebayPages.
+
+Запуск: python -m benchmarks.bench_triggers [кол-во повторов]
+"""
+import sys
+import time
+from pathlib import Path
+from checker_plus.parser import EbayParser
+
+PAGES_DIR = Path(__file__).parent.parent / "tests" / "parser" / "ebayPages"
+
+
+def look_separately(page: str) -> tuple:
+    parser = EbayParser(page)
+    parser._look_out_of_stock_triggers()
+    parser._look_pick_up_trigger()
+    parser._look_catalog_trigger()
+    parser._look_not_shipping_to_usa_trigger("drop")
+    parser._look_variation_trigger()
+    return parser.variation, parser._check_exceptions()
+
+
+def look_scanner(page: str) -> tuple:
+    parser = EbayParser(page)
+    parser._look_triggers("drop")
+    return parser.variation, parser._check_exceptions()
+
+
+def measure(func, pages: list, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            func(page)
+    return (time.perf_counter() - start) / (repeat * len(pages)) * 1000
+
+
+def main(repeat: int = 20):
+    pages = [path.read_text(encoding="utf-8") for path in sorted(PAGES_DIR.glob("*.html"))]
+    for page in pages:
+        # Вариация важнее исключений, поэтому сравниваем исключение только когда вариации нет.
+        separate, single = look_separately(page), look_scanner(page)
+        assert separate[0] == single[0] and (separate[0] or separate[1] == single[1])
+
+    for path, page in zip(sorted(PAGES_DIR.glob("*.html")), pages):
+        before = measure(look_separately, [page], repeat)
+        after = measure(look_scanner, [page], repeat)
+        print(f"{path.name:32} {len(page):>9} chars  separate: {before:8.3f} ms  scanner: {after:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
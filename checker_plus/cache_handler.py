@@ -1,14 +1,67 @@
 import csv
 import os
+import sqlite3
 import logging
-from typing import List, Dict, Any
+import threading
+from typing import List, Dict, Any, Callable, Iterator, Sequence
+
+Converter = Callable[[str], Any]
+
+
+def _to_float(value: str) -> float | str:
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def _to_int(value: str) -> int | float | str:
+    try:
+        return int(value)
+    except ValueError:
+        return _to_float(value)
+
+
+# Типы колонок с числами. Остальные колонки читаются как строки, поэтому СКУ вида "00123" не теряют нули.
+COLUMN_TYPES: Dict[str, Converter] = {
+    "supplier_price": _to_float,
+    "supplier_shipping": _to_float,
+    "supplier_qty": _to_int,
+    "our_price": _to_float,
+    "our_shipping": _to_float,
+    "handling_time": _to_int,
+}
+
+
+def schema_from_columns(columns: dict | list) -> Dict[str, Converter]:
+    """
+    Собирает схему чтения файла по карте колонок магазина (ключ 'columns' конфигурации).
+    :param columns: Карта колонок или список колонок.
+    :return: Словарь {колонка: функция преобразования строкового значения}.
+    """
+    keys = columns if isinstance(columns, list) else list(columns.keys())
+    return {key: COLUMN_TYPES.get(key, str) for key in keys}
+
+
+def guess_type(value: str) -> int | float | str:
+    """
+    Тип значения без схемы: целое, дробное или строка.
+    """
+    return int(value) if value.isdigit() else float(value) if value.replace('.', '', 1).isdigit() else value
 
 
 class FileHandler:
-    def __init__(self, file_path: str, delete_prev: bool = False):
+    """
+    :param file_path: Путь к файлу.
+    :param delete_prev: Удалить файл, если он уже есть.
+    :param schema: Схема чтения {колонка: функция преобразования} (см. 'schema_from_columns'). Колонки не из схемы
+    читаются как строки. Без схемы тип каждого значения угадывается ('guess_type').
+    """
+    def __init__(self, file_path: str, delete_prev: bool = False, schema: Dict[str, Converter] | None = None):
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(self.__class__.__name__)
         self.path = file_path
+        self.schema = schema
 
         if delete_prev:
             self.delete_file()
@@ -23,8 +76,105 @@ class FileHandler:
     def file_exists(self) -> bool:
         return os.path.isfile(self.path)
 
+    def close(self) -> None:
+        """
+        Освобождает ресурсы файла (открытые писатели, соединения).
+        """
+
+    def _row_builder(self, headers: Sequence[str]) -> Callable[[Sequence[str]], Dict[str, Any]]:
+        """
+        Собирает один раз на файл функцию, которая превращает список значений в словарь строки. Колонки без
+        названия пропускаются.
+        """
+        indices = [i for i, header in enumerate(headers) if header]
+        names = [headers[i] for i in indices]
+        if self.schema is None:
+            return lambda values: {name: guess_type(values[i]) for name, i in zip(names, indices) if i < len(values)}
+        converters = [self.schema.get(name, str) for name in names]
+        columns = list(zip(names, converters, indices))
+        return lambda values: {name: convert(values[i]) for name, convert, i in columns if i < len(values)}
+
+
+class CSVWriter:
+    """
+    Долгоживущий писатель CSV файла: файл открыт один раз в режиме дозаписи с буфером, заголовок прочитан
+    (или записан) один раз, порядок колонок для строк собран заранее. Строки копятся в буфере и сбрасываются
+    в файл каждые 'flush_every' строк, при явном 'flush' и при 'close'.
+    :param path: Путь к файлу.
+    :param columns: Колонки для нового или пустого файла. Если в файле уже есть заголовок, используется он.
+    :param flush_every: Через сколько строк сбрасывать буфер в файл.
+    :param buffer_size: Размер буфера файла в байтах.
+    """
+    def __init__(self, path: str, columns: dict | list, flush_every: int = 100, buffer_size: int = 64 * 1024):
+        self.path = path
+        self.flush_every = flush_every
+        self.columns = self._read_header(path)
+        self.file = open(path, 'a', newline='', buffering=buffer_size)
+        self.writer = csv.writer(self.file)
+        if not self.columns:
+            self.columns = columns if isinstance(columns, list) else list(columns.keys())
+            self.writer.writerow(self.columns)
+        self.columns = tuple(self.columns)
+        self.pending = 0
+
+    @staticmethod
+    def _read_header(path: str) -> List[str] | None:
+        if not os.path.isfile(path):
+            return None
+        with open(path, 'r', newline='') as csvfile:
+            return next(csv.reader(csvfile), None)
+
+    def write(self, data: List[Dict[str, Any]]) -> None:
+        """
+        Добавляет строки в буфер. Пустые строки пропускаются.
+        """
+        columns = self.columns
+        rows = [[row_data.get(col, '') for col in columns] for row_data in data if row_data]
+        self.writer.writerows(rows)
+        self.pending += len(rows)
+        if self.pending >= self.flush_every:
+            self.flush()
+
+    def flush(self, sync: bool = False) -> None:
+        """
+        Сбрасывает буфер в файл.
+        :param sync: Дождаться записи на диск (fsync), чтобы строки пережили падение процесса.
+        """
+        self.file.flush()
+        if sync:
+            os.fsync(self.file.fileno())
+        self.pending = 0
+
+    def close(self) -> None:
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
 
 class CSV(FileHandler):
+    def __init__(self, file_path: str, delete_prev: bool = False, schema: Dict[str, Converter] | None = None):
+        super().__init__(file_path, delete_prev, schema)
+        self.writer: CSVWriter | None = None
+
+    def open_writer(self, col_map: dict | list, flush_every: int = 100) -> CSVWriter:
+        """
+        Открывает долгоживущий писатель (см. 'CSVWriter'). Пока он открыт, 'CSV.append_to_file' только дописывает
+        строки в его буфер, а 'CSV.read' сначала сбрасывает буфер в файл. Закрывается через 'CSV.close_writer'.
+        :param col_map: Колонки, если файла еще нет.
+        :param flush_every: Через сколько строк сбрасывать буфер в файл.
+        """
+        if self.writer is None:
+            self.writer = CSVWriter(self.path, col_map, flush_every)
+        return self.writer
+
+    def close_writer(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    def close(self) -> None:
+        self.close_writer()
+
     def create_file(self, columns: dict | list):
         """
         Создает CSV файл с указанными колонками.
@@ -37,26 +187,40 @@ class CSV(FileHandler):
 
         self.logger.info(f"The file has been created: {self.path}")
 
-    def read(self):
+    def read(self) -> List[Dict[str, Any]]:
         """
         Читает данные из CSV файла и возвращает их в виде списка словарей.
         """
-        data_list = []
+        return list(self.iter_rows())
 
-        with open(self.path, 'r', newline='') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                formatted_row = {
-                    key: int(value) if value.isdigit() else float(value) if value.replace('.', '', 1).isdigit() else value
-                    for key, value in row.items() if key
-                }
-                data_list.append(formatted_row)
-        return data_list
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        """
+        Читает CSV файл построчно, не держа в памяти весь файл. Значения преобразуются по 'self.schema'.
+        """
+        if self.writer is not None:
+            self.writer.flush()
 
-    def append_to_file(self, data: List[Dict[str, Any]], col_map: dict | list):
+        with open(self.path, 'r', newline='') as csvfile:
+            reader = csv.reader(csvfile)
+            headers = next(reader, None)
+            if not headers:
+                return
+            build_row = self._row_builder(headers)
+            for values in reader:
+                if values:
+                    yield build_row(values)
+
+    def append_to_file(self, data: List[Dict[str, Any]], col_map: dict | list, sync: bool = False):
         """
-        Добавляет данные в CSV файл.
+        Добавляет данные в CSV файл. Если открыт писатель ('CSV.open_writer'), строки уходят в его буфер.
+        :param sync: Дождаться записи на диск (fsync), чтобы строки пережили падение процесса.
         """
+        if self.writer is not None:
+            self.writer.write(data)
+            if sync:
+                self.writer.flush(sync=True)
+            return
+
         if not self.file_exists():
             self.create_file(col_map)
 
@@ -75,9 +239,33 @@ class CSV(FileHandler):
                     continue
                 row = [row_data.get(col, '') for col in existing_columns]
                 writer.writerow(row)
+            if sync:
+                csvfile.flush()
+                os.fsync(csvfile.fileno())
         self.logger.info(f"Data added to the file: {self.path}")
 
+    def repair(self) -> int:
+        """
+        Удаляет неполные строки, которые могли остаться после падения процесса посреди записи.
+        :return: Кол-во удаленных строк.
+        """
+        with open(self.path, 'r', newline='') as csvfile:
+            rows = list(csv.reader(csvfile))
+        if not rows:
+            return 0
+        complete = [row for row in rows[1:] if len(row) == len(rows[0])]
+        dropped = len(rows) - 1 - len(complete)
+        if dropped:
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'w', newline='') as csvfile:
+                csv.writer(csvfile).writerows([rows[0]] + complete)
+            os.replace(temp_path, self.path)
+            self.logger.warning(f"Incomplete rows removed: {dropped}")
+        return dropped
+
     def clear(self):
+        if self.writer is not None:
+            self.writer.flush()
         with open(self.path, 'r', newline='') as csvfile:
             reader = csv.DictReader(csvfile)
             fieldnames = reader.fieldnames
@@ -96,26 +284,20 @@ class TXT(FileHandler):
 
         self.logger.info(f"The file has been created: {self.path}")
 
-    def read(self):
-        data_list = []
+    def read(self) -> List[Dict[str, Any]]:
+        return list(self.iter_rows())
 
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        """
+        Читает файл построчно. Значения преобразуются по 'self.schema'.
+        """
         with open(self.path, 'r') as txt_file:
-            lines = txt_file.readlines()
-
-        if not lines:
-            return data_list
-
-        headers = lines[0].strip().split("\t")
-
-        for line in lines[1:]:
-            values = line.strip().split("\t")
-            formatted_row = {
-                headers[i]: int(values[i]) if values[i].isdigit() else float(values[i]) if values[i].replace('.', '', 1).isdigit() else values[i]
-                for i in range(len(headers))
-            }
-            data_list.append(formatted_row)
-
-        return data_list
+            headers = txt_file.readline().rstrip("\n").split("\t")
+            build_row = self._row_builder(headers)
+            for line in txt_file:
+                line = line.rstrip("\n")
+                if line:
+                    yield build_row(line.split("\t"))
 
     def append_to_file(self, data: List[Dict[str, Any]], col_map: dict):
         if not self.file_exists():
@@ -138,3 +320,165 @@ class TXT(FileHandler):
                 for key, index in file_to_data_map.items():
                     row[index] = str(row_data.get(key, ''))
                 txt_file.write("\t".join(row) + "\n")
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+class SQLite(FileHandler):
+    """
+    Хранилище результатов проверки в SQLite (режим WAL) вместо CSV файла кеша. Строки хранятся по СКУ: повторная
+    запись СКУ обновляет строку. Каждая проверка таблицы - это прогон ('SQLite.begin_run'). Для строки хранится
+    прогон, в котором она проверена последний раз, и прогон, в котором изменились ее значения, поэтому быстро
+    выбираются строки текущего прогона и только изменившиеся строки. Пока чекер пишет, таблицу можно читать
+    из другого соединения.
+    Интерфейс совпадает с 'CSV': 'create_file', 'append_to_file', 'read', 'iter_rows', 'open_writer'.
+    :param file_path: Путь к файлу базы.
+    :param delete_prev: Удалить базу, если она уже есть.
+    :param schema: Не используется: значения хранятся с исходными типами.
+    """
+    TABLE = "results"
+    SERVICE_COLUMNS = ("checked_run", "changed_run")
+    FETCH_SIZE = 1000  # Сколько строк 'SQLite.iter_rows' читает из базы за раз.
+
+    def __init__(self, file_path: str, delete_prev: bool = False, schema: Dict[str, Converter] | None = None):
+        super().__init__(file_path, delete_prev, schema)
+        # Соединение используется из разных потоков (запись идет через 'asyncio.to_thread'), но не одновременно.
+        self.connection = sqlite3.connect(file_path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value)")
+        self.connection.commit()
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'run'").fetchone()
+        self.run: int = row[0] if row else 0
+        self.columns: List[str] = self._table_columns()
+
+    def delete_file(self):
+        super().delete_file()
+        for suffix in ("-wal", "-shm"):
+            if os.path.isfile(self.path + suffix):
+                os.remove(self.path + suffix)
+
+    def file_exists(self) -> bool:
+        return os.path.isfile(self.path) and bool(self._table_columns())
+
+    def _table_columns(self) -> List[str]:
+        rows = self.connection.execute(f"PRAGMA table_info({_quote(self.TABLE)})").fetchall()
+        return [row[1] for row in rows if row[1] not in self.SERVICE_COLUMNS]
+
+    def begin_run(self) -> int:
+        """
+        Начинает новый прогон. Строки прошлых прогонов остаются и служат базой для поиска изменений.
+        :return: Номер прогона.
+        """
+        with self.lock:
+            self.run += 1
+            self.connection.execute("INSERT INTO meta (key, value) VALUES ('run', ?) "
+                                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value", (self.run,))
+            self.connection.commit()
+        return self.run
+
+    def create_file(self, columns: dict | list):
+        """
+        Создает таблицу результатов с указанными колонками или добавляет недостающие колонки. Данные прошлых
+        прогонов не удаляются. Колонка 'sku' обязательна и является первичным ключом.
+        """
+        headers = columns if isinstance(columns, list) else list(columns.keys())
+        if "sku" not in headers:
+            raise ValueError("Result table needs the 'sku' column.")
+        with self.lock:
+            if not self.columns:
+                definitions = ", ".join(["sku TEXT PRIMARY KEY", *(_quote(col) for col in headers if col != "sku"),
+                                         "checked_run INTEGER", "changed_run INTEGER"])
+                self.connection.execute(f"CREATE TABLE IF NOT EXISTS {_quote(self.TABLE)} ({definitions})")
+                self.connection.execute(f"CREATE INDEX IF NOT EXISTS results_checked_run ON {_quote(self.TABLE)} "
+                                        f"(checked_run, changed_run)")
+            else:
+                for col in headers:
+                    if col not in self.columns:
+                        self.connection.execute(f"ALTER TABLE {_quote(self.TABLE)} ADD COLUMN {_quote(col)}")
+            self.connection.commit()
+            self.columns = self._table_columns()
+        self.logger.info(f"The table has been created: {self.path}")
+
+    def open_writer(self, col_map: dict | list, flush_every: int = 100) -> "SQLite":
+        """
+        Для совместимости с 'CSV.open_writer': соединение и так открыто все время, каждая порция - одна транзакция.
+        """
+        if not self.columns:
+            self.create_file(col_map)
+        return self
+
+    def close_writer(self) -> None:
+        pass
+
+    def append_to_file(self, data: List[Dict[str, Any]], col_map: dict | list, sync: bool = False):
+        """
+        Записывает порцию строк одной транзакцией. Строка с уже известным СКУ обновляется, и если ее значения
+        изменились, она помечается измененной в текущем прогоне.
+        :param sync: Дождаться записи на диск (synchronous=FULL) для этой порции.
+        """
+        if not self.columns:
+            self.create_file(col_map)
+        columns = self.columns
+        values = [tuple(str(row_data["sku"]) if col == "sku" else row_data.get(col, '') for col in columns)
+                  + (self.run, self.run) for row_data in data if row_data and row_data.get("sku") not in (None, '')]
+        if not values:
+            return
+        data_columns = [col for col in columns if col != "sku"]
+        table = _quote(self.TABLE)
+        changed = " OR ".join(f"{table}.{_quote(col)} IS NOT excluded.{_quote(col)}" for col in data_columns) or "0"
+        updates = ", ".join(f"{_quote(col)} = excluded.{_quote(col)}" for col in data_columns)
+        query = (
+            f"INSERT INTO {table} ({', '.join(_quote(col) for col in columns)}, checked_run, "
+            f"changed_run) VALUES ({', '.join('?' * (len(columns) + 2))}) ON CONFLICT(sku) DO UPDATE SET "
+            f"changed_run = CASE WHEN {changed} THEN excluded.changed_run ELSE {table}.changed_run END, "
+            f"{updates + ', ' if updates else ''}checked_run = excluded.checked_run"
+        )
+        with self.lock:
+            if sync:
+                self.connection.execute("PRAGMA synchronous=FULL")
+            with self.connection:
+                self.connection.executemany(query, values)
+            if sync:
+                self.connection.execute("PRAGMA synchronous=NORMAL")
+
+    def iter_rows(self, changed_only: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Строки, проверенные в текущем прогоне.
+        :param changed_only: Только строки, значения которых изменились в текущем прогоне.
+        """
+        if not self.columns:
+            return
+        condition = "checked_run = ?" + (" AND changed_run = ?" if changed_only else "")
+        params = (self.run, self.run) if changed_only else (self.run,)
+        columns = self.columns
+        with self.lock:
+            cursor = self.connection.execute(
+                f"SELECT {', '.join(_quote(col) for col in columns)} FROM {_quote(self.TABLE)} WHERE {condition} "
+                f"ORDER BY rowid", params)
+        while True:
+            with self.lock:
+                rows = cursor.fetchmany(self.FETCH_SIZE)
+            if not rows:
+                return
+            for row in rows:
+                yield dict(zip(columns, row))
+
+    def read(self) -> List[Dict[str, Any]]:
+        return list(self.iter_rows())
+
+    def repair(self) -> int:
+        """
+        Для совместимости с 'CSV.repair': транзакции не оставляют неполных строк.
+        """
+        return 0
+
+    def clear(self):
+        with self.lock, self.connection:
+            self.connection.execute(f"DELETE FROM {_quote(self.TABLE)}")
+
+    def close(self) -> None:
+        self.connection.close()
@@ -1,11 +1,25 @@
+import time
 import logging
 import random
 import aiohttp
 import asyncio
 from checker_plus.cache_handler import CSV
-from checker_plus.utils import read_json, get_next_batch, retype
-from checker_plus.parser import EbayParser
-from typing import List, Dict, Literal, Any
+from checker_plus.utils import read_json, get_next_batch, retype, get_ebay_item_id
+from checker_plus.parse_backend import create_parse_backend
+from checker_plus.session import SessionManager
+from checker_plus.pipeline import Pipeline
+from checker_plus.stream_matcher import StreamMatcher
+from checker_plus.proxy_pool import ProxyPool, ProxyState
+from checker_plus.retry import RetryPolicy
+from checker_plus.limiter import AdaptiveLimiter
+from checker_plus.rate_limit import RateLimiter
+from checker_plus.hedging import HedgePolicy
+from checker_plus.timeouts import TimeoutPolicy
+from checker_plus.planner import FetchPlanner
+from checker_plus.negative_cache import NegativeCache
+from checker_plus.snapshot import StateSnapshot
+from checker_plus.parser import ParseResult
+from typing import List, Dict, Literal, Any, Tuple
 from aiohttp import BasicAuth
 from aiohttp import client_exceptions
 from pathlib import Path
@@ -24,6 +38,20 @@ class Checker:
     :param exceptions_repricer: Список СКУ тех товаров, которые не надо обновлять в Репрайсере.
     """
     CURRENT_DIR = Path(__file__).parent
+    DEFAULT_CONCURRENCY = 100
+    DEFAULT_STREAM_CHUNK_SIZE = 64 * 1024
+    # Начало строки, которую 'Checker.request' возвращает вместо страницы, и соответствующий исход запроса.
+    REQUEST_ERRORS = {
+        "403 Forbidden": "forbidden",
+        "404 Not Found": "not_found",
+        "Server error": "server_error",
+        "Unknown status": "error",
+        "Timeout error": "timeout",
+        "Request error": "connection_error",
+        "Unhandled error": "error",
+    }
+    # Начало 'error_type' в файле ошибок для строк, страница которых так и не получена.
+    PAGE_ERROR = "Страница не получена"
 
     def __init__(self, proxies: list, user_agents: list, shop_config: dict,
                  exceptions: list, exceptions_repricer: list):
@@ -51,7 +79,9 @@ class Checker:
                 "site_close_connection": 0,
                 "website_close_connection": 0,
                 "400": 0,
-                "404": 0
+                "403": 0,
+                "404": 0,
+                "server_errors": 0
             },
         }
 
@@ -62,6 +92,39 @@ class Checker:
         }
 
         self.auth_proxies: List[dict] = []
+        self.proxy_pool: ProxyPool | None = None
+        self.retry_policy = RetryPolicy(shop_config.get("retry") if shop_config else None)
+        # Конвейер текущей проверки. Через него строки с временными ошибками отправляются на повтор.
+        self.pipeline: Pipeline | None = None
+        # Адаптивный лимит одновременных запросов конвейера (см. 'EbayChecker.start_check').
+        self.limiter: AdaptiveLimiter | None = None
+        # Один запрос на товар за цикл, даже если он указан у нескольких СКУ (см. 'Checker.plan_key').
+        self.planner: FetchPlanner | None = None
+        # Ограничение частоты запросов к сайту, общее и на каждый прокси (ключ 'rate_limit' конфигурации магазина).
+        rate_limit = shop_config.get("rate_limit") if shop_config else None
+        self.rate_limiter: RateLimiter | None = RateLimiter(rate_limit) if rate_limit else None
+        # Хеджирование медленных запросов (ключ 'hedging' конфигурации магазина, см. 'Checker.request').
+        hedging = shop_config.get("hedging") if shop_config else None
+        self.hedge_policy: HedgePolicy | None = HedgePolicy(hedging if isinstance(hedging, dict) else None) \
+            if hedging else None
+        # В режиме 'raw_body' страница остается сырым телом ответа в bytes, парсер работает по bytes и декодирует
+        # только найденные куски.
+        self.raw_body: bool = bool(shop_config.get("raw_body")) if shop_config else False
+        # Раздельные адаптивные таймауты фаз запроса (ключ 'timeouts' конфигурации магазина, False - общий
+        # таймаут сессии).
+        timeouts = shop_config.get("timeouts", {}) if shop_config else {}
+        self.timeout_policy: TimeoutPolicy | None = TimeoutPolicy(timeouts or None) \
+            if timeouts is not False else None
+        self.session_manager = SessionManager(
+            shop_config.get("session") if shop_config else None,
+            trace_configs=[self.timeout_policy.trace_config()] if self.timeout_policy is not None else None
+        )
+        # Потоковое чтение тела ответа (ключ 'stream' конфигурации магазина): страница читается порциями и чтение
+        # обрывается, как только остальная часть страницы не влияет на результат разбора.
+        stream = shop_config.get("stream") if shop_config else None
+        self.stream_config: Dict[str, Any] | None = ({} if stream is True else dict(stream)) if stream else None
+        if self.stream_config is not None:
+            self.report["stream"] = {"pages": 0, "early_stops": 0, "bytes_read": 0}
 
     def __call__(self, *args, **kwargs):
         """
@@ -78,6 +141,7 @@ class Checker:
         Производит авторизацию прокси при помощи 'aiohttp.BasicAuth' для дальнейшего их использования через 'aiohttp'.
         :return: None
         """
+        auth_proxies = []
         for proxy in self.proxies:
             if "@" not in proxy or ":" not in proxy:
                 raise TypeError(f"Your proxy must be type 'login:password@ip:port' you specified '{proxy}'")
@@ -88,68 +152,260 @@ class Checker:
             proxy_url = 'http://' + host_and_port
             proxy_auth = BasicAuth(username, password)
 
-            self.auth_proxies.append({"url": proxy_url, "auth": proxy_auth})
+            auth_proxies.append({"url": proxy_url, "auth": proxy_auth})
+        # Список собирается заново, а не дополняется, поэтому повторный вызов не дублирует прокси.
+        self.auth_proxies = auth_proxies
+
+    def _build_headers(self, exclude_user_agent: str | None = None) -> dict:
+        """
+        Собирает заголовки для одного запроса. Юзер агент выбирается на каждый запрос отдельно, поэтому общий
+        'self.headers_settings' не меняется, пока другие запросы ещё в работе.
+        :param exclude_user_agent: Юзер агент, который не нужно выбирать (при повторе запроса).
+        :return: Словарь заголовков.
+        """
+        headers = dict(self.headers_settings)
+        if self.user_agents:
+            user_agents = [agent for agent in self.user_agents if agent != exclude_user_agent] or self.user_agents
+            headers["user-agent"] = random.choice(user_agents)
+        return headers
 
-    async def request(self, link: str, proxy: dict) -> str | None:
+    async def request(self, link: str, proxy: dict, headers: dict | None = None) -> str | bytes | None:
         """
-        Производит запрос по ссылке для получения контекста страницы.
+        Производит запрос по ссылке для получения контекста страницы. Если включено хеджирование
+        ('self.hedge_policy') и есть 'ProxyPool' хотя бы из двух прокси, медленный запрос дублируется через другой
+        прокси (см. 'Checker._request_hedged').
         :param link: Ссылка на товар.
         :param proxy: Прокси авторизованный через 'aiohttp.BasicAuth'.
-        :return: Наполнение страницы в виде строки либо словарь с ошибкой.
+        :param headers: Заголовки запроса. Если не указаны, используется 'self.headers_settings'.
+        :return: Наполнение страницы в виде строки (bytes в режиме 'raw_body') либо строка с ошибкой.
+        """
+        if self._hedging():
+            page, _ = await self._request_hedged(link, proxy, headers)
+            return page
+        return await self._request_once(link, proxy, headers)
+
+    async def request_served(self, link: str, proxy: dict, headers: dict | None = None
+                             ) -> Tuple[str | bytes | None, ProxyState | None]:
+        """
+        То же, что 'Checker.request', но возвращает еще и прокси, через который получена страница.
+        :return: (страница, ProxyState). ProxyState есть только при хеджировании: исход запросов уже записан
+        в 'ProxyPool'. None - запрос шел только через 'proxy', и исход никуда не записан.
+        """
+        if self._hedging():
+            return await self._request_hedged(link, proxy, headers)
+        return await self.request(link, proxy, headers=headers), None
+
+    def _hedging(self) -> bool:
+        return self.hedge_policy is not None and self.proxy_pool is not None and len(self.proxy_pool) > 1
+
+    async def _request_hedged(self, link: str, proxy: dict, headers: dict | None
+                              ) -> Tuple[str | bytes | None, ProxyState | None]:
+        """
+        Отправляет запрос и, если заголовки ответа не пришли за 'HedgePolicy.delay' секунд, отправляет второй
+        запрос на ту же ссылку через другой прокси из пула (только не из карантина). Возвращается первая полученная
+        страница, оставшийся запрос отменяется. Если оба запроса закончились ошибкой, возвращается ошибка последнего.
+        Исход каждого завершенного запроса записывается в 'ProxyPool' на тот прокси, через который он шел
+        (отмененный запрос не записывается).
+        :return: (страница, ProxyState прокси, через который она получена). ProxyState - None, если 'proxy' нет
+        в пуле.
+        """
+        policy = self.hedge_policy
+        policy.requests += 1
+        primary_state = self.proxy_pool.get(proxy.get("url") if proxy else None)
+        got_headers = asyncio.Event()
+        primary = asyncio.create_task(self._send_hedge(link, primary_state, headers, proxy, got_headers))
+        tasks = {primary: primary_state}
+        try:
+            delay = policy.delay()
+            if delay is not None:
+                headers_waiter = asyncio.create_task(got_headers.wait())
+                try:
+                    await asyncio.wait({primary, headers_waiter}, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    headers_waiter.cancel()
+            hedge_state = None
+            if delay is not None and not got_headers.is_set() and not primary.done() and policy.allow():
+                hedge_state = self.proxy_pool.acquire_healthy(exclude=primary_state)
+            if hedge_state is None:
+                return await primary, primary_state
+
+            policy.hedges += 1
+            hedge = asyncio.create_task(self._send_hedge(link, hedge_state, headers))
+            tasks[hedge] = hedge_state
+            pending = set(tasks)
+            page, served = None, None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    page, served = task.result(), tasks[task]
+                    if self.page_outcome(page) == "ok":
+                        if task is hedge:
+                            policy.wins += 1
+                        return page, served
+            return page, served
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _send_hedge(self, link: str, state: ProxyState | None, headers: dict | None, proxy: dict | None = None,
+                          got_headers: asyncio.Event | None = None) -> str | bytes | None:
+        """
+        Один из запросов 'Checker._request_hedged'. Исход записывается в пул (отмененный запрос не записывается).
+        Хеджирующий запрос ('proxy' не задан) идет через прокси 'state' и сначала ждет разрешения
+        'self.rate_limiter'. Основной запрос это разрешение уже получил (см. 'Checker.fetch_random_proxy').
+        """
+        if proxy is None:
+            proxy = state.proxy
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire(state.url)
+        started = time.monotonic()
+        page = await self._request_once(link, proxy, headers, got_headers)
+        if state is not None:
+            self.proxy_pool.record(state, self.page_outcome(page), time.monotonic() - started)
+        return page
+
+    async def _request_once(self, link: str, proxy: dict, headers: dict | None = None,
+                            got_headers: asyncio.Event | None = None) -> str | bytes | None:
+        """
+        Один запрос без хеджирования (см. 'Checker.request'). Если задан 'self.timeout_policy', у подключения,
+        ожидания первого байта и чтения тела свои таймауты, подобранные под прокси.
+        :param got_headers: Событие, которое выставляется, когда получены заголовки ответа.
         """
-        timeout = aiohttp.ClientTimeout(total=30)
         proxy_url = proxy.get("url") if proxy else None
         proxy_auth = proxy.get("auth") if proxy else None
+        timeouts = self.timeout_policy.timeouts(proxy_url) if self.timeout_policy is not None else None
+        request_kwargs = {} if timeouts is None else {
+            "timeout": TimeoutPolicy.client_timeout(timeouts),
+            "trace_request_ctx": {"proxy": proxy_url},
+        }
+
+        session = await self.session_manager.get_session()
+        started = time.monotonic()
+        got_response = False
+        try:
+            async with session.get(
+                    link, proxy=proxy_url, proxy_auth=proxy_auth, headers=headers or self.headers_settings,
+                    **request_kwargs
+            ) as response:
+                got_response = True
+                headers_time = time.monotonic()
+                if got_headers is not None:
+                    got_headers.set()
+                if self.hedge_policy is not None:
+                    self.hedge_policy.observe(headers_time - started)
+                if response.status == 200:
+                    if timeouts is None:
+                        return await self._read_body(response)
+                    self.timeout_policy.observe(proxy_url, "first_byte", headers_time - started)
+                    page = await asyncio.wait_for(self._read_body(response), timeouts["read"])
+                    self.timeout_policy.observe(proxy_url, "read", time.monotonic() - headers_time)
+                    return page
+                elif response.status == 403:
+                    self.logger.warning(f"403 Forbidden: Link={link}, Proxy={proxy}")
+                    self.report["errors"]["403"] += 1
+                    return f"403 Forbidden: {link}"
+                elif response.status == 404:
+                    self.report["errors"]["404"] += 1
+                    return f"404 Not Found: {link}"
+                elif 500 <= response.status < 600:
+                    self.logger.warning(f"Server error {response.status} for URL: {link}")
+                    self.report["errors"]["server_errors"] += 1
+                    return f"Server error {response.status}: {link}"
+                else:
+                    self.logger.error(f"Unexpected status {response.status} for URL: {link}")
+                    self.report["errors"]["unknown"] += 1
+                    return f"Unknown status {response.status}: {link}"
+        except TimeoutError as e:
+            phase = "connect" if isinstance(e, client_exceptions.ConnectionTimeoutError) \
+                else "read" if got_response else "first_byte"
+            if self.timeout_policy is not None:
+                self.timeout_policy.expired[phase] += 1
+            self.logger.error(f"Timeout error ({phase}): Link={link}, Proxy={proxy_url}")
+            self.report["errors"]["time_out_errors"] += 1
+            return f"Timeout error ({phase}): {link}"
+        except (client_exceptions.ClientProxyConnectionError, client_exceptions.ClientConnectorError,
+                client_exceptions.ClientOSError) as e:
+            self.logger.error(f"Request error: {e}, Link={link}")
+            self.report["errors"]["request_errors"] += 1
+            return f"Request error: {str(e)}"
+        except Exception as e:
+            self.logger.error(f"Unhandled error: {e}, Link={link}")
+            self.report["errors"]["unknown"] += 1
+            return f"Unhandled error: {str(e)}"
+
+    def page_outcome(self, page: str | bytes | None) -> str | None:
+        """
+        Исход запроса по результату 'Checker.request'.
+        :param page: Страница либо строка с ошибкой.
+        :return: 'ok' для страницы, исход из 'REQUEST_ERRORS' для ошибки, None - запроса не было.
+        """
+        if page is None:
+            return None
+        if isinstance(page, str):
+            for prefix, outcome in self.REQUEST_ERRORS.items():
+                if page.startswith(prefix):
+                    return outcome
+        return "ok"
+
+    async def _read_body(self, response: aiohttp.ClientResponse) -> str | bytes:
+        """
+        Читает тело ответа со статусом 200: порциями в режиме 'stream', иначе целиком.
+        :return: Страница: bytes в режиме 'raw_body', иначе строка.
+        """
+        if self.stream_config is not None:
+            return await self._read_streamed(response)
+        return await response.read() if self.raw_body else await response.text()
 
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            try:
-                async with session.get(
-                        link, proxy=proxy_url, proxy_auth=proxy_auth, headers=self.headers_settings
-                ) as response:
-                    if response.status == 200:
-                        return await response.text()
-                    elif response.status == 403:
-                        self.logger.warning(f"403 Forbidden: Link={link}, Proxy={proxy}")
-                        self.report["errors"]["403"] += 1
-                        return f"403 Forbidden: {link}"
-                    elif response.status == 404:
-                        self.report["errors"]["404"] += 1
-                        return f"404 Not Found: {link}"
-                    elif 500 <= response.status < 600:
-                        self.logger.warning(f"Server error {response.status} for URL: {link}")
-                        self.report["errors"]["server_errors"] += 1
-                        return f"Server error {response.status}: {link}"
-                    else:
-                        self.logger.error(f"Unexpected status {response.status} for URL: {link}")
-                        self.report["errors"]["unknown"] += 1
-                        return f"Unknown status {response.status}: {link}"
-            except (TimeoutError, client_exceptions.ClientProxyConnectionError, client_exceptions.ClientConnectorError,
-                    client_exceptions.ClientOSError) as e:
-                self.logger.error(f"Request error: {e}, Link={link}")
-                self.report["errors"]["request_errors"] += 1
-                return f"Request error: {str(e)}"
-            except Exception as e:
-                self.logger.error(f"Unhandled error: {e}, Link={link}")
-                self.report["errors"]["unknown"] += 1
-                return f"Unhandled error: {str(e)}"
-
-    async def fetch(self, item_data: Dict[str, Any], proxy: dict) -> dict:
-        """
-        Функция для подготовки данных к запросу через метод 'Checker.request'
+    async def _read_streamed(self, response: aiohttp.ClientResponse) -> str | bytes:
+        """
+        Читает тело ответа порциями и передает их в 'StreamMatcher'. Как только он решает, что дальше читать не
+        нужно, соединение закрывается: недочитанное тело не скачивается через прокси, а соединение не может
+        вернуться в пул. Настройки берутся из 'self.stream_config': 'chunk_size' - размер порции в байтах,
+        'stop_markers' - маркеры конца значимой части страницы (см. 'StreamMatcher').
+        :param response: Ответ со статусом 200.
+        :return: Прочитанная часть страницы: bytes в режиме 'raw_body', иначе строка.
+        """
+        matcher = StreamMatcher(self.shop_config.get("what_need_to_parse"), self.stream_config.get("stop_markers"))
+        chunk_size = self.stream_config.get("chunk_size", self.DEFAULT_STREAM_CHUNK_SIZE)
+        async for chunk in response.content.iter_chunked(chunk_size):
+            if matcher.feed(chunk):
+                if not response.content.at_eof():
+                    response.close()
+                    self.report["stream"]["early_stops"] += 1
+                break
+
+        self.report["stream"]["pages"] += 1
+        self.report["stream"]["bytes_read"] += len(matcher.buffer)
+        body = bytes(matcher.buffer)
+        return body if self.raw_body else body.decode(response.charset or "utf-8", "replace")
+
+    async def fetch(self, item_data: Dict[str, Any], proxy: dict, headers: dict | None = None) -> dict:
+        """
+        Функция для подготовки данных к запросу через метод 'Checker.request'. Если страница получена
+        с хеджированием, прокси, через который она пришла, кладется в ключ 'page_proxy' (см. 'Checker.request_served').
         :param item_data: Словарь в виде данных полученных по определенному товару из таблицы
         :param proxy: Прокси авторизованный через 'aiohttp.BasicAuth'.
+        :param headers: Заголовки запроса.
         :return: Словарь в формате 'item_data' но с дополнительной информацией в ключе 'page'.
         """
-        sku = item_data.get("sku")
-        link = item_data.get("supplier_link")
-        if sku in self.exceptions or sku == '' or not sku or link == '' or not link:
+        if not self.needs_request(item_data):
             item_data["page"] = None
             return item_data
 
-        item_data["page"] = await self.request(link, proxy)
-        
+        item_data["page"], served = await self.request_served(item_data["supplier_link"], proxy, headers=headers)
+        if served is not None:
+            item_data["page_proxy"] = served
+
         return item_data
 
+    def needs_request(self, item_data: Dict[str, Any]) -> bool:
+        """
+        :return: True - 'Checker.fetch' отправит запрос по строке: у нее есть СКУ не из исключений и ссылка.
+        """
+        sku = item_data.get("sku")
+        return bool(sku) and sku not in self.exceptions and bool(item_data.get("supplier_link"))
+
     async def get_pages(self, data: List[Dict[str, Any]], batch_size: int = 5) -> tuple[Dict[str, Any]]:
         """
         Порционно проходит по списку данных, полученных из таблиц, и получает контекст страниц по полученным ссылкам.
@@ -161,23 +417,153 @@ class Checker:
         tasks = []
         all_data_len = len(data)
         checked = batch_size
-        self.logger.info("Authorization proxies")
-        if not self.proxies:
-            raise Exception("No proxy was specified. In order to continue code execution you need to "
-                            "specify a set of proxies in the format: "
-                            "[{'url': proxy_url1, 'auth': proxy_auth1}, {'url': proxy_url2, 'auth': proxy_auth2}]")
-        await self.proxy_auth()
+        await self._prepare_proxies()
 
         self.logger.info(f"Checking: [{checked} | {all_data_len}]")
         current_batch = get_next_batch(data=data, batch_size=batch_size)
         for item_data in current_batch:
-            if self.user_agents:
-                self.headers_settings["user-agent"] = random.choice(self.user_agents)
-            proxy = random.choice(self.auth_proxies)
-            tasks.append(self.fetch(item_data=item_data, proxy=proxy))
+            tasks.append(self.fetch_random_proxy(item_data))
             checked += batch_size
         return await asyncio.gather(*tasks)
 
+    async def _prepare_proxies(self) -> None:
+        """
+        Проверяет, что прокси заданы, авторизует их и собирает 'ProxyPool', если это еще не было сделано.
+        Параметры пула берутся из ключа 'proxy_pool' конфигурации магазина.
+        :return: None
+        """
+        if not self.proxies:
+            raise Exception("No proxy was specified. In order to continue code execution you need to "
+                            "specify a set of proxies in the format: "
+                            "[{'url': proxy_url1, 'auth': proxy_auth1}, {'url': proxy_url2, 'auth': proxy_auth2}]")
+        if not self.auth_proxies:
+            self.logger.info("Authorization proxies")
+            await self.proxy_auth()
+        if self.proxy_pool is None:
+            self.proxy_pool = ProxyPool(self.auth_proxies, self.shop_config.get("proxy_pool") if self.shop_config
+                                        else None)
+
+    async def fetch_random_proxy(self, item_data: Dict[str, Any]) -> dict:
+        """
+        Вызывает 'Checker.fetch' через прокси из 'ProxyPool' и со случайным юзер агентом. Исход и время запроса
+        записываются в пул, а сам прокси кладется в ключ 'page_proxy', чтобы после парсинга можно было учесть
+        'proxy_ban' (см. 'ProxyPool.record'). Если страница пришла через хеджирующий прокси, в ключе будет он.
+        При повторе берутся другие прокси и юзер агент, чем в прошлый раз.
+        Прокси берется из пула, только если запрос действительно будет отправлен (см. 'Checker.needs_request').
+        Если исход на этот прокси не записан (запрос отменен или упал, страница пришла через хеджирующий прокси),
+        прокси возвращается в пул через 'ProxyPool.release', чтобы пробный запрос после карантина не потерялся.
+        Перед запросом ждет разрешения 'self.rate_limiter' и только потом места под лимитом 'self.limiter': строка,
+        которая ждет разрешения, не занимает место и не считается в 'AdaptiveLimiter' выполняющимся запросом.
+        Эти ожидания не входят во время запроса, которое передается в 'ProxyPool' и 'AdaptiveLimiter'.
+        :param item_data: Объект строки из таблицы.
+        :return: Объект 'item_data' с ключами 'page', 'page_proxy' и 'page_user_agent'.
+        """
+        exclude = item_data.pop("page_proxy", None)
+        if not self.needs_request(item_data):
+            return await self.fetch(item_data, None)
+
+        state = self.proxy_pool.acquire(exclude=exclude)
+        recorded = False
+        limited = False
+        try:
+            headers = self._build_headers(exclude_user_agent=item_data.get("page_user_agent"))
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire(state.url)
+            if self.limiter is not None:
+                await self.limiter.acquire()
+                limited = True
+            started = time.monotonic()
+            item_data = await self.fetch(item_data, state.proxy, headers=headers)
+            outcome = self.page_outcome(item_data.get("page"))
+            if self.limiter is not None:
+                self.limiter.record(outcome, time.monotonic() - started)
+            if outcome is not None:
+                # При хеджировании 'fetch' уже положил прокси, через который пришла страница, и записал исход в пул.
+                if "page_proxy" not in item_data:
+                    self.proxy_pool.record(state, outcome, time.monotonic() - started)
+                    recorded = True
+                    item_data["page_proxy"] = state
+                item_data["page_user_agent"] = headers.get("user-agent")
+        finally:
+            if limited:
+                self.limiter.release()
+            if not recorded:
+                self.proxy_pool.release(state)
+        return item_data
+
+    def cached_page(self, item_data: Dict[str, Any]) -> bool:
+        """
+        Проверяет, известен ли исход запроса строки без запроса (например, товар уже закончился). Если да, кладет
+        его в 'item_data' в ключ 'page' или 'page_result' и ставит ключ 'page_cached'.
+        :return: True - запрос не нужен.
+        """
+        return False
+
+    def plan_key(self, item_data: Dict[str, Any]) -> tuple | None:
+        """
+        Ключ товара для 'self.planner'. Строки с одинаковым ключом получают один и тот же результат разбора.
+        :return: Ключ либо None, если строку нужно запрашивать отдельно.
+        """
+        return None
+
+    def retry(self, item_data: Dict[str, Any], outcome: str | None) -> bool:
+        """
+        Отправляет строку на повтор в конец очереди запросов 'self.pipeline', если исход временный и попытки
+        строки еще не кончились (см. 'RetryPolicy'). Номер попытки хранится в ключе 'page_attempts'.
+        :param item_data: Объект строки.
+        :param outcome: Исход последней попытки.
+        :return: True - строка отправлена на повтор.
+        """
+        attempt = item_data.get("page_attempts", 1)
+        if self.pipeline is None or not self.retry_policy.should_retry(outcome, attempt):
+            return False
+        item_data.pop("page", None)
+        item_data["page_attempts"] = attempt + 1
+        self.pipeline.requeue(item_data, self.retry_policy.delay(attempt))
+        return True
+
+    async def fetch_with_retry(self, item_data: Dict[str, Any]) -> dict | None:
+        """
+        'Checker.fetch_random_proxy' для конвейера: при временной ошибке строка уходит на повтор. Если задан
+        'self.limiter', запрос ждет свободного места под лимитом (см. 'Checker.fetch_random_proxy').
+        Если задан 'self.planner', товар, который уже разобран в этом цикле, не запрашивается снова: строка сразу
+        получает результат в ключе 'page_result'. Если товар сейчас запрашивается для другой строки, эта строка
+        ждет и попадает в парсинг через 'Pipeline.resume'. Строка, которая сама идет за товаром, получает ключ
+        'plan_key', и этап парсинга должен передать результат в 'self.planner'.
+        :param item_data: Объект строки из таблицы.
+        :return: Объект 'item_data' с ключом 'page' или 'page_result' либо None, если строка отправлена на повтор
+        или ждет другую строку.
+        """
+        if "page_attempts" not in item_data and self.cached_page(item_data):
+            return item_data
+        if self.planner is not None and self.pipeline is not None and "page_attempts" not in item_data:
+            key = self.plan_key(item_data)
+            if key is not None:
+                state, result = self.planner.claim(key, item_data, self.pipeline.resume)
+                if state == "cached":
+                    item_data["page_result"] = result
+                    return item_data
+                if state == "follower":
+                    return None
+                item_data["plan_key"] = key
+        try:
+            item_data = await self.fetch_random_proxy(item_data)
+        except BaseException as e:
+            self._release_plan(item_data, e)
+            raise
+        if self.retry(item_data, self.page_outcome(item_data.get("page"))):
+            return None
+        return item_data
+
+    def _release_plan(self, item_data: Dict[str, Any], error: BaseException) -> None:
+        """
+        Строка-владелец товара в 'self.planner' упала или отменена, не передав результат. Ждавшие ее строки
+        возвращаются с ошибкой и разбираются как обычно, а товар больше не считается "в работе".
+        """
+        plan_key = item_data.pop("plan_key", None)
+        if plan_key is not None and self.planner is not None:
+            self.planner.fail(plan_key, f"Unhandled error: {error!r}")
+
 
 class EbayChecker(Checker):
     """
@@ -188,13 +574,57 @@ class EbayChecker(Checker):
     Остальные параметры имеют аналогичное значение, как и в родительском классе Checker.
     """
     def __init__(self, data: List[Dict[str, Any]], proxies: list, user_agents: list,
-                 shop_config: dict, exceptions: list, exceptions_repricer: list, cache_path: CSV, errors_path: CSV):
+                 shop_config: dict, exceptions: list, exceptions_repricer: list, cache_path: CSV, errors_path: CSV,
+                 planner: FetchPlanner | None = None, negative_cache: NegativeCache | None = None,
+                 snapshot: StateSnapshot | None = None):
         super().__init__(proxies=proxies, user_agents=user_agents,
                          shop_config=shop_config, exceptions=exceptions, exceptions_repricer=exceptions_repricer)
         self.data: List[Dict[str, Any]] = data
         self.strategy: Literal["drop", "listings"] = shop_config.get("strategy")
         self.cache_file = cache_path
         self.errors_file = errors_path
+        self.parse_backend = create_parse_backend(shop_config.get("parse_backend"))
+        self.planner = planner or FetchPlanner()
+        # Закончившиеся товары, страницы 404 и ссылки на каталог, которые можно не запрашивать.
+        self.negative_cache = negative_cache
+        # Последнее известное состояние товаров магазина для поиска изменений (см. 'EbayChecker.write_results').
+        self.snapshot = snapshot
+        self.changed_skus: set = set()
+
+    def cached_page(self, item_data: Dict[str, Any]) -> bool:
+        """
+        Строка, товар которой есть в 'self.negative_cache', получает сохраненное исключение со страницы в ключе
+        'page_result' либо ошибку 404 в ключе 'page'.
+        """
+        if self.negative_cache is None:
+            return False
+        key = self.plan_key(item_data)
+        entry = self.negative_cache.lookup(key[0]) if key is not None else None
+        if entry is None:
+            return False
+        item_data["page_cached"] = True
+        if entry["exception"]:
+            item_data["page_result"] = ParseResult(variation=False, exception=tuple(entry["exception"]),
+                                                   proxy_ban=False, fields={})
+        else:
+            item_data["page"] = f"404 Not Found: {item_data['supplier_link']}"
+        return True
+
+    def plan_key(self, item_data: Dict[str, Any]) -> tuple | None:
+        """
+        Ключ товара: id товара eBay из ссылки поставщика и настройки разбора. Строки из исключений, без СКУ,
+        с вариацией или со ссылкой не на товар eBay запрашиваются отдельно.
+        :param item_data: Объект строки из таблицы.
+        :return: (id товара, стратегия, собираемые поля) либо None.
+        """
+        sku = item_data.get("sku")
+        if not sku or sku in self.exceptions or item_data.get("variation") == "TURE":
+            return None
+        item_id = get_ebay_item_id(item_data.get("supplier_link"))
+        if item_id is None:
+            return None
+        what_need_to_parse = self.shop_config.get("what_need_to_parse") or {}
+        return item_id, self.strategy, tuple(sorted(key for key, value in what_need_to_parse.items() if value))
 
     async def _update_report(self, old_data: tuple[float, float, int], new_data: tuple[float, float, int]):
         """
@@ -212,61 +642,56 @@ class EbayChecker(Checker):
         if old_data[2] > 0 and new_data[2] < 1:
             self.report["nones_new"] += 1
 
-    async def _parsing_triggers(self, parser: EbayParser):
-        """
-        Проверяет триггерные места на странице. Те, что указывают на отсутствие товара неверное местоположение и т.д.
-        :param parser: Экземпляр класса EbayParser
-        :return: None
-        """
-        await asyncio.gather(
-            parser.look_out_of_stock_triggers(),
-            parser.look_pick_up_trigger(),
-            parser.look_catalog_trigger(),
-            parser.look_not_shipping_to_usa_trigger(self.strategy),
-            parser.look_variation_trigger()
-        )
-
-    async def _parsing_main_content(self, parser: EbayParser):
-        """
-        Собирает основной контент со страницы. Для определения того что нужно собрать, а что нет использует значение
-        'what_need_to_parse' из объекта конфигурации.
-        :param parser: Экземпляр класса EbayParser
-        :return: Словарь с собранными данными.
-        """
-        what_need_to_parse = self.shop_config.get("what_need_to_parse")
-        task_map = {
-            "supplier_price": parser.get_price,
-            "supplier_shipping": parser.get_shipping_price,
-            "supplier_qty": parser.get_quantity,
-            "supplier_days": parser.get_last_shipping_day,
-            "supplier_name": parser.get_supplier_name,
-            "part_number": parser.get_part_number,
-            "product_dimensions": parser.get_dimensions_lwh,
-            "color": parser.get_color,
-            "power_source": parser.get_power_source,
-            "voltage": parser.get_voltage,
-            "wattage": parser.get_wattage,
-            "included_components": parser.get_included_components,
-            "title": parser.get_item_title
-        }
-        tasks = [method() for key, method in task_map.items() if what_need_to_parse.get(key)]
-        results = await asyncio.gather(*tasks)
-        parsed_data = {}
-        for key, result in zip(task_map.keys(), results):
-            if what_need_to_parse.get(key):
-                parsed_data[key] = result
-
-        return parsed_data
-
     async def parsing_page(self, item_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         На основе информации в словаре 'item_data' что является элементом списка с данными из таблицы,
         собирает данные со страницы.
-        :param item_data: Объект строки с данными, в которой уже есть ключ 'page'.
-        :return: Объект 'item_data' с новой информацией полученной со страницы.
+        Если страница не получена (ошибка запроса после всех попыток), данные строки не меняются, а ошибка
+        записывается в файл ошибок.
+        Строка с ключом 'page_result' получает уже готовый результат разбора того же товара (см. 'FetchPlanner').
+        Строка с ключом 'plan_key' сама запрашивала товар и передает результат в 'self.planner'. Исход
+        собственного запроса строки записывается в 'self.negative_cache': закончившийся товар, 404 или ссылка
+        на каталог добавляются, доступный товар удаляется. Строки, которые не запрашивали страницу сами (готовый
+        результат или ошибка из 'self.planner', запись из 'self.negative_cache'), не учитываются
+        в 'self.retry_policy' и не меняют 'self.negative_cache': доли успехов и повторов считаются только по
+        реальным запросам. Если строка-владелец падает, ждавшие строки все равно
+        получают ошибку (см. 'Checker._release_plan').
+        :param item_data: Объект строки с данными, в которой уже есть ключ 'page' или 'page_result'.
+        :return: Объект 'item_data' с новой информацией полученной со страницы либо None, если строка отправлена
+        на повтор.
         """
-        page = item_data.pop("page")
-        if not page:
+        try:
+            return await self._parsing_page(item_data)
+        except BaseException as e:
+            self._release_plan(item_data, e)
+            raise
+
+    async def _parsing_page(self, item_data: Dict[str, Any]) -> Dict[str, Any] | None:
+        shared_result = item_data.pop("page_result", None)
+        page = item_data.pop("page", None)
+        page_proxy = item_data.pop("page_proxy", None)
+        page_cached = item_data.pop("page_cached", False)
+        page_shared = item_data.pop("page_shared", False)
+        # Строка сама запрашивала страницу. Только такие строки учитываются в статистике повторов и меняют
+        # 'self.negative_cache'.
+        own_request = shared_result is None and not page_cached and not page_shared
+        outcome = self.page_outcome(page) if shared_result is None else "ok"
+        if outcome is not None and outcome != "ok":
+            plan_key = item_data.pop("plan_key", None)
+            if plan_key is not None:
+                self.planner.fail(plan_key, page)
+            if own_request:
+                if outcome == "not_found" and self.negative_cache is not None:
+                    self.negative_cache.add(get_ebay_item_id(item_data.get("supplier_link")), "not_found")
+                self.retry_policy.record(item_data.pop("page_attempts", 1), False)
+            self.errors_file.append_to_file([{"sku": item_data["sku"], "error_type": f"{self.PAGE_ERROR}: {page}"}
+                                             ], ["sku", "error_type"])
+            item_data["page_error"] = True
+            return item_data
+        if not page and shared_result is None:
+            plan_key = item_data.pop("plan_key", None)
+            if plan_key is not None:
+                self.planner.fail(plan_key, page)
             item_data.update({
                 "supplier_price": 0.0,
                 "supplier_shipping": 0.0,
@@ -281,12 +706,34 @@ class EbayChecker(Checker):
         if item_data["variation"] == "TURE":
             return item_data
 
-        parser = EbayParser(page=page)
-
-        await self._parsing_triggers(parser)
-
-        exception_trigger = await parser.check_exceptions()
-        if parser.variation:
+        if shared_result is not None:
+            result = shared_result
+        else:
+            result = await self.parse_backend.parse(page, self.strategy, self.shop_config.get("what_need_to_parse"))
+
+        exception_trigger = result.exception
+        if result.proxy_ban and page_proxy is not None and self.proxy_pool is not None:
+            self.proxy_pool.record(page_proxy, "proxy_ban")
+            if self.limiter is not None:
+                self.limiter.reclassify("proxy_ban")
+            item_data["page_proxy"] = page_proxy
+            if self.retry(item_data, "proxy_ban"):
+                return None
+            item_data.pop("page_proxy")
+        plan_key = item_data.pop("plan_key", None)
+        if plan_key is not None:
+            # Страницу с баном прокси не раздаем: остальные строки разберут ее сами, как без планировщика.
+            if result.proxy_ban:
+                self.planner.fail(plan_key, page)
+            else:
+                self.planner.complete(plan_key, result)
+        if own_request:
+            self.retry_policy.record(item_data.pop("page_attempts", 1), not result.proxy_ban)
+            if self.negative_cache is not None and not result.proxy_ban:
+                item_id = get_ebay_item_id(item_data.get("supplier_link"))
+                if not self.negative_cache.add_exception(item_id, result.exception):
+                    self.negative_cache.discard(item_id)
+        if result.variation:
             item_data["variation"] = "TRUE"
             return item_data
         if exception_trigger:
@@ -302,25 +749,86 @@ class EbayChecker(Checker):
             await self._update_report((old_price, old_shipping_price, old_quantity), (0.0, 0.0, 0))
             return item_data
 
-        result = await self._parsing_main_content(parser)
-        item_data.update(**result)
+        item_data.update(**result.fields)
         return item_data
 
-    async def start_check(self, batch_size: int = 5):
+    def write_results(self, rows: List[Dict[str, Any]], columns: dict | list) -> None:
         """
-        Начинает работу чекера.
-        :param batch_size: Размер шага для порционного чека ссылок. По умолчанию 5.
+        Этап записи конвейера: дописывает порцию строк в файл кеша. Если задан 'self.snapshot', порция
+        сравнивается с последним известным состоянием: счетчики изменений копятся в отчете в ключе 'snapshot',
+        изменившиеся и новые СКУ - в 'self.changed_skus', а снимок обновляется. Строки, страница которых
+        не получена (ключ 'page_error'), не сравниваются.
+        """
+        self.cache_file.append_to_file(rows, columns, sync=True)
+        if self.snapshot is None:
+            return
+        checked = [row for row in rows if row and not row.get("page_error")]
+        counters, changed = self.snapshot.diff(checked)
+        self.snapshot.update(checked)
+        report = self.report.setdefault("snapshot", dict.fromkeys(counters, 0))
+        for key, value in counters.items():
+            report[key] += value
+        self.changed_skus |= changed
+
+    async def start_check(self, batch_size: int = 5, concurrency: int | None = None):
+        """
+        Начинает работу чекера. Запросы, парсинг и запись идут одновременно через 'Pipeline'. Настройки конвейера
+        берутся из ключа 'pipeline' конфигурации магазина: 'parsers' - кол-во воркеров парсинга, 'queue_size' -
+        размер очередей между этапами, 'errors_flush_every' - через сколько строк сбрасывать файл ошибок на диск.
+        Файлы кеша и ошибок на время проверки открыты через 'CSV.open_writer'.
+        Кол-во одновременных запросов подстраивается 'AdaptiveLimiter' в пределах от 'min' до 'concurrency'
+        (ключ 'concurrency_control' конфигурации магазина, False - фиксированное кол-во запросов). Итоговый
+        лимит попадает в отчет в ключ 'concurrency'.
+        :param batch_size: Сколько обработанных строк копить перед записью в файл кеша. По умолчанию 5. Каждая
+        порция сразу сбрасывается на диск, так что после падения процесса проверку можно продолжить
+        (см. 'RunCheckpoint').
+        :param concurrency: Максимальное кол-во одновременных запросов. По умолчанию берется из ключа
+        'concurrency' конфигурации магазина.
         :return: None
         """
         self.logger.info("Start checking data")
-
-        while self.data:
-            items_data = await self.get_pages(self.data, batch_size=batch_size)
-            new_data = []
-            for item_data in items_data:
-                actual_data = await self.parsing_page(item_data)
-                new_data.append(actual_data)
-            self.cache_file.append_to_file(new_data, self.shop_config.get("columns"))
+        await self._prepare_proxies()
+
+        pipeline_config = self.shop_config.get("pipeline") or {}
+        columns = self.shop_config.get("columns")
+        fetchers = concurrency or self.shop_config.get("concurrency") or self.DEFAULT_CONCURRENCY
+        limiter_config = self.shop_config.get("concurrency_control", {})
+        if limiter_config is not False:
+            self.limiter = AdaptiveLimiter({"max": fetchers, **(limiter_config or {})})
+        pipeline = Pipeline(
+            source=self.data,
+            fetch=self.fetch_with_retry,
+            parse=self.parsing_page,
+            write=lambda rows: self.write_results(rows, columns),
+            fetchers=fetchers,
+            parsers=pipeline_config.get("parsers", self.parse_backend.workers),
+            queue_size=pipeline_config.get("queue_size", 100),
+            write_batch=batch_size,
+        )
+        self.pipeline = pipeline
+        self.cache_file.open_writer(columns)
+        self.errors_file.open_writer(["sku", "error_type"], pipeline_config.get("errors_flush_every", 100))
+        try:
+            self.report["pipeline"] = await pipeline.run()
+        finally:
+            self.pipeline = None
+            self.cache_file.close_writer()
+            self.errors_file.close_writer()
+        self.report["proxy_pool"] = self.proxy_pool.report()
+        self.report["retry"] = self.retry_policy.report()
+        if self.limiter is not None:
+            self.report["concurrency"] = self.limiter.report()
+        if self.rate_limiter is not None:
+            self.report["rate_limit_wait"] = round(self.rate_limiter.waited, 2)
+        if self.hedge_policy is not None:
+            self.report["hedging"] = self.hedge_policy.report()
+        if self.timeout_policy is not None:
+            self.report["timeouts"] = self.timeout_policy.report()
+        self.report["planner"] = self.planner.report()
+        if self.negative_cache is not None:
+            self.report["negative_cache"] = self.negative_cache.report()
+        self.logger.info(f"Pipeline: {self.report['pipeline']}")
+        self.data = []
 
     async def end_check(self):
         """
@@ -328,6 +836,8 @@ class EbayChecker(Checker):
         :return: None
         """
         self.logger.info("Check was end. Cleaning cech...")
+        await self.session_manager.close()
+        await self.parse_backend.close()
         self.proxies = None
         self.user_agents = None
         self.shop_config = None
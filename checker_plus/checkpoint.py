@@ -0,0 +1,69 @@
+import os
+import time
+import logging
+from typing import Dict, Any, Set
+from checker_plus.cache_handler import FileHandler
+from checker_plus.utils import read_json, write_json
+
+
+class RunCheckpoint:
+    """
+    Отметки о незавершенных проверках таблиц. Результаты проверки и так пишутся в файл кеша таблицы по мере
+    обработки (см. 'EbayChecker.start_check'), поэтому после падения процесса достаточно знать, какие таблицы
+    проверялись: готовые СКУ берутся из файла кеша, а проверяются только оставшиеся. Отметка каждой проверки
+    хранится отдельно и снимается только после ее завершения, поэтому проверка других таблиц ее не затирает.
+    :param path: Путь к JSON файлу отметок.
+    """
+    def __init__(self, path: str):
+        logging.basicConfig(level=logging.INFO)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.path = path
+        self.runs: Dict[str, Dict[str, Any]] = read_json(path) if os.path.isfile(path) else {}
+
+    def _save(self) -> None:
+        """
+        Пишет отметки атомарно: при падении остается старый или новый файл.
+        """
+        if not self.runs:
+            if os.path.isfile(self.path):
+                os.remove(self.path)
+            return
+        temp_path = self.path + '.tmp'
+        write_json(temp_path, self.runs)
+        os.replace(temp_path, self.path)
+
+    def interrupted(self, run: str) -> bool:
+        """
+        :param run: Идентификатор проверки (например, магазин и id таблицы).
+        :return: True - эта проверка была начата и не завершена.
+        """
+        return run in self.runs
+
+    def start(self, run: str) -> None:
+        """
+        Отмечает начало проверки. Отметка прерванной проверки сохраняет исходное время начала.
+        """
+        self.runs.setdefault(run, {"started_at": time.time()})
+        self._save()
+
+    def finish(self, run: str) -> None:
+        """
+        Снимает отметку: проверка завершена, и в следующий раз таблица проверяется с начала.
+        """
+        if self.runs.pop(run, None) is not None:
+            self._save()
+
+    def completed(self, results: FileHandler, key: str = "sku") -> Set[str]:
+        """
+        Собирает ключи строк, которые уже записаны в файл кеша. Неполные строки после падения удаляются из файла.
+        :param results: Файл кеша прерванной проверки ('CSV' или 'SQLite').
+        :param key: Колонка с ключом строки.
+        :return: Множество ключей в виде строк.
+        """
+        if not results.file_exists():
+            return set()
+        results.repair()
+        done = {str(row[key]) for row in results.iter_rows() if row.get(key) not in (None, '')}
+        self.logger.info(f"Resuming interrupted check: {len(done)} rows already done")
+        return done
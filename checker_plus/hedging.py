@@ -0,0 +1,58 @@
+from collections import deque
+from typing import Dict, Any
+
+
+class HedgePolicy:
+    """
+    Когда отправлять дублирующий ("хеджирующий") запрос. Если ответ не пришел за p90 (по умолчанию) времени
+    до заголовков последних запросов, на ту же ссылку уходит второй запрос через другой прокси, и побеждает первый
+    ответ. Доля хеджирующих запросов ограничена 'max_rate', чтобы не тратить лишний трафик прокси.
+    :param config: Параметры. Обычно берутся из ключа 'hedging' конфигурации магазина.
+    """
+    DEFAULT_CONFIG = {
+        "quantile": 0.9,  # Квантиль времени до заголовков, после которого отправляется второй запрос.
+        "min_delay": 0.5,  # Не отправлять второй запрос раньше, сек.
+        "min_samples": 20,  # Сколько замеров нужно, прежде чем хеджировать.
+        "window": 500,  # Сколько последних замеров учитывать.
+        "max_rate": 0.1,  # Максимальная доля хеджирующих запросов от всех запросов.
+    }
+
+    def __init__(self, config: Dict[str, Any] | None = None):
+        self.config = {**self.DEFAULT_CONFIG, **(config or {})}
+        self.latencies: deque = deque(maxlen=self.config["window"])
+        self.requests = 0
+        self.hedges = 0
+        self.wins = 0
+
+    def observe(self, latency: float) -> None:
+        """
+        :param latency: Время от начала запроса до получения заголовков ответа, сек.
+        """
+        self.latencies.append(latency)
+
+    def delay(self) -> float | None:
+        """
+        :return: Через сколько секунд без заголовков отправлять второй запрос. None - замеров пока мало.
+        """
+        if len(self.latencies) < self.config["min_samples"]:
+            return None
+        latencies = sorted(self.latencies)
+        quantile = latencies[min(int(len(latencies) * self.config["quantile"]), len(latencies) - 1)]
+        return max(self.config["min_delay"], quantile)
+
+    def allow(self) -> bool:
+        """
+        :return: True - второй запрос укладывается в ограничение 'max_rate'.
+        """
+        return self.hedges + 1 <= self.requests * self.config["max_rate"]
+
+    def report(self) -> Dict[str, Any]:
+        requests = self.requests or 1
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_rate": round(self.hedges / requests, 3),
+            "hedge_wins": self.wins,
+            "win_rate": round(self.wins / self.hedges, 3) if self.hedges else 0.0,
+            "delay": self.delay(),
+        }
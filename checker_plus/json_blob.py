@@ -0,0 +1,133 @@
+import json
+import re
+from typing import Any, Iterator, List, Tuple, AnyStr
+
+# Строка JSON целиком или фигурная скобка. Строки пропускаются как один токен, поэтому скобки внутри них
+# не сбивают подсчет вложенности. Страница может быть как str, так и bytes.
+JSON_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|[{}]', re.DOTALL)
+JSON_TOKEN_BYTES = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}]', re.DOTALL)
+
+
+def _find_enclosing_start(text: AnyStr, position: int) -> int:
+    """
+    Идет от 'position' назад и возвращает индекс '{', которая открывает объект, содержащий 'position'.
+    Строки при обратном проходе не учитываются: если внутри них есть скобки, последующий разбор JSON не пройдет
+    и вызывающий код вернется к регулярным выражениям.
+    :return: Индекс открывающей скобки либо -1.
+    """
+    open_brace, close_brace = ('{', '}') if isinstance(text, str) else (b'{', b'}')
+    depth = 0
+    while True:
+        open_index = text.rfind(open_brace, 0, position)
+        if open_index == -1:
+            return -1
+        close_index = text.rfind(close_brace, open_index, position)
+        if close_index != -1:
+            depth += 1
+            position = close_index
+        elif depth == 0:
+            return open_index
+        else:
+            depth -= 1
+            position = open_index
+
+
+def _find_object_end(text: AnyStr, start: int) -> int:
+    """
+    Идет от открывающей скобки 'start' вперед и возвращает индекс сразу после парной закрывающей скобки.
+    :return: Индекс конца объекта либо -1.
+    """
+    token_regex, open_brace, close_brace = (JSON_TOKEN, '{', '}') if isinstance(text, str) \
+        else (JSON_TOKEN_BYTES, b'{', b'}')
+    depth = 0
+    for token in token_regex.finditer(text, start):
+        value = token.group()
+        if value == open_brace:
+            depth += 1
+        elif value == close_brace:
+            depth -= 1
+            if depth == 0:
+                return token.end()
+    return -1
+
+
+def locate_object(text: AnyStr, positions: List[int], max_levels: int = 5) -> Tuple[int, int] | None:
+    """
+    Находит границы самого вложенного JSON объекта в 'text', который содержит все позиции из 'positions'.
+    Если такой объект не найден за 'max_levels' уровней, возвращает объект, содержащий первую позицию.
+    :param text: Страница.
+    :param positions: Позиции ключей, которые должны оказаться внутри объекта.
+    :param max_levels: Сколько уровней вложенности можно подняться вверх.
+    :return: (начало, конец) объекта либо None.
+    """
+    low, high = min(positions), max(positions)
+    found = None
+    position = low
+    for _ in range(max_levels):
+        start = _find_enclosing_start(text, position)
+        if start == -1:
+            break
+        end = _find_object_end(text, start)
+        if end == -1:
+            break
+        found = (start, end)
+        if end > high:
+            break
+        position = start
+    return found
+
+
+def extract_object(text: AnyStr, positions: List[int]) -> Any:
+    """
+    Вырезает из страницы JSON объект, содержащий все 'positions', и декодирует его один раз. Для страницы в bytes
+    декодируется только вырезанный кусок.
+    :return: Декодированный объект либо None, если объект не найден или это не валидный JSON.
+    """
+    bounds = locate_object(text, positions)
+    if bounds is None:
+        return None
+    try:
+        return json.loads(text[bounds[0]:bounds[1]])
+    except ValueError:
+        return None
+
+
+def iter_items(obj: Any) -> Iterator[Tuple[str, Any]]:
+    """
+    Обходит декодированный JSON в порядке документа и отдает все пары (ключ, значение) на любой глубине.
+    """
+    stack = [(None, obj)]
+    while stack:
+        key, current = stack.pop()
+        if key is not None:
+            yield key, current
+        if isinstance(current, dict):
+            stack.extend(reversed(current.items()))
+        elif isinstance(current, list):
+            stack.extend((None, value) for value in reversed(current))
+
+
+def find_value(obj: Any, key: str, pattern: re.Pattern | None = None) -> Any:
+    """
+    Первое значение ключа 'key' в документе. Если указан 'pattern', значение должно быть строкой и полностью ему
+    соответствовать.
+    :return: Значение либо None.
+    """
+    for item_key, value in iter_items(obj):
+        if item_key == key and (pattern is None or (isinstance(value, str) and pattern.fullmatch(value))):
+            return value
+    return None
+
+
+def iter_lists(obj: Any) -> Iterator[list]:
+    """
+    Обходит декодированный JSON и отдает все вложенные списки.
+    """
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            stack.extend(reversed(current.values()))
+        elif isinstance(current, list):
+            yield current
+            stack.extend(reversed(current))
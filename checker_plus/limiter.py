@@ -0,0 +1,134 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Dict, Any
+
+
+class AdaptiveLimiter:
+    """
+    Ограничивает кол-во одновременных запросов и подстраивает лимит по схеме AIMD. Исходы запросов собираются
+    окнами примерно по 'limit' штук (одно окно - это примерно один "круг" запросов). Если в окне доля ошибок
+    (403, таймауты, proxy_ban) или p95 задержки выше порога, лимит умножается на 'decrease_factor'. Иначе, если
+    запросы упирались в лимит, лимит растет на 'increase_step'.
+    Используется как асинхронный контекстный менеджер: 'async with limiter: ...'.
+    :param config: Параметры лимитера. Обычно берутся из ключа 'concurrency_control' конфигурации магазина.
+    """
+    DEFAULT_CONFIG = {
+        "initial": 20,
+        "min": 2,
+        "max": 100,
+        "increase_step": 1,
+        "decrease_factor": 0.7,
+        "max_error_rate": 0.1,  # Доля ошибок в окне, при которой лимит снижается.
+        "max_p95_latency": 10.0,  # p95 задержки в окне (сек), при котором лимит снижается.
+        "min_samples": 20,  # Минимальный размер окна.
+    }
+    # Исходы запроса (см. 'Checker.page_outcome'), которые говорят о том, что запросов слишком много.
+    OVERLOAD_OUTCOMES = {"forbidden", "timeout", "connection_error", "proxy_ban"}
+
+    def __init__(self, config: Dict[str, Any] | None = None):
+        logging.basicConfig(level=logging.INFO)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.config = {**self.DEFAULT_CONFIG, **(config or {})}
+        self.limit = float(min(max(self.config["initial"], self.config["min"]), self.config["max"]))
+        self.in_flight = 0
+        self.min_seen = self.max_seen = int(self.limit)
+        self.increases = 0
+        self.decreases = 0
+        self._waiters: deque = deque()
+        self._saturated = False
+        self._failures = 0
+        self._latencies = []
+
+    async def acquire(self) -> None:
+        while self.in_flight >= int(self.limit):
+            self._saturated = True
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                self._wake()
+                raise
+        self.in_flight += 1
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    async def __aenter__(self) -> "AdaptiveLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+    def record(self, outcome: str | None, latency: float | None = None) -> None:
+        """
+        Учитывает исход запроса. Когда окно набрано, пересчитывает лимит.
+        :param outcome: Исход запроса (см. 'Checker.page_outcome'). None - запроса не было.
+        :param latency: Время запроса в секундах.
+        """
+        if outcome is None:
+            return
+        if outcome in self.OVERLOAD_OUTCOMES:
+            self._failures += 1
+        self._latencies.append(latency or 0.0)
+        if len(self._latencies) >= max(self.config["min_samples"], int(self.limit)):
+            self._adjust()
+
+    def reclassify(self, outcome: str) -> None:
+        """
+        Запрос, уже учтенный в 'AdaptiveLimiter.record' как успешный, оказался ошибкой (например, 'proxy_ban'
+        выясняется только после парсинга). Ошибка добавляется в текущее окно, а кол-во запросов и задержки
+        в окне не меняются. Если окно пересчитано после исходного запроса и в нем еще нет запросов, исход теряется.
+        :param outcome: Новый исход запроса.
+        """
+        if outcome in self.OVERLOAD_OUTCOMES and self._failures < len(self._latencies):
+            self._failures += 1
+
+    def _adjust(self) -> None:
+        latencies = sorted(self._latencies)
+        error_rate = self._failures / len(latencies)
+        p95 = latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)]
+        old_limit = int(self.limit)
+
+        if error_rate > self.config["max_error_rate"] or p95 > self.config["max_p95_latency"]:
+            self.limit = max(self.config["min"], self.limit * self.config["decrease_factor"])
+            self.decreases += 1
+        elif self._saturated:
+            self.limit = min(self.config["max"], self.limit + self.config["increase_step"])
+            self.increases += 1
+
+        if int(self.limit) != old_limit:
+            self.logger.info(f"Concurrency limit {old_limit} -> {int(self.limit)} "
+                             f"(errors={error_rate:.2f}, p95={p95:.2f}s)")
+        self.min_seen = min(self.min_seen, int(self.limit))
+        self.max_seen = max(self.max_seen, int(self.limit))
+        self._saturated = self.in_flight >= int(self.limit)
+        self._failures = 0
+        self._latencies = []
+        self._wake()
+
+    def report(self) -> Dict[str, Any]:
+        """
+        :return: Текущий лимит, его минимум и максимум за проверку и кол-во изменений.
+        """
+        return {
+            "limit": int(self.limit),
+            "min_limit": self.min_seen,
+            "max_limit": self.max_seen,
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }
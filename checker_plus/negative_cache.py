@@ -0,0 +1,115 @@
+import os
+import time
+import heapq
+import random
+import logging
+from typing import Dict, Any, Tuple
+from checker_plus.utils import read_json, write_json
+
+
+class NegativeCache:
+    """
+    Постоянный кеш "мертвых" товаров eBay: закончившиеся листинги, страницы 404 и ссылки на каталог. Ключ - id
+    товара. Пока запись не истекла, товар не запрашивается, а строка сразу получает сохраненный исход. Срок записи
+    зависит от причины и удваивается каждый раз, когда повторная проверка подтверждает причину (но не больше
+    'max_ttl'). Небольшая доля строк с живой записью все равно запрашивается ('probe_rate'), чтобы вовремя
+    заметить вернувшийся товар. Если товар снова доступен, запись удаляется. Если записей больше 'max_entries',
+    при сохранении удаляются те, что истекают раньше (истекшие - в первую очередь).
+    :param path: Путь к JSON файлу кеша.
+    :param config: Параметры кеша. Обычно берутся из ключа 'negative_cache' конфигурации магазина.
+    """
+    DEFAULT_CONFIG = {
+        # Срок записи по причине, сек.
+        "ttl": {"out_of_stock": 2 * 86400, "not_found": 7 * 86400, "link_on_catalog": 7 * 86400},
+        "max_ttl": 30 * 86400,
+        "probe_rate": 0.02,  # Доля строк, которые запрашиваются, несмотря на живую запись.
+        "max_entries": 200000,
+    }
+    # Исключения со страницы (см. 'EbayParser._check_exceptions'), которые попадают в кеш, и их причины.
+    EXCEPTION_REASONS = {"{out_of_stock}": "out_of_stock", "{link_on_catalog}": "link_on_catalog"}
+
+    def __init__(self, path: str, config: Dict[str, Any] | None = None):
+        logging.basicConfig(level=logging.INFO)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.path = path
+        config = config or {}
+        self.config = {**self.DEFAULT_CONFIG, **config, "ttl": {**self.DEFAULT_CONFIG["ttl"], **config.get("ttl", {})}}
+        self.entries: Dict[str, Dict[str, Any]] = read_json(path) if os.path.isfile(path) else {}
+        self.hits = 0
+        self.probes = 0
+        self.added = 0
+        self.revived = 0
+
+    def save(self) -> None:
+        """
+        Атомарно перезаписывает файл кеша: при падении остается старый или новый файл.
+        """
+        extra = len(self.entries) - self.config["max_entries"]
+        if extra > 0:
+            for item_id in heapq.nsmallest(extra, self.entries, key=lambda key: self.entries[key]["until"]):
+                del self.entries[item_id]
+        temp_path = self.path + '.tmp'
+        write_json(temp_path, self.entries)
+        os.replace(temp_path, self.path)
+
+    def lookup(self, item_id: str | None, now: float | None = None) -> Dict[str, Any] | None:
+        """
+        :param item_id: Id товара eBay.
+        :param now: Текущее время (time.time()).
+        :return: Запись {"reason": ..., "exception": [...] | None, ...}, если товар можно не запрашивать, иначе None.
+        """
+        entry = self.entries.get(item_id) if item_id else None
+        if entry is None or (time.time() if now is None else now) >= entry["until"]:
+            return None
+        if random.random() < self.config["probe_rate"]:
+            self.probes += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def add(self, item_id: str | None, reason: str, exception: Tuple[str, str | None] | None = None,
+            now: float | None = None) -> None:
+        """
+        Записывает или продлевает запись по товару.
+        :param item_id: Id товара eBay.
+        :param reason: Причина: ключ из 'ttl'.
+        :param exception: Исключение со страницы, которое получат строки вместо запроса.
+        :param now: Текущее время (time.time()).
+        """
+        if not item_id:
+            return
+        now = time.time() if now is None else now
+        entry = self.entries.get(item_id)
+        strikes = entry["strikes"] + 1 if entry is not None and entry["reason"] == reason else 1
+        ttl = min(self.config["ttl"][reason] * 2 ** (strikes - 1), self.config["max_ttl"])
+        self.entries[item_id] = {
+            "reason": reason,
+            "exception": list(exception) if exception else None,
+            "strikes": strikes,
+            "until": now + ttl,
+        }
+        self.added += 1
+
+    def add_exception(self, item_id: str | None, exception: Tuple[str, str | None] | None) -> bool:
+        """
+        Записывает товар, если исключение со страницы есть в 'EXCEPTION_REASONS'.
+        :return: True - запись добавлена.
+        """
+        reason = self.EXCEPTION_REASONS.get(exception[0]) if exception else None
+        if reason is None:
+            return False
+        self.add(item_id, reason, exception)
+        return True
+
+    def discard(self, item_id: str | None) -> None:
+        """
+        Удаляет запись: товар снова доступен.
+        """
+        if item_id and self.entries.pop(item_id, None) is not None:
+            self.revived += 1
+            self.logger.info(f"Item is available again: {item_id}")
+
+    def report(self) -> Dict[str, int]:
+        return {"entries": len(self.entries), "hits": self.hits, "probes": self.probes, "added": self.added,
+                "revived": self.revived}
@@ -0,0 +1,80 @@
+import os
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Literal, Dict, Any, List
+from checker_plus.parser import parse_page, parse_pages, ParseResult
+
+
+class InlineParseBackend:
+    """
+    Разбирает страницы прямо в цикле событий. Подходит для тестов и небольших таблиц.
+    """
+    workers = 1
+
+    async def parse(self, page: str | bytes, strategy: Literal["drop", "listings"],
+                    what_need_to_parse: Dict[str, bool] | None) -> ParseResult:
+        return parse_page(page, strategy, what_need_to_parse)
+
+    async def parse_many(self, pages: List[str | bytes | None], strategy: Literal["drop", "listings"],
+                         what_need_to_parse: Dict[str, bool] | None) -> List[ParseResult | None]:
+        return parse_pages(pages, strategy, what_need_to_parse)
+
+    async def close(self) -> None:
+        pass
+
+
+class ProcessParseBackend:
+    """
+    Разбирает страницы в пуле процессов, чтобы регулярные выражения по многомегабайтным страницам не блокировали
+    цикл событий и запросы. Кол-во процессов по умолчанию равно кол-ву ядер.
+    :param workers: Кол-во процессов в пуле.
+    """
+    def __init__(self, workers: int | None = None):
+        logging.basicConfig(level=logging.INFO)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.workers = workers or os.cpu_count() or 1
+        self._executor: ProcessPoolExecutor | None = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self.logger.info(f"Start parsing process pool: workers={self.workers}")
+            # 'spawn' одинаково ведет себя на Windows и Linux и не копирует потоки родительского процесса.
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    async def parse(self, page: str | bytes, strategy: Literal["drop", "listings"],
+                    what_need_to_parse: Dict[str, bool] | None) -> ParseResult:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), parse_page, page, strategy, what_need_to_parse)
+
+    async def parse_many(self, pages: List[str | bytes | None], strategy: Literal["drop", "listings"],
+                         what_need_to_parse: Dict[str, bool] | None) -> List[ParseResult | None]:
+        """
+        Разбирает набор страниц одной задачей в пуле: один обмен данными с процессом вместо одного на страницу.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), parse_pages, pages, strategy, what_need_to_parse)
+
+    async def close(self) -> None:
+        if self._executor is not None:
+            await asyncio.to_thread(self._executor.shutdown)
+            self._executor = None
+
+
+def create_parse_backend(config: Dict[str, Any] | None) -> InlineParseBackend | ProcessParseBackend:
+    """
+    Создает бэкенд парсинга по ключу 'parse_backend' конфигурации магазина.
+    :param config: Словарь вида {"type": "process" | "inline", "workers": int}. По умолчанию пул процессов.
+    :return: Экземпляр бэкенда.
+    """
+    config = config or {}
+    backend_type = config.get("type", "process")
+    if backend_type == "inline":
+        return InlineParseBackend()
+    if backend_type == "process":
+        return ProcessParseBackend(workers=config.get("workers"))
+    raise ValueError(f"Unknown parse backend '{backend_type}'. Use 'process' or 'inline'.")
@@ -1,18 +1,105 @@
 import logging
 import re
-from typing import Literal
-from checker_plus.utils import date_to_days
+from functools import lru_cache
+from typing import Literal, NamedTuple, Dict, Any, List, Iterable, Callable, Tuple
+from checker_plus.utils import days_until
+from checker_plus.json_blob import extract_object, find_value, iter_lists
+
+
+class ParseResult(NamedTuple):
+    """
+    Компактный результат разбора одной страницы. Легко передается между процессами.
+    :param variation: Товар является вариацией.
+    :param exception: Исключение со страницы (см. 'EbayParser.check_exceptions') либо None.
+    :param proxy_ban: Сайт считает, что запрос пришел не из США.
+    :param fields: Собранные поля в формате {ключ из 'what_need_to_parse': значение}.
+    """
+    variation: bool
+    exception: tuple | None
+    proxy_ban: bool
+    fields: Dict[str, Any]
+
+
+SEARCH_FLAGS = re.IGNORECASE | re.DOTALL
+
+
+@lru_cache(maxsize=None)
+def compile_pattern(pattern: str, as_bytes: bool = False, flags: int = SEARCH_FLAGS) -> re.Pattern:
+    """
+    Компилирует паттерн один раз. Для страниц в bytes паттерн компилируется как bytes.
+    """
+    return re.compile(pattern.encode() if as_bytes else pattern, flags)
+
+
+def to_text(value: str | bytes | None) -> str | None:
+    """
+    Декодирует найденный кусок страницы, если страница была в bytes. Декодируются только найденные куски,
+    а не вся страница.
+    """
+    if isinstance(value, bytes):
+        return value.decode("utf-8", "replace")
+    return value
+
+
+class TriggerScanner:
+    """
+    Проверяет все классы триггеров за один вызов. Паттерны компилируются один раз и ищутся по странице,
+    приведенной к нижнему регистру: без 're.IGNORECASE' движок 're' ищет литеральный префикс паттерна быстрым
+    поиском, а с ним проверяет каждую позицию страницы. Классы проверяются в порядке приоритета, и после
+    решающего триггера ищутся только классы из 'always', т.к. остальные уже не повлияют на результат.
+    :param triggers: Словарь {класс триггера: список паттернов}. Порядок ключей - приоритет, от высшего к низшему.
+    Паттерны не должны содержать экранирований в верхнем регистре ('\\S', '\\W' и т.д.).
+    :param decisive: Классы, после которых триггеры с более низким приоритетом не нужны.
+    :param always: Классы, которые ищутся и после решающего триггера (например, те, по которым определяется бан
+    прокси).
+    """
+    def __init__(self, triggers: Dict[str, List[str]], decisive: set, always: set | None = None):
+        for patterns in triggers.values():
+            for pattern in patterns:
+                if re.search(r'\\[A-Z]', pattern):
+                    raise ValueError(f"Trigger pattern can't be lowercased safely: {pattern}")
+        self.triggers = {
+            name: [compile_pattern(pattern.lower(), False, re.DOTALL) for pattern in patterns]
+            for name, patterns in triggers.items()
+        }
+        self.triggers_bytes = {
+            name: [compile_pattern(pattern.lower(), True, re.DOTALL) for pattern in patterns]
+            for name, patterns in triggers.items()
+        }
+        self.decisive = decisive
+        self.always = always or set()
+
+    def scan(self, page: str | bytes) -> Dict[str, re.Match]:
+        """
+        :param page: Страница сайта в нижнем регистре ('page.lower()'), str или bytes.
+        :return: Словарь {класс триггера: совпадение} только для найденных классов.
+        """
+        found = {}
+        decided = False
+        triggers = self.triggers_bytes if isinstance(page, bytes) else self.triggers
+        for name, regexes in triggers.items():
+            if decided and name not in self.always:
+                continue
+            for regex in regexes:
+                match = regex.search(page)
+                if match:
+                    found[name] = match
+                    break
+            decided = decided or (name in found and name in self.decisive)
+        return found
 
 
 class Parser:
     """
     Родительский клаас для парсинга страниц товаров.
-    :param page: Страница сайта в формате str.
+    :param page: Страница сайта в формате str либо сырое тело ответа в bytes.
     """
-    def __init__(self, page: str):
+    __slots__ = ("page",)
+
+    def __init__(self, page: str | bytes):
         self.page = page
 
-    async def search(self, patterns: list, in_text=False) -> str | bool | None:
+    def find(self, patterns: list, in_text=False) -> str | bool | None:
         """
         Ищет паттерны внутри страницы при помощи регулярных выражений. Приоритетность от первого паттерна в списке
         до последнего. Если паттерна нет на странице, то ищет следующий.
@@ -21,18 +108,25 @@ class Parser:
         возвращать текст.
         :return: str - когда паттерн найден; True - наличие паттерна на странице; None - паттерн на странице не найден.
         """
+        as_bytes = isinstance(self.page, bytes)
         for pattern in patterns:
-            match = re.search(pattern, self.page, re.IGNORECASE | re.DOTALL)
+            match = compile_pattern(pattern, as_bytes).search(self.page)
             if match and not in_text:
-                return match.group(1)
+                return to_text(match.group(1))
             elif match and in_text:
                 return True
 
+    async def search(self, patterns: list, in_text=False) -> str | bool | None:
+        """
+        Асинхронная обертка над 'Parser.find'.
+        """
+        return self.find(patterns, in_text=in_text)
+
 
 class EbayParser(Parser):
     """
     Класс для парсинга eBay страницы. Наследует класс 'Parser'.
-    :param page: Страница сайта в формате str.
+    :param page: Страница сайта в формате str либо сырое тело ответа в bytes.
     """
     OUT_OFF_STOCK_TRIGGERS = [
         r'CURRENTLY SOLD OUT', r'We looked everywhere.', r'Looks like this page is missing.',
@@ -57,6 +151,19 @@ class EbayParser(Parser):
     PICK_UP_TRIGGERS = [
         r'Local pickup only'
     ]
+    # Порядок совпадает с порядком проверок в 'EbayParser.parse': вариация важнее любого исключения.
+    TRIGGER_SCANNER = TriggerScanner(
+        triggers={
+            "variation": VARIATION_TRIGGERS,
+            "out_of_stock": OUT_OFF_STOCK_TRIGGERS,
+            "catalog_link": CATALOG_TRIGGERS,
+            "not_ship_to_usa": NOT_SHIP_TO_USA_TRIGGERS,
+            "pick_up": PICK_UP_TRIGGERS,
+        },
+        decisive={"variation", "out_of_stock", "catalog_link"},
+        # По этому триггеру определяется бан прокси, который нужен даже на странице с исключением.
+        always={"not_ship_to_usa"}
+    )
 
     SUPPLIER_PRICE = [
         r'"price":"([0-9]+\.[0-9]+)"'
@@ -111,11 +218,44 @@ class EbayParser(Parser):
     HEIGHT = [
         r'<span class=ux-textspans>Item Height.*?<span class=ux-textspans>(.*?)</span>'
     ]
+    # Таблица характеристик товара: каждая подпись и ее значение - соседние спаны 'ux-textspans'.
+    # Разбирается один раз в словарь {подпись: значение}, геттеры ниже ищут в нем по подписям.
+    ITEM_SPECIFICS_SPAN = r'<span class=ux-textspans>(.*?)</span>'
+    # Начало и конец блока характеристик. Если начала на странице нет, разбирается вся страница.
+    ITEM_SPECIFICS_START = ['ux-layout-section--features', 'id="viTabs_0_is"']
+    ITEM_SPECIFICS_END = ['x-item-description', 'id="desc_wrapper', '<footer']
+    PART_NUMBER_LABELS = ["MPN", "Manufacturer Part Number"]
+    POWER_SOURCE_LABELS = ["Power Source"]
+    VOLTAGE_LABELS = ["Voltage"]
+    WATTAGE_LABELS = ["Wattage"]
+    INCLUDE_COMPONENTS_LABELS = ["Battery Included"]
+    COLOR_LABELS = ["Color"]
+    LENGTH_LABELS = ["Item Length"]
+    WIDTH_LABELS = ["Item Width"]
+    HEIGHT_LABELS = ["Item Height"]
+    # Все подписи, которые ищут геттеры, в нормализованном виде (см. 'EbayParser._get_item_specifics').
+    ITEM_SPECIFIC_KEYS = tuple(label.casefold() for label in (
+        PART_NUMBER_LABELS + POWER_SOURCE_LABELS + VOLTAGE_LABELS + WATTAGE_LABELS + INCLUDE_COMPONENTS_LABELS
+        + COLOR_LABELS + LENGTH_LABELS + WIDTH_LABELS + HEIGHT_LABELS))
+
+    # Встроенный в страницу JSON с состоянием товара. Его находим по ключам ниже, вырезаем и декодируем один раз,
+    # а цену, доставку, кол-во и дату доставки читаем уже из декодированного объекта.
+    ITEM_STATE_PRICE = r'"price":"[0-9]+\.[0-9]+"'
+    ITEM_STATE_KEYS = ['"shippingRate"', '"maxValue"']
+    PRICE_VALUE = re.compile(r'[0-9]+\.[0-9]+')
+    QTY_VALUE = re.compile(r'[0-9]+')
+
+    # Парсер создается на каждую страницу, поэтому логгер общий на класс, а атрибуты экземпляра в '__slots__'.
+    logger = logging.getLogger("EbayParser")
+    __slots__ = ("_item_state", "_item_state_loaded", "_item_specifics", "_item_specific_values", "out_of_stock",
+                 "variation", "catalog_link", "proxy_ban", "not_send_to_usa", "pick_up")
 
-    def __init__(self, page: str):
+    def __init__(self, page: str | bytes):
         super().__init__(page=page)
-        logging.basicConfig(level=logging.INFO)
-        self.logger = logging.getLogger(self.__class__.__name__)
+        self._item_state = None
+        self._item_state_loaded = False
+        self._item_specifics: Dict[str, str] | None = None
+        self._item_specific_values: Dict[str, str] = {}
 
         self.out_of_stock: bool = False
         self.variation: bool = False
@@ -124,48 +264,141 @@ class EbayParser(Parser):
         self.not_send_to_usa: bool = False
         self.pick_up: bool = False
 
-    async def check_exceptions(self):
+    FIELD_GETTERS = {
+        "supplier_price": "_get_price",
+        "supplier_shipping": "_get_shipping_price",
+        "supplier_qty": "_get_quantity",
+        "supplier_days": "_get_last_shipping_day",
+        "supplier_name": "_get_supplier_name",
+        "part_number": "_get_part_number",
+        "product_dimensions": "_get_dimensions_lwh",
+        "color": "_get_color",
+        "power_source": "_get_power_source",
+        "voltage": "_get_voltage",
+        "wattage": "_get_wattage",
+        "included_components": "_get_included_components",
+        "title": "_get_item_title"
+    }
+
+    @classmethod
+    def field_getters(cls, what_need_to_parse: Dict[str, bool] | None) -> List[Tuple[str, Callable]]:
         """
-        Проверяет исключения на странице. :return: Tuple - исключение [Статус исключения, Информационная строка для
-        занесения в файл с ошибками]; None - исключений не найдено.
+        :param what_need_to_parse: Словарь {поле: нужно ли его собирать}.
+        :return: Список (поле, метод класса) только для нужных полей.
         """
+        what_need_to_parse = what_need_to_parse or {}
+        return [(key, getattr(cls, getter)) for key, getter in cls.FIELD_GETTERS.items() if what_need_to_parse.get(key)]
+
+    def _parse(self, strategy: Literal["drop", "listings"] | None,
+               getters: List[Tuple[str, Callable]]) -> ParseResult:
+        self._look_triggers(strategy)
+        exception = self._check_exceptions()
+        if self.variation or exception:
+            return ParseResult(self.variation, exception, self.proxy_ban, {})
+        return ParseResult(False, None, self.proxy_ban, {key: getter(self) for key, getter in getters})
+
+    def parse(self, strategy: Literal["drop", "listings"] | None, what_need_to_parse: Dict[str, bool] | None
+              ) -> ParseResult:
+        """
+        Синхронно разбирает страницу целиком: проверяет триггеры и, если исключений нет, собирает поля,
+        отмеченные в 'what_need_to_parse'.
+        :param strategy: Стратегия магазина. Может принимать значения: drop, listings.
+        :param what_need_to_parse: Словарь {поле: нужно ли его собирать}.
+        :return: ParseResult
+        """
+        return self._parse(strategy, self.field_getters(what_need_to_parse))
+
+    @classmethod
+    def parse_many(cls, pages: Iterable[str | bytes | None], what_need_to_parse: Dict[str, bool] | None,
+                   strategy: Literal["drop", "listings"] | None = None) -> List[ParseResult | None]:
+        """
+        Синхронно разбирает набор страниц. Список нужных полей вычисляется один раз на весь набор, собираются
+        только они. Подходит для пулов потоков и процессов, а также для повторного разбора сохраненных страниц.
+        :param pages: Страницы сайта. Для пустой страницы в результате будет None.
+        :param what_need_to_parse: Словарь {поле: нужно ли его собирать}.
+        :param strategy: Стратегия магазина. Может принимать значения: drop, listings.
+        :return: Список ParseResult в порядке страниц.
+        """
+        getters = cls.field_getters(what_need_to_parse)
+        return [cls(page)._parse(strategy, getters) if page else None for page in pages]
+
+    def _look_triggers(self, strategy: Literal["drop", "listings"]) -> None:
+        lower_page = self.page.lower()
+        found = self.TRIGGER_SCANNER.scan(lower_page)
+        self.variation = "variation" in found
+        self.out_of_stock = "out_of_stock" in found
+        self.catalog_link = "catalog_link" in found
+        self.pick_up = "pick_up" in found
+        if "not_ship_to_usa" in found:
+            self._apply_not_shipping_to_usa(to_text(found["not_ship_to_usa"].group(1)), strategy)
+
+    def _check_exceptions(self) -> tuple | None:
         if self.out_of_stock:
             return "{out_of_stock}", None
         if self.catalog_link:
             return "{link_on_catalog}", "Ссылка на каталог товаров, а не на карточку товара."
         if self.proxy_ban:
-            return "{proxy_ban}"
+            return "{proxy_ban}", None
         if self.not_send_to_usa:
             return "{supplier_not_in_usa}", "Поставщик не в США."
         if self.pick_up:
             return "{pick_up_only}", "У поставщика только самовывоз."
 
+    async def check_exceptions(self):
+        """
+        Проверяет исключения на странице. :return: Tuple - исключение [Статус исключения, Информационная строка для
+        занесения в файл с ошибками]; None - исключений не найдено.
+        """
+        return self._check_exceptions()
+
+    def _look_out_of_stock_triggers(self) -> None:
+        if self.find(self.OUT_OFF_STOCK_TRIGGERS, in_text=True):
+            self.out_of_stock = True
+
+    def _look_variation_trigger(self) -> None:
+        if self.find(self.VARIATION_TRIGGERS, in_text=True):
+            self.variation = True
+
+    def _look_catalog_trigger(self) -> None:
+        if self.find(self.CATALOG_TRIGGERS, in_text=True):
+            self.catalog_link = True
+
+    def _look_not_shipping_to_usa_trigger(self, strategy: Literal["drop", "listings"]) -> None:
+        trigger = self.find(self.NOT_SHIP_TO_USA_TRIGGERS)
+        if trigger:
+            self._apply_not_shipping_to_usa(trigger, strategy)
+
+    def _apply_not_shipping_to_usa(self, trigger: str, strategy: Literal["drop", "listings"]) -> None:
+        lower_trigger = trigger.lower()
+        if "united states" not in lower_trigger and "usa" not in lower_trigger:
+            self.proxy_ban = True  # сайт думает, что мы не в США.
+        elif strategy == "drop" and ("united states" in lower_trigger or "usa" in lower_trigger):
+            self.not_send_to_usa = True  # поставщик не отправляет в США.
+
+    def _look_pick_up_trigger(self) -> None:
+        if self.find(self.PICK_UP_TRIGGERS, in_text=True):
+            self.pick_up = True
+
     async def look_out_of_stock_triggers(self) -> None:
         """
         Проверяет 'out of stock' триггеры. Т.е. те, при которых нужно всегда ставить кол-во 0.
         :return: Меняет 'self.out_of_stock' на значение True.
         """
-        trigger = await self.search(self.OUT_OFF_STOCK_TRIGGERS, in_text=True)
-        if trigger:
-            self.out_of_stock = True
+        self._look_out_of_stock_triggers()
 
     async def look_variation_trigger(self) -> None:
         """
         Товар вариация или нет.
         :return: Меняет 'self.variation' на значение True.
         """
-        trigger = await self.search(self.VARIATION_TRIGGERS, in_text=True)
-        if trigger:
-            self.variation = True
+        self._look_variation_trigger()
 
     async def look_catalog_trigger(self) -> None:
         """
         Ссылка на каталог или нет.
         :return: Меняет 'self.catalog_link' на значение True.
         """
-        trigger = await self.search(self.CATALOG_TRIGGERS, in_text=True)
-        if trigger:
-            self.catalog_link = True
+        self._look_catalog_trigger()
 
     async def look_not_shipping_to_usa_trigger(self, strategy: Literal["drop", "listings"]) -> None:
         """
@@ -174,22 +407,14 @@ class EbayParser(Parser):
         :return: Меняет значения переменных 'self.proxy_ban' и 'self.not_send_to_usa' на True в случае
         отработки триггера.
         """
-        trigger = await self.search(self.NOT_SHIP_TO_USA_TRIGGERS)
-        if trigger:
-            lower_trigger = trigger.lower()
-            if "united states" not in lower_trigger and "usa" not in lower_trigger:
-                self.proxy_ban = True  # сайт думает, что мы не в США.
-            elif strategy == "drop" and ("united states" in lower_trigger or "usa" in lower_trigger):
-                self.not_send_to_usa = True  # поставщик не отправляет в США.
+        self._look_not_shipping_to_usa_trigger(strategy)
 
     async def look_pick_up_trigger(self) -> None:
-        trigger = await self.search(self.PICK_UP_TRIGGERS, in_text=True)
-        if trigger:
-            self.pick_up = True
+        self._look_pick_up_trigger()
 
-    async def get_item_title(self) -> str | None:
-        title = await self.search(self.TITLE)
-        if "| eBay" in title:
+    def _get_item_title(self) -> str | None:
+        title = self.find(self.TITLE)
+        if title and "| eBay" in title:
             return title.replace("&apos;", "'") \
                 .replace("&quot;", "\"") \
                 .replace("&amp;", "&") \
@@ -199,61 +424,221 @@ class EbayParser(Parser):
                 .strip()
         return None
 
+    def _get_item_state(self) -> Any:
+        """
+        Находит встроенный JSON с состоянием товара и декодирует его. Результат кешируется на экземпляре.
+        :return: Декодированный объект либо None, если JSON не найден или не разбирается.
+        """
+        if not self._item_state_loaded:
+            self._item_state_loaded = True
+            as_bytes = isinstance(self.page, bytes)
+            price = compile_pattern(self.ITEM_STATE_PRICE, as_bytes, 0).search(self.page)
+            if price:
+                positions = [price.start()]
+                for key in self.ITEM_STATE_KEYS:
+                    position = self.page.find(key.encode() if as_bytes else key, price.start())
+                    if position != -1:
+                        positions.append(position)
+                self._item_state = extract_object(self.page, positions)
+        return self._item_state
+
+    def _get_state_delivery_date(self, state: Any) -> str | None:
+        # Дата идет отдельным TextSpan сразу после TextSpan, который заканчивается на "and ".
+        for spans in iter_lists(state):
+            for current, following in zip(spans, spans[1:]):
+                if isinstance(current, dict) and isinstance(following, dict) \
+                        and str(current.get("text", "")).endswith("and ") \
+                        and following.get("_type") == "TextSpan" and following.get("text"):
+                    return following["text"]
+        return None
+
+    def _get_price(self) -> str | None:
+        state = self._get_item_state()
+        price = find_value(state, "price", self.PRICE_VALUE) if state is not None else None
+        return price or self.find(self.SUPPLIER_PRICE)
+
+    def _get_shipping_price(self) -> str | None:
+        state = self._get_item_state()
+        if state is not None:
+            shipping_rate = find_value(state, "shippingRate")
+            if shipping_rate is not None:
+                shipping = find_value(shipping_rate, "value", self.PRICE_VALUE)
+                if shipping:
+                    return shipping
+        return self.find(self.SUPPLIER_SHIPPING)
+
+    def _get_quantity(self) -> str | None:
+        state = self._get_item_state()
+        quantity = find_value(state, "maxValue", self.QTY_VALUE) if state is not None else None
+        return quantity or self.find(self.SUPPLIER_QTY)
+
+    def _get_last_shipping_day(self) -> str | None:
+        state = self._get_item_state()
+        delivery_date = self._get_state_delivery_date(state) if state is not None else None
+        return days_until(delivery_date or self.find(self.SUPPLIER_LAST_DELIVERY_DAY))
+
+    def _get_supplier_name(self) -> str | None:
+        return self.find(self.SUPPLIER_NAME)
+
+    def _item_specifics_block(self) -> str | bytes:
+        """
+        :return: Кусок страницы с блоком характеристик ('ITEM_SPECIFICS_START' - 'ITEM_SPECIFICS_END') либо вся
+        страница, если начало блока не найдено.
+        """
+        as_bytes = isinstance(self.page, bytes)
+        for start_marker in self.ITEM_SPECIFICS_START:
+            start = self.page.find(start_marker.encode() if as_bytes else start_marker)
+            if start == -1:
+                continue
+            ends = [self.page.find(end_marker.encode() if as_bytes else end_marker, start)
+                    for end_marker in self.ITEM_SPECIFICS_END]
+            return self.page[start:min([end for end in ends if end != -1], default=len(self.page))]
+        return self.page
+
+    def _get_item_specifics(self) -> Dict[str, str]:
+        """
+        Один проход по спанам 'ux-textspans' блока характеристик: текст каждого спана становится подписью, а текст
+        следующего - ее значением. Ключи в нижнем регистре, при повторе подписи остается первое значение на странице.
+        Заодно для каждой подписи из 'ITEM_SPECIFIC_KEYS' запоминается ее значение: точное совпадение подписи,
+        а если его нет - первая подпись, которая с нее начинается (так же, как это делали регулярные выражения).
+        :return: Словарь {подпись: значение}. Кешируется на экземпляре.
+        """
+        if self._item_specifics is None:
+            block = self._item_specifics_block()
+            span = compile_pattern(self.ITEM_SPECIFICS_SPAN, isinstance(block, bytes))
+            texts = [to_text(text) for text in span.findall(block)]
+            item_specifics = {}
+            for label, value in zip(texts, texts[1:]):
+                item_specifics.setdefault(label.strip().casefold(), value)
+            values = {}
+            for label, value in item_specifics.items():
+                for key in self.ITEM_SPECIFIC_KEYS:
+                    if label.startswith(key):
+                        values.setdefault(key, value)
+            values.update((key, item_specifics[key]) for key in self.ITEM_SPECIFIC_KEYS if key in item_specifics)
+            self._item_specifics = item_specifics
+            self._item_specific_values = values
+        return self._item_specifics
+
+    def _get_item_specific(self, labels: List[str]) -> str | None:
+        """
+        Значение характеристики по первой найденной подписи из 'labels'. Подписи должны быть из 'ITEM_SPECIFIC_KEYS'.
+        """
+        self._get_item_specifics()
+        for label in labels:
+            value = self._item_specific_values.get(label.casefold())
+            if value is not None:
+                return value
+        return None
+
+    def _get_part_number(self) -> str | None:
+        return self._get_item_specific(self.PART_NUMBER_LABELS)
+
+    def _get_color(self) -> str | None:
+        return self._get_item_specific(self.COLOR_LABELS)
+
+    def _get_power_source(self) -> str | None:
+        return self._get_item_specific(self.POWER_SOURCE_LABELS)
+
+    def _get_voltage(self) -> str | None:
+        return self._get_item_specific(self.VOLTAGE_LABELS)
+
+    def _get_wattage(self) -> str | None:
+        return self._get_item_specific(self.WATTAGE_LABELS)
+
+    def _get_included_components(self) -> str | None:
+        return self._get_item_specific(self.INCLUDE_COMPONENTS_LABELS)
+
+    def _get_length(self) -> str | None:
+        return self._get_item_specific(self.LENGTH_LABELS)
+
+    def _get_width(self) -> str | None:
+        return self._get_item_specific(self.WIDTH_LABELS)
+
+    def _get_height(self) -> str | None:
+        return self._get_item_specific(self.HEIGHT_LABELS)
+
+    def _get_dimensions_lwh(self) -> str | None:
+        length = self._get_length()
+        width = self._get_width()
+        height = self._get_height()
+        if not length:
+            self.logger.warning("Length is None.")
+        if not width:
+            self.logger.warning("Width is None.")
+        if not height:
+            self.logger.warning("Height is None.")
+
+        if length and width and height:
+            return f"{length} x {width} x {height}"
+        else:
+            return None
+
+    async def get_item_title(self) -> str | None:
+        return self._get_item_title()
+
     async def get_price(self) -> str | None:
-        return await self.search(self.SUPPLIER_PRICE)
+        return self._get_price()
 
     async def get_shipping_price(self) -> str | None:
-        return await self.search(self.SUPPLIER_SHIPPING)
+        return self._get_shipping_price()
 
     async def get_quantity(self) -> str | None:
-        return await self.search(self.SUPPLIER_QTY)
+        return self._get_quantity()
 
     async def get_last_shipping_day(self) -> str | None:
-        last_date = await self.search(self.SUPPLIER_LAST_DELIVERY_DAY)
-        return await date_to_days(last_date)
+        return self._get_last_shipping_day()
 
     async def get_supplier_name(self) -> str | None:
-        return await self.search(self.SUPPLIER_NAME)
+        return self._get_supplier_name()
 
     async def get_part_number(self) -> str | None:
-        return await self.search(self.PART_NUMBER)
+        return self._get_part_number()
 
     async def get_color(self) -> str | None:
-        return await self.search(self.COLOR)
+        return self._get_color()
 
     async def get_power_source(self) -> str | None:
-        return await self.search(self.POWER_SOURCE)
+        return self._get_power_source()
 
     async def get_voltage(self) -> str | None:
-        return await self.search(self.VOLTAGE)
+        return self._get_voltage()
 
     async def get_wattage(self) -> str | None:
-        return await self.search(self.WATTAGE)
+        return self._get_wattage()
 
     async def get_included_components(self) -> str | None:
-        return await self.search(self.INCLUDE_COMPONENTS)
+        return self._get_included_components()
 
     async def get_length(self) -> str | None:
-        return await self.search(self.LENGTH)
+        return self._get_length()
 
     async def get_width(self) -> str | None:
-        return await self.search(self.WIDTH)
+        return self._get_width()
 
     async def get_height(self) -> str | None:
-        return await self.search(self.HEIGHT)
+        return self._get_height()
 
     async def get_dimensions_lwh(self) -> str | None:
-        length = await self.get_length()
-        width = await self.get_width()
-        height = await self.get_height()
-        if not length:
-            self.logger.warning("Length is None.")
-        if not width:
-            self.logger.warning("Width is None.")
-        if not height:
-            self.logger.warning("Height is None.")
+        return self._get_dimensions_lwh()
 
-        if length and width and height:
-            return f"{length} x {width} x {height}"
-        else:
-            return None
+
+def parse_page(page: str | bytes, strategy: Literal["drop", "listings"], what_need_to_parse: Dict[str, bool] | None
+               ) -> ParseResult:
+    """
+    Синхронная точка входа для разбора страницы eBay. Функция верхнего уровня, поэтому ее можно отправлять в
+    'ProcessPoolExecutor'.
+    :param page: Страница сайта в формате str либо сырое тело ответа в bytes.
+    :param strategy: Стратегия магазина. Может принимать значения: drop, listings.
+    :param what_need_to_parse: Словарь {поле: нужно ли его собирать}.
+    :return: ParseResult
+    """
+    return EbayParser(page=page).parse(strategy, what_need_to_parse)
+
+
+def parse_pages(pages: List[str | bytes | None], strategy: Literal["drop", "listings"] | None,
+                what_need_to_parse: Dict[str, bool] | None) -> List[ParseResult | None]:
+    """
+    То же, что 'parse_page', но для набора страниц за один вызов (см. 'EbayParser.parse_many').
+    """
+    return EbayParser.parse_many(pages, what_need_to_parse, strategy)
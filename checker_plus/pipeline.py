@@ -0,0 +1,217 @@
+import time
+import asyncio
+import logging
+from typing import Iterable, Callable, Awaitable, List, Dict, Any
+
+
+class StageStats:
+    """
+    Счетчики одного этапа конвейера: сколько элементов обработано и сколько ждет в очереди перед этапом.
+    :param name: Название этапа.
+    :param queue: Очередь, из которой этап берет элементы.
+    """
+    def __init__(self, name: str, queue: asyncio.Queue):
+        self.name = name
+        self.queue = queue
+        self.processed = 0
+        self.max_queue = 0
+        self.started_at = time.monotonic()
+
+    def observe_queue(self) -> None:
+        self.max_queue = max(self.max_queue, self.queue.qsize())
+
+    def as_dict(self) -> Dict[str, Any]:
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return {
+            "processed": self.processed,
+            "per_sec": round(self.processed / elapsed, 2),
+            "queue": self.queue.qsize(),
+            "max_queue": self.max_queue,
+        }
+
+
+class Pipeline:
+    """
+    Конвейер fetch -> parse -> write. Этапы работают одновременно и связаны ограниченными очередями 'asyncio.Queue',
+    поэтому запросы не ждут парсинга и записи на диск, а кол-во сырых страниц в памяти не превышает размер очереди.
+    Этапы 'fetch' и 'parse' могут отправить элемент на повтор через 'Pipeline.requeue' и вернуть None: элемент
+    вернется в конец очереди запросов, а конвейер не завершится, пока все повторы не пройдут этап парсинга.
+    Этап 'fetch' может также отложить элемент, вернув None, и позже передать его в парсинг через 'Pipeline.resume'.
+    :param source: Итерируемый набор элементов для обработки (строки таблицы).
+    :param fetch: Корутина получения страницы для одного элемента. None - элемент отправлен на повтор.
+    :param parse: Корутина разбора страницы для одного элемента. None - элемент отправлен на повтор.
+    :param write: Синхронная функция записи порции результатов. Вызывается в отдельном потоке.
+    :param fetchers: Кол-во воркеров получения страниц.
+    :param parsers: Кол-во воркеров парсинга.
+    :param queue_size: Размер каждой из очередей между этапами.
+    :param write_batch: Сколько результатов копить перед вызовом 'write'.
+    :param report_interval: Как часто (в секундах) писать в лог состояние очередей.
+    """
+    def __init__(self, source: Iterable[Dict[str, Any]],
+                 fetch: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any] | None]],
+                 parse: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any] | None]],
+                 write: Callable[[List[Dict[str, Any]]], None],
+                 fetchers: int = 100, parsers: int = 2, queue_size: int = 100, write_batch: int = 100,
+                 report_interval: float = 30.0):
+        logging.basicConfig(level=logging.INFO)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.source = source
+        self.fetch = fetch
+        self.parse = parse
+        self.write = write
+        self.fetchers = fetchers
+        self.parsers = parsers
+        self.write_batch = write_batch
+        self.report_interval = report_interval
+
+        self.work_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.pages_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.results_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.stats = {
+            "fetch": StageStats("fetch", self.work_queue),
+            "parse": StageStats("parse", self.pages_queue),
+            "write": StageStats("write", self.results_queue),
+        }
+        self.requeued = 0
+        # Элементы, которые уже взяты из 'source', но еще не прошли этап парсинга (включая ждущие повтора).
+        self._in_flight = 0
+        self._source_done = False
+        self._all_parsed = asyncio.Event()
+        self._retry_tasks: set = set()
+
+    def requeue(self, item: Dict[str, Any], delay: float = 0.0) -> None:
+        """
+        Возвращает элемент в конец очереди запросов через 'delay' секунд. Вызывается из этапов 'fetch' и 'parse',
+        которые после этого должны вернуть None. Пока элемент ждет, воркеры заняты новыми элементами.
+        :param item: Элемент для повторной обработки.
+        :param delay: Задержка перед возвратом в очередь, сек.
+        """
+        self.requeued += 1
+        task = asyncio.create_task(self._put_later(item, delay))
+        self._retry_tasks.add(task)
+        task.add_done_callback(self._retry_tasks.discard)
+
+    def resume(self, item: Dict[str, Any]) -> None:
+        """
+        Отправляет элемент, который этап 'fetch' отложил (вернул None, не вызывая 'requeue'), сразу в очередь
+        парсинга. Элемент должен уже содержать то, что ему нужно для этапа 'parse'.
+        :param item: Отложенный элемент.
+        """
+        task = asyncio.create_task(self._put_parse_later(item))
+        self._retry_tasks.add(task)
+        task.add_done_callback(self._retry_tasks.discard)
+
+    async def _put_parse_later(self, item: Dict[str, Any]) -> None:
+        await self.pages_queue.put(item)
+        self.stats["parse"].observe_queue()
+
+    async def _put_later(self, item: Dict[str, Any], delay: float) -> None:
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await self.work_queue.put(item)
+        self.stats["fetch"].observe_queue()
+
+    def _item_parsed(self) -> None:
+        self._in_flight -= 1
+        if self._source_done and self._in_flight == 0:
+            self._all_parsed.set()
+
+    async def _feeder(self) -> None:
+        for item in self.source:
+            self._in_flight += 1
+            await self.work_queue.put(item)
+            self.stats["fetch"].observe_queue()
+        self._source_done = True
+        if self._in_flight:
+            # Повторы возвращаются в очередь запросов, поэтому воркеры запросов останавливаются только после того,
+            # как все элементы прошли парсинг.
+            await self._all_parsed.wait()
+        for _ in range(self.fetchers):
+            await self.work_queue.put(None)
+
+    async def _fetcher(self) -> None:
+        while True:
+            item = await self.work_queue.get()
+            if item is None:
+                return
+            item = await self.fetch(item)
+            self.stats["fetch"].processed += 1
+            if item is None:
+                continue
+            await self.pages_queue.put(item)
+            self.stats["parse"].observe_queue()
+
+    async def _parser(self) -> None:
+        while True:
+            item = await self.pages_queue.get()
+            if item is None:
+                return
+            item = await self.parse(item)
+            self.stats["parse"].processed += 1
+            if item is None:
+                continue
+            self._item_parsed()
+            await self.results_queue.put(item)
+            self.stats["write"].observe_queue()
+
+    async def _writer(self) -> None:
+        buffer = []
+        while True:
+            item = await self.results_queue.get()
+            if item is not None:
+                buffer.append(item)
+            if buffer and (item is None or len(buffer) >= self.write_batch):
+                await asyncio.to_thread(self.write, buffer)
+                self.stats["write"].processed += len(buffer)
+                buffer = []
+            if item is None:
+                return
+
+    async def _stage(self, worker: Callable[[], Awaitable[None]], count: int,
+                     next_queue: asyncio.Queue | None, next_count: int) -> None:
+        """
+        Запускает 'count' воркеров этапа и после их завершения отправляет сигнал остановки следующему этапу.
+        """
+        await asyncio.gather(*(worker() for _ in range(count)))
+        if next_queue is not None:
+            for _ in range(next_count):
+                await next_queue.put(None)
+
+    async def _monitor(self) -> None:
+        while True:
+            await asyncio.sleep(self.report_interval)
+            self.logger.info(f"Pipeline: {self.report()}")
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Состояние этапов: обработано, пропускная способность, текущая и максимальная глубина очереди.
+        :return: Словарь по этапам и кол-во повторов в ключе 'requeued'.
+        """
+        report = {name: stats.as_dict() for name, stats in self.stats.items()}
+        report["requeued"] = self.requeued
+        return report
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Запускает конвейер и ждет, пока все элементы будут записаны.
+        :return: Итоговый отчет 'Pipeline.report'.
+        """
+        monitor = asyncio.create_task(self._monitor())
+        tasks = [
+            asyncio.create_task(self._feeder()),
+            asyncio.create_task(self._stage(self._fetcher, self.fetchers, self.pages_queue, self.parsers)),
+            asyncio.create_task(self._stage(self._parser, self.parsers, self.results_queue, 1)),
+            asyncio.create_task(self._writer()),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        finally:
+            monitor.cancel()
+            for task in self._retry_tasks:
+                task.cancel()
+        return self.report()
@@ -0,0 +1,67 @@
+from typing import Dict, Any, List, Tuple, Hashable, Literal, Callable
+from checker_plus.parser import ParseResult
+
+Resume = Callable[[Dict[str, Any]], None]
+
+
+class FetchPlanner:
+    """
+    Следит, чтобы один и тот же товар поставщика запрашивался и разбирался один раз за цикл проверки, даже если
+    на него ссылаются несколько СКУ в разных таблицах и магазинах. Первая строка с товаром становится "владельцем"
+    и идет за страницей. Строки, пришедшие пока владелец в работе, ждут его результат (ключ 'page_result') или
+    ошибку (ключ 'page'), а строки, пришедшие после, сразу получают сохраненный результат разбора.
+    Один экземпляр живет весь цикл и передается во все чекеры цикла. Ключ товара составляет чекер
+    (см. 'EbayChecker.plan_key'): кроме id товара в него входят настройки, от которых зависит результат разбора.
+    """
+    def __init__(self):
+        self.results: Dict[Hashable, ParseResult] = {}
+        self.owners: Dict[Hashable, Dict[str, Any]] = {}
+        self.followers: Dict[Hashable, List[Tuple[Dict[str, Any], Resume]]] = {}
+        self.cached = 0
+        self.coalesced = 0
+
+    def claim(self, key: Hashable, item_data: Dict[str, Any],
+              resume: Resume) -> Tuple[Literal["owner", "follower", "cached"], ParseResult | None]:
+        """
+        Регистрирует строку, которой нужен товар 'key'.
+        :param key: Ключ товара.
+        :param item_data: Объект строки.
+        :param resume: Куда вернуть строку, если ей придется ждать владельца (обычно 'Pipeline.resume').
+        :return: ("owner", None) - строка должна сама получить страницу и потом вызвать 'complete' или 'fail';
+        ("follower", None) - товар уже в работе, строка вернется через 'resume'; ("cached", ParseResult) - товар
+        уже разобран.
+        """
+        if key in self.results:
+            self.cached += 1
+            return "cached", self.results[key]
+        if key in self.owners:
+            self.coalesced += 1
+            self.followers.setdefault(key, []).append((item_data, resume))
+            return "follower", None
+        self.owners[key] = item_data
+        return "owner", None
+
+    def complete(self, key: Hashable, result: ParseResult) -> None:
+        """
+        Сохраняет результат разбора товара до конца цикла и возвращает ждавшие строки с ключом 'page_result'.
+        """
+        self.results[key] = result
+        self.owners.pop(key, None)
+        for item_data, resume in self.followers.pop(key, []):
+            item_data["page_result"] = result
+            resume(item_data)
+
+    def fail(self, key: Hashable, page: str | bytes | None) -> None:
+        """
+        Владелец не получил годную страницу. Ждавшие строки возвращаются с его страницей или ошибкой в ключе
+        'page' (и ключом 'page_shared') и разбираются как обычно. Ошибка не сохраняется: следующая строка с этим
+        товаром попробует снова.
+        """
+        self.owners.pop(key, None)
+        for item_data, resume in self.followers.pop(key, []):
+            item_data["page"] = page
+            item_data["page_shared"] = True
+            resume(item_data)
+
+    def report(self) -> Dict[str, int]:
+        return {"unique": len(self.results), "cached": self.cached, "coalesced": self.coalesced}
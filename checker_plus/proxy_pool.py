@@ -0,0 +1,213 @@
+import time
+import random
+import logging
+from collections import deque
+from typing import List, Dict, Any
+
+
+class ProxyState:
+    """
+    Состояние одного прокси в 'ProxyPool': скользящее окно исходов запросов, EWMA задержки, счетчики ошибок и
+    карантин.
+    :param proxy: Прокси в формате {"url": ..., "auth": aiohttp.BasicAuth} (см. 'Checker.proxy_auth').
+    :param window: Размер окна исходов для расчета доли успешных запросов.
+    """
+    __slots__ = ("proxy", "results", "latency", "requests", "forbidden", "timeouts", "proxy_bans",
+                 "failures_in_row", "strikes", "quarantined_until", "needs_probe", "probing")
+
+    def __init__(self, proxy: Dict[str, Any], window: int):
+        self.proxy = proxy
+        self.results: deque = deque(maxlen=window)
+        self.latency: float | None = None
+        self.requests = 0
+        self.forbidden = 0
+        self.timeouts = 0
+        self.proxy_bans = 0
+        self.failures_in_row = 0
+        self.strikes = 0
+        self.quarantined_until = 0.0
+        self.needs_probe = False
+        self.probing = False
+
+    @property
+    def url(self) -> str:
+        return self.proxy.get("url")
+
+    def success_rate(self) -> float:
+        """
+        Доля успешных запросов в окне со сглаживанием Лапласа: у нового прокси 0.5, а не 0 или 1.
+        """
+        return (sum(self.results) + 1) / (len(self.results) + 2)
+
+    def score(self, latency_ref: float) -> float:
+        """
+        Вес прокси при выборе: доля успехов, уменьшенная для медленных прокси.
+        :param latency_ref: Задержка (сек), при которой вес падает вдвое.
+        """
+        latency = self.latency if self.latency is not None else latency_ref
+        return self.success_rate() / (1 + latency / latency_ref)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "requests": self.requests,
+            "success_rate": round(self.success_rate(), 3),
+            "latency": round(self.latency, 3) if self.latency is not None else None,
+            "forbidden": self.forbidden,
+            "timeouts": self.timeouts,
+            "proxy_bans": self.proxy_bans,
+            "quarantined": self.needs_probe,
+        }
+
+
+class ProxyPool:
+    """
+    Пул прокси с учетом их состояния. Прокси выбирается случайно с весом по доле успешных запросов и задержке.
+    Прокси, который подряд или в среднем по окну слишком часто ошибается, уходит в карантин. После карантина
+    на него отправляется один пробный запрос: при успехе прокси возвращается в работу, при ошибке уходит в карантин
+    снова, каждый раз в два раза дольше (но не дольше 'max_quarantine').
+    :param proxies: Список прокси в формате {"url": ..., "auth": ...}.
+    :param config: Параметры пула. Обычно берутся из ключа 'proxy_pool' конфигурации магазина.
+    """
+    DEFAULT_CONFIG = {
+        "window": 50,  # Сколько последних исходов учитывать в доле успехов.
+        "ewma_alpha": 0.2,  # Вес нового замера в EWMA задержки.
+        "latency_ref": 2.0,  # Задержка (сек), при которой вес прокси падает вдвое.
+        "min_samples": 10,  # Сколько исходов нужно в окне, прежде чем судить по доле успехов.
+        "min_success_rate": 0.5,  # Ниже этой доли успехов прокси уходит в карантин.
+        "max_failures_in_row": 5,  # Столько ошибок подряд - и прокси уходит в карантин.
+        "quarantine": 60,  # Первый карантин, сек.
+        "max_quarantine": 900,
+    }
+    # Исходы запроса (см. 'Checker.page_outcome'), которые не говорят о проблеме с прокси.
+    SUCCESS_OUTCOMES = {"ok", "not_found"}
+
+    def __init__(self, proxies: List[Dict[str, Any]], config: Dict[str, Any] | None = None):
+        logging.basicConfig(level=logging.INFO)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        if not proxies:
+            raise ValueError("Proxy pool needs at least one proxy.")
+        self.config = {**self.DEFAULT_CONFIG, **(config or {})}
+        self.states = [ProxyState(proxy, self.config["window"]) for proxy in proxies]
+        self._by_url = {state.url: state for state in self.states}
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def get(self, url: str | None) -> ProxyState | None:
+        """
+        :return: Состояние прокси по его url либо None.
+        """
+        return self._by_url.get(url)
+
+    def acquire(self, exclude: ProxyState | None = None) -> ProxyState:
+        """
+        Выбирает прокси для следующего запроса. Прокси, у которого закончился карантин, получает пробный запрос
+        вне очереди. Если все прокси в карантине, берется тот, чей карантин заканчивается раньше.
+        :param exclude: Прокси, который не нужно выбирать (например, тот, на котором запрос только что не удался).
+        Игнорируется, если других прокси нет.
+        :return: ProxyState. Прокси для запроса лежит в 'ProxyState.proxy'.
+        """
+        now = time.monotonic()
+        available = []
+        for state in self.states:
+            if state is exclude and len(self.states) > 1:
+                continue
+            if state.needs_probe:
+                if not state.probing and state.quarantined_until <= now:
+                    state.probing = True
+                    return state
+                continue
+            available.append(state)
+
+        if not available:
+            return min((state for state in self.states if state is not exclude or len(self.states) == 1),
+                       key=lambda s: s.quarantined_until)
+        return self._choose(available)
+
+    def acquire_healthy(self, exclude: ProxyState | None = None) -> ProxyState | None:
+        """
+        Выбирает прокси не из карантина, без пробных запросов. Нужен там, где запрос не должен ждать плохой прокси
+        (например, хеджирующий запрос, см. 'Checker._request_hedged').
+        :param exclude: Прокси, который не нужно выбирать.
+        :return: ProxyState либо None, если подходящих прокси нет.
+        """
+        available = [state for state in self.states if not state.needs_probe and state is not exclude]
+        return self._choose(available) if available else None
+
+    def _choose(self, available: List[ProxyState]) -> ProxyState:
+        latency_ref = self.config["latency_ref"]
+        return random.choices(available, weights=[state.score(latency_ref) for state in available])[0]
+
+    def record(self, state: ProxyState, outcome: str, latency: float | None = None) -> None:
+        """
+        Учитывает исход запроса через прокси.
+        :param state: Прокси, выданный 'ProxyPool.acquire'.
+        :param outcome: Исход запроса: 'ok', 'not_found', 'forbidden', 'timeout', 'proxy_ban' и т.д.
+        :param latency: Время запроса в секундах.
+        """
+        success = outcome in self.SUCCESS_OUTCOMES
+        state.requests += 1
+        if outcome == "forbidden":
+            state.forbidden += 1
+        elif outcome == "timeout":
+            state.timeouts += 1
+        elif outcome == "proxy_ban":
+            state.proxy_bans += 1
+        if latency is not None and success:
+            alpha = self.config["ewma_alpha"]
+            state.latency = latency if state.latency is None else alpha * latency + (1 - alpha) * state.latency
+
+        if state.probing:
+            state.probing = False
+            if success:
+                self.logger.info(f"Proxy is back from quarantine: {state.url}")
+                state.needs_probe = False
+                state.strikes = 0
+                state.results.append(True)
+            else:
+                self._quarantine(state)
+            return
+        if state.needs_probe:
+            # Запрос был отправлен до карантина. Исход уже ничего не меняет.
+            return
+
+        state.results.append(success)
+        state.failures_in_row = 0 if success else state.failures_in_row + 1
+        if state.failures_in_row >= self.config["max_failures_in_row"] or (
+                len(state.results) >= self.config["min_samples"]
+                and sum(state.results) / len(state.results) < self.config["min_success_rate"]):
+            self._quarantine(state)
+
+    def release(self, state: ProxyState) -> None:
+        """
+        Возвращает прокси, выданный 'ProxyPool.acquire', исход запроса через который записан не будет (запрос
+        отменен или упал, страница пришла через другой прокси). Если это был пробный запрос после карантина, он
+        считается несостоявшимся: прокси остается в карантине и получит пробный запрос снова.
+        :param state: Прокси, выданный 'ProxyPool.acquire'.
+        """
+        state.probing = False
+
+    def _quarantine(self, state: ProxyState) -> None:
+        state.strikes += 1
+        duration = min(self.config["quarantine"] * 2 ** (state.strikes - 1), self.config["max_quarantine"])
+        state.quarantined_until = time.monotonic() + duration
+        state.needs_probe = True
+        state.failures_in_row = 0
+        state.results.clear()
+        self.logger.warning(f"Proxy quarantined for {duration} sec: {state.url}")
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Сводка по пулу для отчета чекера.
+        :return: Словарь с общими счетчиками и кол-вом прокси в карантине.
+        """
+        return {
+            "proxies": len(self.states),
+            "quarantined": sum(state.needs_probe for state in self.states),
+            "requests": sum(state.requests for state in self.states),
+            "forbidden": sum(state.forbidden for state in self.states),
+            "timeouts": sum(state.timeouts for state in self.states),
+            "proxy_bans": sum(state.proxy_bans for state in self.states),
+        }
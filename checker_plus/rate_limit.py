@@ -0,0 +1,68 @@
+import time
+import asyncio
+from typing import Dict, Any
+
+
+class TokenBucket:
+    """
+    Ограничение частоты запросов "ведро с токенами": токены копятся со скоростью 'rate' в секунду, но не больше
+    'burst'. Каждый запрос забирает один токен. Если токенов нет, запрос спит ровно до появления следующего, без
+    циклов опроса. Ожидающие запросы обслуживаются по очереди.
+    :param rate: Запросов в секунду.
+    :param burst: Сколько запросов можно отправить разом после простоя.
+    """
+    def __init__(self, rate: float, burst: float = 1):
+        if rate <= 0:
+            raise ValueError(f"Token bucket rate must be positive, got {rate}")
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            self._refill()
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+
+class RateLimiter:
+    """
+    Общее ограничение частоты запросов к сайту и отдельное на каждый прокси. Ведра прокси создаются при первом
+    запросе через прокси.
+    :param config: Параметры. Обычно берутся из ключа 'rate_limit' конфигурации магазина: 'global_rate' и
+    'global_burst' - общее ограничение, 'per_proxy_rate' и 'per_proxy_burst' - на каждый прокси. Не заданная
+    скорость - без ограничения.
+    """
+    def __init__(self, config: Dict[str, Any] | None = None):
+        config = config or {}
+        self.per_proxy_rate = config.get("per_proxy_rate")
+        self.per_proxy_burst = config.get("per_proxy_burst", 1)
+        self.global_bucket = TokenBucket(config["global_rate"], config.get("global_burst", 1)) \
+            if config.get("global_rate") else None
+        self.proxy_buckets: Dict[str, TokenBucket] = {}
+        self.waited = 0.0
+
+    async def acquire(self, proxy_key: str | None = None) -> None:
+        """
+        Ждет разрешения на запрос. Сначала ведро прокси, затем общее: пока запрос ждет свой прокси, он не держит
+        общий токен.
+        :param proxy_key: Прокси запроса (обычно его url).
+        """
+        started = time.monotonic()
+        if self.per_proxy_rate and proxy_key is not None:
+            bucket = self.proxy_buckets.get(proxy_key)
+            if bucket is None:
+                bucket = self.proxy_buckets[proxy_key] = TokenBucket(self.per_proxy_rate, self.per_proxy_burst)
+            await bucket.acquire()
+        if self.global_bucket is not None:
+            await self.global_bucket.acquire()
+        self.waited += time.monotonic() - started
@@ -0,0 +1,70 @@
+import random
+from typing import Dict, Any
+
+
+class RetryPolicy:
+    """
+    Политика повторов для временных ошибок запроса: экспоненциальная задержка со случайным разбросом
+    ("full jitter") и ограничение кол-ва попыток на одну строку. Также считает, сколько строк получили страницу
+    с первой попытки и сколько в итоге.
+    :param config: Параметры повторов. Обычно берутся из ключа 'retry' конфигурации магазина.
+    """
+    DEFAULT_CONFIG = {
+        "attempts": 3,  # Всего попыток на строку, включая первую.
+        "base_delay": 1.0,  # Задержка перед первым повтором, сек.
+        "max_delay": 30.0,
+    }
+    # Исходы запроса (см. 'Checker.page_outcome'), которые имеет смысл повторить с другим прокси.
+    TRANSIENT_OUTCOMES = {"forbidden", "timeout", "connection_error", "server_error", "proxy_ban"}
+
+    def __init__(self, config: Dict[str, Any] | None = None):
+        self.config = {**self.DEFAULT_CONFIG, **(config or {})}
+        self.items = 0
+        self.first_try_success = 0
+        self.success = 0
+        self.retries = 0
+        self.gave_up = 0
+
+    def should_retry(self, outcome: str | None, attempt: int) -> bool:
+        """
+        :param outcome: Исход последней попытки.
+        :param attempt: Номер последней попытки, начиная с 1.
+        :return: True - строку нужно отправить на повтор.
+        """
+        if outcome not in self.TRANSIENT_OUTCOMES:
+            return False
+        if attempt >= self.config["attempts"]:
+            self.gave_up += 1
+            return False
+        self.retries += 1
+        return True
+
+    def delay(self, attempt: int) -> float:
+        """
+        Задержка перед повтором: случайное значение от 0 до base_delay * 2^(attempt - 1), но не больше max_delay.
+        Разброс не дает повторам от одной волны ошибок прийти на сайт одновременно.
+        :param attempt: Номер последней попытки, начиная с 1.
+        """
+        return random.uniform(0, min(self.config["base_delay"] * 2 ** (attempt - 1), self.config["max_delay"]))
+
+    def record(self, attempts: int, success: bool) -> None:
+        """
+        Учитывает итог по строке после последней попытки.
+        :param attempts: Сколько попыток понадобилось.
+        :param success: Страница в итоге получена.
+        """
+        self.items += 1
+        if success:
+            self.success += 1
+            if attempts == 1:
+                self.first_try_success += 1
+
+    def report(self) -> Dict[str, Any]:
+        items = self.items or 1
+        return {
+            "items": self.items,
+            "retries": self.retries,
+            "gave_up": self.gave_up,
+            "first_try_success_rate": round(self.first_try_success / items, 3),
+            "eventual_success_rate": round(self.success / items, 3),
+        }
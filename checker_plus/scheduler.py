@@ -0,0 +1,123 @@
+import os
+import time
+import heapq
+import logging
+from typing import List, Dict, Any, Iterable
+from checker_plus.utils import read_json, write_json, retype
+
+
+class CheckScheduler:
+    """
+    Решает, какие СКУ проверять в текущем цикле. Для каждого СКУ хранится история: значения отслеживаемых полей
+    после последней проверки, время проверки и время последнего изменения. Интервал до следующей проверки
+    пропорционален тому, как давно товар не менялся: только что изменившийся товар проверяется каждые
+    'min_interval' секунд, товар без изменений неделями - все реже, но не реже 'max_interval'. Товары с малым
+    остатком (но не закончившиеся) проверяются не реже 'low_stock_interval'. Новые СКУ и СКУ со сменившейся
+    ссылкой проверяются сразу. История хранится в JSON файле и переживает перезапуск. Если СКУ в истории больше
+    'max_entries', при сохранении удаляются те, что проверялись давнее всего: такие СКУ просто проверятся как новые.
+    :param path: Путь к файлу истории.
+    :param config: Параметры расписания. Обычно берутся из ключа 'scheduler' конфигурации магазина.
+    """
+    DEFAULT_CONFIG = {
+        "min_interval": 3600,  # Интервал для товара, который только что изменился, сек.
+        "max_interval": 7 * 86400,
+        "stability_ratio": 0.25,  # Интервал = эта доля времени, прошедшего с последнего изменения.
+        "low_stock_qty": 3,  # Остаток больше нуля, при котором и ниже которого товар считается заканчивающимся.
+        "low_stock_interval": 3 * 3600,
+        # Изменение этих полей сбрасывает интервал до 'min_interval'.
+        "fields": ["supplier_price", "supplier_shipping", "supplier_qty"],
+        "max_entries": 200000,
+    }
+
+    def __init__(self, path: str, config: Dict[str, Any] | None = None):
+        logging.basicConfig(level=logging.INFO)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.path = path
+        self.config = {**self.DEFAULT_CONFIG, **(config or {})}
+        self.history: Dict[str, Dict[str, Any]] = read_json(path) if os.path.isfile(path) else {}
+        self.due_count = 0
+        self.skipped = 0
+
+    def save(self) -> None:
+        """
+        Атомарно перезаписывает файл истории: при падении остается старый или новый файл.
+        """
+        extra = len(self.history) - self.config["max_entries"]
+        if extra > 0:
+            for sku in heapq.nsmallest(extra, self.history, key=lambda key: self.history[key]["checked_at"]):
+                del self.history[sku]
+        temp_path = self.path + '.tmp'
+        write_json(temp_path, self.history)
+        os.replace(temp_path, self.path)
+
+    def interval(self, changed_at: float, checked_at: float, qty: float) -> float:
+        """
+        :param changed_at: Время последнего изменения товара.
+        :param checked_at: Время последней проверки.
+        :param qty: Остаток после последней проверки. Закончившийся товар (0) не считается заканчивающимся.
+        :return: Сколько секунд ждать до следующей проверки.
+        """
+        interval = self.config["stability_ratio"] * (checked_at - changed_at)
+        interval = min(max(interval, self.config["min_interval"]), self.config["max_interval"])
+        if 0 < qty <= self.config["low_stock_qty"]:
+            interval = min(interval, self.config["low_stock_interval"])
+        return interval
+
+    def is_due(self, row: Dict[str, Any], now: float | None = None) -> bool:
+        """
+        :param row: Строка из таблицы.
+        :param now: Текущее время (time.time()).
+        :return: True - строку нужно проверить в этом цикле.
+        """
+        entry = self.history.get(str(row.get("sku") or ""))
+        if entry is None or entry["link"] != row.get("supplier_link"):
+            return True
+        return (time.time() if now is None else now) >= entry["next_due"]
+
+    def due(self, rows: Iterable[Dict[str, Any]], now: float | None = None) -> List[Dict[str, Any]]:
+        """
+        Отбирает строки, которые пора проверить.
+        :param rows: Строки из таблицы.
+        :param now: Текущее время (time.time()).
+        :return: Список строк для проверки.
+        """
+        now = time.time() if now is None else now
+        due = []
+        for row in rows:
+            if self.is_due(row, now):
+                due.append(row)
+            else:
+                self.skipped += 1
+        self.due_count += len(due)
+        return due
+
+    def observe(self, rows: Iterable[Dict[str, Any]], failed: Iterable[str] = (), now: float | None = None) -> None:
+        """
+        Обновляет историю по результатам проверки.
+        :param rows: Проверенные строки с новыми значениями полей.
+        :param failed: СКУ, для которых страница не получена. Их история не меняется, и они остаются в очереди
+        на проверку.
+        :param now: Время проверки (time.time()).
+        """
+        now = time.time() if now is None else now
+        failed = set(failed)
+        for row in rows:
+            sku = str(row.get("sku") or "")
+            if not sku or sku in failed:
+                continue
+            values = {field: retype(row.get(field), float, 0.0) for field in self.config["fields"]}
+            entry = self.history.get(sku)
+            changed_at = now
+            if entry is not None and entry["link"] == row.get("supplier_link") and entry["values"] == values:
+                changed_at = entry["changed_at"]
+            self.history[sku] = {
+                "link": row.get("supplier_link"),
+                "values": values,
+                "checked_at": now,
+                "changed_at": changed_at,
+                "next_due": now + self.interval(changed_at, now, retype(row.get("supplier_qty"), float, 0.0)),
+            }
+
+    def report(self) -> Dict[str, int]:
+        return {"due": self.due_count, "skipped": self.skipped, "tracked": len(self.history)}
@@ -0,0 +1,57 @@
+import logging
+import aiohttp
+from typing import Dict, Any, List
+
+
+class SessionManager:
+    """
+    Держит один 'aiohttp.ClientSession' на всё время жизни чекера, чтобы keep-alive соединения, DNS кеш и
+    лимиты соединений на прокси переиспользовались между запросами, а не создавались заново на каждую ссылку.
+    :param config: Параметры сессии. Обычно берутся из ключа 'session' объекта конфигурации магазина.
+    :param trace_configs: 'aiohttp.TraceConfig' для замеров фаз запросов.
+    """
+    DEFAULT_CONFIG = {
+        "limit": 200,  # Общее кол-во одновременных соединений.
+        "limit_per_host": 20,  # Соединений на один хост. Для запросов через прокси хост - это сам прокси.
+        "ttl_dns_cache": 300,
+        "keepalive_timeout": 30,
+        "total_timeout": 30,
+    }
+
+    def __init__(self, config: Dict[str, Any] | None = None, trace_configs: List[aiohttp.TraceConfig] | None = None):
+        logging.basicConfig(level=logging.INFO)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.config = {**self.DEFAULT_CONFIG, **(config or {})}
+        self.trace_configs = trace_configs
+        self._session: aiohttp.ClientSession | None = None
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.config["limit"],
+            limit_per_host=self.config["limit_per_host"],
+            ttl_dns_cache=self.config["ttl_dns_cache"],
+            keepalive_timeout=self.config["keepalive_timeout"],
+        )
+        timeout = aiohttp.ClientTimeout(total=self.config["total_timeout"])
+        self.logger.info(f"Open HTTP session: limit={self.config['limit']}, "
+                         f"limit_per_host={self.config['limit_per_host']}")
+        return aiohttp.ClientSession(connector=connector, timeout=timeout, trace_configs=self.trace_configs)
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """
+        Возвращает общую сессию. Создает её при первом обращении или если предыдущая уже была закрыта.
+        :return: aiohttp.ClientSession
+        """
+        if self._session is None or self._session.closed:
+            self._session = self._create_session()
+        return self._session
+
+    async def close(self) -> None:
+        """
+        Закрывает сессию и все соединения в пуле.
+        :return: None
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
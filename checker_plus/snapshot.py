@@ -0,0 +1,176 @@
+import os
+import re
+import sys
+import mmap
+import math
+import struct
+from array import array
+from typing import List, Dict, Any, Iterable, Tuple, Set
+
+NUMBER = re.compile(r'\s*(-?\d+(?:\.\d+)?)')
+
+
+def to_number(value: Any) -> float:
+    """
+    Число из значения строки: 5.5, "5.50", "13days". Пустое или нечисловое значение - NaN.
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = NUMBER.match(value) if isinstance(value, str) else None
+    return float(match.group(1)) if match else math.nan
+
+
+def _same(old: float, new: float) -> bool:
+    return old == new or (math.isnan(old) and math.isnan(new))
+
+
+def _stock(qty: float) -> float:
+    return 0.0 if math.isnan(qty) else qty
+
+
+class StateSnapshot:
+    """
+    Последнее известное состояние товаров магазина: индекс СКУ и параллельные колонки float64 с ценой, доставкой,
+    остатком и сроком доставки ('FIELDS'). Неизвестное значение хранится как NaN.
+    Файл снимка: заголовок (магическая строка и кол-во СКУ), затем колонки подряд (float64), затем СКУ в UTF-8,
+    каждый с длиной в байтах (uint32) перед ним. Все числа в файле little-endian, поэтому снимок читается
+    на любой машине.
+    На little-endian машине колонки читаются через mmap без копирования и копируются в память только при первом
+    изменении.
+    :param path: Путь к файлу снимка. Если файла нет, снимок пустой.
+    """
+    MAGIC = b"CPSNAP2\0"
+    HEADER = struct.Struct("<8sQ")
+    SKU_LENGTH = struct.Struct("<I")
+    NATIVE_LITTLE_ENDIAN = sys.byteorder == "little"
+    FIELDS = ("supplier_price", "supplier_shipping", "supplier_qty", "supplier_days")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.skus: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.columns: List[array | memoryview] = [array("d") for _ in self.FIELDS]
+        self._mmap: mmap.mmap | None = None
+        if os.path.isfile(path) and os.path.getsize(path) >= self.HEADER.size:
+            self._load()
+
+    def _load(self) -> None:
+        with open(self.path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count = self.HEADER.unpack_from(self._mmap, 0)
+        if magic != self.MAGIC:
+            raise ValueError(f"Not a snapshot file: {self.path}")
+        view = memoryview(self._mmap)
+        offset = self.HEADER.size
+        self.columns = []
+        for _ in self.FIELDS:
+            column = view[offset:offset + count * 8]
+            if self.NATIVE_LITTLE_ENDIAN:
+                self.columns.append(column.cast("d"))
+            else:
+                values = array("d", bytes(column))
+                values.byteswap()
+                self.columns.append(values)
+            offset += count * 8
+        self.skus = []
+        for _ in range(count):
+            length, = self.SKU_LENGTH.unpack_from(view, offset)
+            offset += self.SKU_LENGTH.size
+            self.skus.append(bytes(view[offset:offset + length]).decode("utf-8"))
+            offset += length
+        self.index = {sku: i for i, sku in enumerate(self.skus)}
+
+    def __len__(self) -> int:
+        return len(self.skus)
+
+    def get(self, sku: Any) -> Tuple[float, ...] | None:
+        """
+        :return: Значения 'FIELDS' для СКУ либо None, если СКУ нет в снимке.
+        """
+        i = self.index.get(str(sku))
+        return None if i is None else tuple(column[i] for column in self.columns)
+
+    def diff(self, rows: Iterable[Dict[str, Any]]) -> Tuple[Dict[str, int], Set[str]]:
+        """
+        Сравнивает строки с последним известным состоянием. Снимок не меняется.
+        :param rows: Проверенные строки.
+        :return: (счетчики изменений, множество СКУ, которые изменились или появились впервые).
+        """
+        counters = dict.fromkeys(("compared", "new_sku", "unchanged", "new_price", "new_ship_price", "new_qty",
+                                  "new_days", "stock_new", "nones_new"), 0)
+        changed = set()
+        price, shipping, qty, days = self.columns
+        for row in rows:
+            sku = str(row.get("sku") or "")
+            if not sku:
+                continue
+            counters["compared"] += 1
+            i = self.index.get(sku)
+            if i is None:
+                counters["new_sku"] += 1
+                changed.add(sku)
+                continue
+            new = [to_number(row.get(field)) for field in self.FIELDS]
+            flags = (not _same(price[i], new[0]), not _same(shipping[i], new[1]), not _same(qty[i], new[2]),
+                     not _same(days[i], new[3]))
+            if not any(flags):
+                counters["unchanged"] += 1
+                continue
+            changed.add(sku)
+            for name, flag in zip(("new_price", "new_ship_price", "new_qty", "new_days"), flags):
+                counters[name] += flag
+            old_qty, new_qty = _stock(qty[i]), _stock(new[2])
+            if old_qty < 1 <= new_qty:
+                counters["stock_new"] += 1
+            if new_qty < 1 <= old_qty:
+                counters["nones_new"] += 1
+        return counters, changed
+
+    def update(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """
+        Записывает значения строк в снимок (в память, см. 'StateSnapshot.save').
+        """
+        if not all(isinstance(column, array) for column in self.columns):
+            self.columns = [array("d", column) for column in self.columns]
+        for row in rows:
+            sku = str(row.get("sku") or "")
+            if not sku:
+                continue
+            values = [to_number(row.get(field)) for field in self.FIELDS]
+            i = self.index.get(sku)
+            if i is None:
+                self.index[sku] = len(self.skus)
+                self.skus.append(sku)
+                for column, value in zip(self.columns, values):
+                    column.append(value)
+            else:
+                for column, value in zip(self.columns, values):
+                    column[i] = value
+
+    def save(self) -> None:
+        """
+        Атомарно перезаписывает файл снимка.
+        """
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "wb") as file:
+            file.write(self.HEADER.pack(self.MAGIC, len(self.skus)))
+            for column in self.columns:
+                if not self.NATIVE_LITTLE_ENDIAN:
+                    column = array("d", column)
+                    column.byteswap()
+                file.write(column if isinstance(column, array) else bytes(column))
+            for sku in self.skus:
+                encoded = sku.encode("utf-8")
+                file.write(self.SKU_LENGTH.pack(len(encoded)))
+                file.write(encoded)
+        self.close()
+        os.replace(temp_path, self.path)
+
+    def close(self) -> None:
+        """
+        Закрывает mmap файла. Колонки, которые еще читаются из файла, перед этим копируются в память.
+        """
+        if self._mmap is not None:
+            self.columns = [column if isinstance(column, array) else array("d", column) for column in self.columns]
+            self._mmap.close()
+            self._mmap = None
@@ -0,0 +1,87 @@
+from typing import Dict, List, Callable, Tuple
+from checker_plus.parser import EbayParser
+
+
+class StreamMatcher:
+    """
+    Инкрементально проверяет тело ответа, которое читается порциями, и говорит, когда дальше читать не нужно:
+    - найден решающий триггер (вариация, товар закончился, ссылка на каталог) - поля с такой страницы не собираются,
+      но триггеры из 'TriggerScanner.always' (по ним определяется бан прокси) ищутся дальше, пока такой триггер
+      не найден или не встретился стоп-маркер;
+    - встретился стоп-маркер (часть страницы, после которой триггеров уже нет) и все нужные поля собираются из
+      прочитанной части так же, как из полной страницы.
+    Триггеры ищутся только в новой порции (с небольшим перекрытием). Поля проверяются один раз, когда встретился
+    стоп-маркер: если какого-то поля в прочитанной части нет, страница читается до конца.
+    Страница с решающим триггером считается исключением, даже если ниже была бы вариация: у закончившихся
+    товаров и каталогов выбор вариации не выводится.
+    :param what_need_to_parse: Словарь {поле: нужно ли его собирать}.
+    :param stop_markers: Маркеры конца значимой части страницы. Без них поля не останавливают чтение.
+    """
+    DEFAULT_STOP_MARKERS = ["<footer"]
+    DECISIVE_TRIGGERS = ("variation", "out_of_stock", "catalog_link")
+    # Перекрытие с прошлой порцией, чтобы не пропустить триггер, разрезанный границей порций.
+    OVERLAP = 256
+
+    ITEM_STATE_FIELDS = {"supplier_price", "supplier_shipping", "supplier_qty", "supplier_days"}
+    # Для характеристик поле готово, когда на странице есть точная подпись с наивысшим приоритетом: иначе на полной
+    # странице ниже может найтись подпись, которая выиграет у уже прочитанной.
+    ITEM_SPECIFIC_LABELS = {
+        "part_number": [EbayParser.PART_NUMBER_LABELS],
+        "color": [EbayParser.COLOR_LABELS],
+        "power_source": [EbayParser.POWER_SOURCE_LABELS],
+        "voltage": [EbayParser.VOLTAGE_LABELS],
+        "wattage": [EbayParser.WATTAGE_LABELS],
+        "included_components": [EbayParser.INCLUDE_COMPONENTS_LABELS],
+        "product_dimensions": [EbayParser.LENGTH_LABELS, EbayParser.WIDTH_LABELS, EbayParser.HEIGHT_LABELS],
+    }
+
+    def __init__(self, what_need_to_parse: Dict[str, bool] | None, stop_markers: List[str] | None = None):
+        self.buffer = bytearray()
+        scanner = EbayParser.TRIGGER_SCANNER
+        self.decisive = [regex for name in self.DECISIVE_TRIGGERS for regex in scanner.triggers_bytes[name]]
+        self.always = [regex for name in scanner.always for regex in scanner.triggers_bytes[name]]
+        self.stop_markers = [marker.lower().encode() for marker in
+                             (self.DEFAULT_STOP_MARKERS if stop_markers is None else stop_markers)]
+        self.unresolved: List[Tuple[str, Callable]] = EbayParser.field_getters(what_need_to_parse)
+        self.decisive_seen = False
+        self.always_seen = False
+        self.stop_marker_seen = False
+        self.fields_resolved = False
+        self._scanned = 0
+
+    def feed(self, chunk: bytes) -> bool:
+        """
+        Добавляет очередную порцию тела ответа.
+        :param chunk: Порция в bytes.
+        :return: True - остальную часть страницы можно не читать.
+        """
+        self.buffer += chunk
+        window = bytes(self.buffer[max(self._scanned - self.OVERLAP, 0):]).lower()
+        self._scanned = len(self.buffer)
+
+        if not self.decisive_seen:
+            self.decisive_seen = any(regex.search(window) for regex in self.decisive)
+        if not self.always_seen:
+            self.always_seen = any(regex.search(window) for regex in self.always)
+        if not self.stop_marker_seen:
+            self.stop_marker_seen = any(marker in window for marker in self.stop_markers)
+            if self.stop_marker_seen and not self.decisive_seen:
+                self.fields_resolved = self._fields_resolved()
+        if self.decisive_seen:
+            return self.always_seen or self.stop_marker_seen
+        return self.fields_resolved
+
+    def _fields_resolved(self) -> bool:
+        parser = EbayParser(bytes(self.buffer))
+        self.unresolved = [(key, getter) for key, getter in self.unresolved
+                           if not self._is_resolved(parser, key, getter)]
+        return not self.unresolved
+
+    def _is_resolved(self, parser: EbayParser, key: str, getter: Callable) -> bool:
+        if key in self.ITEM_SPECIFIC_LABELS:
+            item_specifics = parser._get_item_specifics()
+            return all(labels[0].casefold() in item_specifics for labels in self.ITEM_SPECIFIC_LABELS[key])
+        if key in self.ITEM_STATE_FIELDS and parser._get_item_state() is None:
+            # JSON состояния еще не дочитан: поле может быть взято из неполной страницы другим способом.
+            return False
+        return getter(parser) is not None
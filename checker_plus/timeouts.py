@@ -0,0 +1,121 @@
+import time
+import aiohttp
+from bisect import bisect_left
+from collections import deque
+from types import SimpleNamespace
+from typing import Dict, Any
+
+PHASES = ("connect", "first_byte", "read")
+
+
+class TimeoutPolicy:
+    """
+    Раздельные таймауты на фазы запроса: подключение ('connect'), ожидание первого байта ответа ('first_byte') и
+    чтение тела ('read'). Значение каждой фазы - 'multiplier' * p95 последних замеров этой фазы у прокси (пока
+    замеров у прокси мало - у всех прокси вместе, пока мало и их - 'default'), ограниченное 'min' и 'max'. Так
+    мертвый прокси отваливается примерно за секунду, а медленный, но рабочий успевает ответить.
+    :param config: Параметры. Обычно берутся из ключа 'timeouts' конфигурации магазина. Ключи фаз переопределяют
+    'default', 'min' и 'max' фазы, например {"connect": {"min": 0.5}}.
+    """
+    DEFAULT_CONFIG = {
+        "connect": {"default": 3.0, "min": 1.0, "max": 10.0},
+        "first_byte": {"default": 15.0, "min": 2.0, "max": 30.0},
+        "read": {"default": 15.0, "min": 2.0, "max": 30.0},
+        "multiplier": 3.0,
+        "quantile": 0.95,
+        "min_samples": 10,
+        "window": 100,
+    }
+    # Границы корзин гистограммы назначенных таймаутов, сек.
+    HISTOGRAM_BOUNDS = (0.5, 1, 2, 5, 10, 20, 30)
+
+    def __init__(self, config: Dict[str, Any] | None = None):
+        config = config or {}
+        self.config = {**self.DEFAULT_CONFIG, **config}
+        for phase in PHASES:
+            self.config[phase] = {**self.DEFAULT_CONFIG[phase], **config.get(phase, {})}
+        self.samples: Dict[str, Dict[str | None, deque]] = {phase: {} for phase in PHASES}
+        self.global_samples = {phase: deque(maxlen=self.config["window"]) for phase in PHASES}
+        self.histogram = {phase: [0] * (len(self.HISTOGRAM_BOUNDS) + 1) for phase in PHASES}
+        self.expired = {phase: 0 for phase in PHASES}
+
+    def observe(self, proxy_key: str | None, phase: str, seconds: float) -> None:
+        """
+        Учитывает длительность фазы успешного запроса.
+        :param proxy_key: Прокси запроса (обычно его url).
+        :param phase: 'connect', 'first_byte' или 'read'.
+        :param seconds: Длительность фазы.
+        """
+        samples = self.samples[phase].get(proxy_key)
+        if samples is None:
+            samples = self.samples[phase][proxy_key] = deque(maxlen=self.config["window"])
+        samples.append(seconds)
+        self.global_samples[phase].append(seconds)
+
+    def _quantile(self, samples: deque) -> float:
+        ordered = sorted(samples)
+        return ordered[min(int(len(ordered) * self.config["quantile"]), len(ordered) - 1)]
+
+    def deadline(self, proxy_key: str | None, phase: str) -> float:
+        """
+        :return: Таймаут фазы для запроса через прокси 'proxy_key', сек.
+        """
+        phase_config = self.config[phase]
+        samples = self.samples[phase].get(proxy_key)
+        if samples is None or len(samples) < self.config["min_samples"]:
+            samples = self.global_samples[phase]
+        if len(samples) < self.config["min_samples"]:
+            value = phase_config["default"]
+        else:
+            value = self.config["multiplier"] * self._quantile(samples)
+        return min(max(value, phase_config["min"]), phase_config["max"])
+
+    def timeouts(self, proxy_key: str | None) -> Dict[str, float]:
+        """
+        Таймауты всех фаз для одного запроса. Назначенные значения попадают в гистограмму отчета.
+        :return: Словарь {фаза: таймаут}.
+        """
+        timeouts = {phase: self.deadline(proxy_key, phase) for phase in PHASES}
+        for phase, value in timeouts.items():
+            self.histogram[phase][bisect_left(self.HISTOGRAM_BOUNDS, value)] += 1
+        return timeouts
+
+    @staticmethod
+    def client_timeout(timeouts: Dict[str, float]) -> aiohttp.ClientTimeout:
+        """
+        'aiohttp.ClientTimeout' для фаз подключения и первого байта. 'sock_read' также ограничивает паузы при
+        чтении тела, а общий срок чтения тела ограничивается отдельно.
+        Подключение ограничивается через 'sock_connect', а не 'connect': 'connect' включает еще и ожидание
+        свободного соединения в пуле сессии, которое не зависит от прокси и не замеряется 'trace_config'.
+        """
+        return aiohttp.ClientTimeout(total=None, sock_connect=timeouts["connect"], sock_read=timeouts["first_byte"])
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """
+        TraceConfig для сессии, который замеряет время установки соединения. Прокси запроса передается через
+        'trace_request_ctx={"proxy": url}'. Соединения из пула не замеряются: их не устанавливали заново.
+        """
+        async def on_start(_session, context: SimpleNamespace, _params) -> None:
+            context.connect_started = time.monotonic()
+
+        async def on_end(_session, context: SimpleNamespace, _params) -> None:
+            request_ctx = context.trace_request_ctx or {}
+            self.observe(request_ctx.get("proxy"), "connect", time.monotonic() - context.connect_started)
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_start.append(on_start)
+        trace_config.on_connection_create_end.append(on_end)
+        return trace_config
+
+    def report(self) -> Dict[str, Any]:
+        """
+        :return: По каждой фазе: сколько запросов на ней истекло и гистограмма назначенных таймаутов.
+        """
+        labels = [f"<={bound}s" for bound in self.HISTOGRAM_BOUNDS] + [f">{self.HISTOGRAM_BOUNDS[-1]}s"]
+        return {
+            phase: {
+                "expired": self.expired[phase],
+                "histogram": {label: count for label, count in zip(labels, self.histogram[phase]) if count},
+            }
+            for phase in PHASES
+        }
@@ -1,4 +1,5 @@
 import json
+import re
 from datetime import datetime, date
 from typing import Dict, List, Any, Literal
 
@@ -21,7 +22,7 @@ def write_json(file_path, data):
         json.dump(data, f, indent=4)
 
 
-async def date_to_days(string_with_date: str) -> str:
+def days_until(string_with_date: str) -> str:
     """
     Переводит дату, полученную с eBay, в разницу дней начиная с сегодня.
     :param string_with_date: Строка даты с сайта.
@@ -45,6 +46,15 @@ async def date_to_days(string_with_date: str) -> str:
     return "0days"
 
 
+async def date_to_days(string_with_date: str) -> str:
+    """
+    Асинхронная обертка над 'days_until'.
+    :param string_with_date: Строка даты с сайта.
+    :return: Разница дней.
+    """
+    return days_until(string_with_date)
+
+
 def get_next_batch(data: List[Dict[str, Any]], batch_size: int) -> List[Dict[str, Any]]:
     batch = data[:batch_size]
     del data[:batch_size]
@@ -77,6 +87,24 @@ def get_id_from_link(link_to_table: str):
     return link_to_table.split('/')[5]
 
 
+EBAY_ITEM_ID = re.compile(r'/itm/(?:[^/?#]+/)?(\d{9,15})(?:[/?#]|$)|[?&]item=(\d{9,15})')
+
+
+def get_ebay_item_id(link: str | None) -> str | None:
+    """
+    Приводит ссылку на товар eBay к id товара: 'https://www.ebay.com/itm/Some-Title/123456789012?hash=...' и
+    'https://ebay.com/itm/123456789012' дают '123456789012'.
+    :param link: Ссылка поставщика.
+    :return: Id товара либо None, если это не ссылка на товар eBay.
+    """
+    if not link:
+        return None
+    match = EBAY_ITEM_ID.search(link)
+    if not match:
+        return None
+    return match.group(1) or match.group(2)
+
+
 def filter_dict(orig_dict: Dict[str, Any], keys: List[str], mode: Literal['remove', 'keep'] = 'remove'):
     if mode not in {'remove', 'keep'}:
         raise ValueError("Invalid mode. Use 'remove' to delete keys or 'keep' to retain keys.")
@@ -5,7 +5,12 @@ from services.google_sheet_manager import GoogleSheetManager
 from checker_plus.checker import EbayChecker
 from checker_plus.utils import read_json, get_id_from_link, filter_dict
 from checker_plus.server import collect_proxies
-from checker_plus.cache_handler import CSV
+from checker_plus.cache_handler import CSV, SQLite, schema_from_columns
+from checker_plus.planner import FetchPlanner
+from checker_plus.scheduler import CheckScheduler
+from checker_plus.negative_cache import NegativeCache
+from checker_plus.checkpoint import RunCheckpoint
+from checker_plus.snapshot import StateSnapshot
 from services.prepare_json import split_and_write_json, generate_json
 from services.amazon_manager import get_shipping_ids, get_access_token, process_file
 from set_config import collect_tables_url_from_main_sheet
@@ -17,8 +22,8 @@ TABLE_ROW_SIZE = 50000
 GOOGLE_CREDS_PH = os.path.join('db', '#general', 'credentials.json')
 SHOP_DATA_PH = os.path.join('db', '#general', 'shop_data.json')
 USER_AGENTS_PH = os.path.join('db', '#general', 'user_agents.json')
-PROCESSING_PH = os.path.join('processing', 'process.csv')
-ERRORS_PH = os.path.join('processing', 'errors.csv')
+PROCESSING_DIR = 'processing'
+CHECKPOINT_PH = os.path.join(PROCESSING_DIR, 'checkpoint.json')
 
 
 async def main():
@@ -27,8 +32,19 @@ async def main():
     config = read_json(SHOP_DATA_PH)
 
     sheet_manager = GoogleSheetManager(creds_dir=GOOGLE_CREDS_PH)
+    # История проверок по магазинам. Каждый цикл проверяет только СКУ, которые пора проверить.
+    schedulers = {}
+    # Последние известные значения товаров по магазинам для подсчета изменений.
+    snapshots = {}
+    # Закончившиеся и несуществующие товары eBay по магазинам.
+    negative_caches = {}
+    # Отметка о проверке таблицы, прерванной падением процесса.
+    checkpoint = RunCheckpoint(CHECKPOINT_PH)
 
     while True:
+        # Общий на весь цикл: товар, который указан у нескольких СКУ в разных таблицах и магазинах, запрашивается
+        # один раз.
+        planner = FetchPlanner()
         for shop_info in config:
             shop_name = shop_info.get('shop_name')
             seller_id = shop_info.get('seller_id')
@@ -42,6 +58,20 @@ async def main():
 
             print(f'Start check {shop_name}')
 
+            scheduler_config = shop_info.get('scheduler', {})
+            if scheduler_config is not False and shop_name not in schedulers:
+                schedulers[shop_name] = CheckScheduler(os.path.join(PROCESSING_DIR, f'schedule_{shop_name}.json'),
+                                                       scheduler_config)
+            scheduler = schedulers.get(shop_name)
+            negative_cache_config = shop_info.get('negative_cache', {})
+            if negative_cache_config is not False and shop_name not in negative_caches:
+                negative_caches[shop_name] = NegativeCache(
+                    os.path.join(PROCESSING_DIR, f'negative_cache_{shop_name}.json'), negative_cache_config)
+            negative_cache = negative_caches.get(shop_name)
+            if shop_name not in snapshots:
+                snapshots[shop_name] = StateSnapshot(os.path.join(PROCESSING_DIR, f'snapshot_{shop_name}.bin'))
+            snapshot = snapshots[shop_name]
+
             table_id_list = collect_tables_url_from_main_sheet(shop_name)
 
             for table_link in table_id_list:
@@ -50,12 +80,30 @@ async def main():
                     continue
                 print(f'Checking table with data {START_ROW} - {TABLE_ROW_SIZE}')
 
-                proc_file = CSV(PROCESSING_PH, True)
-                errors_file = CSV(ERRORS_PH, True)
-                proc_file.create_file(columns_map)
-                errors_file.create_file(["sku", "error_type"])
-
                 table_id = get_id_from_link(table_link)
+                run = f'{shop_name}:{table_id}'
+                resume = checkpoint.interrupted(run)
+
+                # Файлы результатов и ошибок у каждой таблицы свои, поэтому проверка других таблиц не затирает
+                # результаты прерванной.
+                if shop_info.get('result_store') == 'sqlite':
+                    # Результаты всех прогонов таблицы в одной базе. Прерванная проверка продолжает свой прогон.
+                    proc_file = SQLite(os.path.join(PROCESSING_DIR, f'results_{table_id}.sqlite'))
+                    if not resume:
+                        proc_file.begin_run()
+                else:
+                    proc_file = CSV(os.path.join(PROCESSING_DIR, f'process_{table_id}.csv'), not resume,
+                                    schema=schema_from_columns(columns_map))
+                errors_file = CSV(os.path.join(PROCESSING_DIR, f'errors_{table_id}.csv'), not resume,
+                                  schema=schema_from_columns(["sku", "error_type"]))
+                done_skus = set()
+                if resume:
+                    done_skus = checkpoint.completed(proc_file)
+                if not proc_file.file_exists():
+                    proc_file.create_file(columns_map)
+                if not errors_file.file_exists():
+                    errors_file.create_file(["sku", "error_type"])
+                checkpoint.start(run)
 
                 inventory_data = sheet_manager.get_sheet_data(
                     spreadsheet_id=table_id,
@@ -77,6 +125,14 @@ async def main():
                                                 '9A1TISnmV0UmHTwQ0af5sY8GOKDgwJiMeJXD4cAR')
                 user_agents_list = read_json(USER_AGENTS_PH)
 
+                if scheduler is not None:
+                    total_rows = len(inventory_data)
+                    inventory_data = scheduler.due(inventory_data)
+                    print(f'Due for check: {len(inventory_data)} of {total_rows}')
+                if done_skus:
+                    inventory_data = [row for row in inventory_data if str(row.get('sku')) not in done_skus]
+                    print(f'Resuming interrupted check: {len(inventory_data)} rows left')
+
                 if supplier_marketplace == 'ebay':
                     checker = EbayChecker(
                         data=inventory_data,
@@ -86,7 +142,10 @@ async def main():
                         exceptions=exceptions_data,
                         exceptions_repricer=exceptions_repricer_data,
                         cache_path=proc_file,
-                        errors_path=errors_file
+                        errors_path=errors_file,
+                        planner=planner,
+                        negative_cache=negative_cache,
+                        snapshot=snapshot
                     )
                 else:
                     print('You specified wrong supplier marketplace')
@@ -94,18 +153,32 @@ async def main():
 
                 await checker.start_check(batch_size=10)
                 await checker.end_check()
+                if negative_cache is not None:
+                    negative_cache.save()
+                print(f'Changed: {len(checker.changed_skus)} SKU, {checker.report.get("snapshot")}')
 
-                checked_data = proc_file.read()
+                if scheduler is not None:
+                    failed_skus = [row['sku'] for row in errors_file.iter_rows()
+                                   if row['error_type'].startswith(EbayChecker.PAGE_ERROR)]
+                    scheduler.observe(proc_file.iter_rows(), failed_skus)
+                    scheduler.save()
 
                 columns_map_filtered = filter_dict(columns_map, ['our_price', 'our_shipping', 'handling_time',
                                                                  'merchant_shipping'])
+                # В таблицу пишутся только изменившиеся СКУ. Снимок сохраняется после записи: если запись упадет,
+                # в следующий раз эти СКУ снова будут изменившимися. В продолженной проверке строки, проверенные
+                # до падения, не попали в 'changed_skus', поэтому пишутся все строки.
                 sheet_manager.update_sheet_data_by_sku(
                     spreadsheet_id=table_id,
                     worksheet_name=main_worksheet,
-                    data=checked_data,
+                    data=proc_file.iter_rows(),
                     columns_map=columns_map_filtered,
-                    sku_column=columns_map['sku']
+                    sku_column=columns_map['sku'],
+                    skus=None if resume else checker.changed_skus
                 )
+                snapshot.save()
+                checkpoint.finish(run)
+                proc_file.close()
 
                 columns_map_filtered = filter_dict(columns_map,
                                                    ['asin', 'sku', 'our_price', 'supplier_qty', 'handling_time',
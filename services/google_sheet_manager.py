@@ -1,13 +1,19 @@
+import re
 import time
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+# Число в ячейке, записанное без форматирования и без ведущих нулей: '5', '-0.5', '12.30'.
+NUMBER_CELL = re.compile(r'-?(0|[1-9][0-9]*)(\.[0-9]+)?')
+
 
 class GoogleSheetManager:
     def __init__(self, creds_dir):
         self.service = self._authorize_google_sheets(creds_dir)
         self.indices = None
+        # Сколько ячеек не отправлено последним 'update_sheet_data_by_sku', потому что в таблице уже то же значение.
+        self.skipped_writes = 0
 
     def _authorize_google_sheets(self, service_account_file):
         scopes = ['https://www.googleapis.com/auth/spreadsheets']
@@ -133,11 +139,11 @@ class GoogleSheetManager:
             col_index = col_index // 26 - 1
         return letter
 
-    def _fetch_sheet_data(self, spreadsheet_id, worksheet_name):
+    def _fetch_sheet_data(self, spreadsheet_id, worksheet_name, value_render_option='UNFORMATTED_VALUE'):
         result = self.service.spreadsheets().values().get(
             spreadsheetId=spreadsheet_id,
             range=worksheet_name,
-            valueRenderOption='UNFORMATTED_VALUE'
+            valueRenderOption=value_render_option
         ).execute()
         return result.get('values', [])
 
@@ -202,51 +208,116 @@ class GoogleSheetManager:
         except HttpError as error:
             raise RuntimeError(f"Error adding rows: {error}")
 
+    @staticmethod
+    def _as_number(value):
+        """
+        Число из значения ячейки либо None. Строка считается числом, только если она записана как число без
+        лишних символов: '5.00' - число, а '00123', '$5.00' и '5 шт' - нет, чтобы не потерять ведущие нули
+        и форматирование.
+        """
+        if isinstance(value, bool):
+            return None
+        if isinstance(value, (int, float)):
+            return float(value)
+        if isinstance(value, str) and NUMBER_CELL.fullmatch(value):
+            return float(value)
+        return None
+
+    @classmethod
+    def _same_cell(cls, current, value):
+        """
+        Совпадает ли значение ячейки таблицы (прочитанное как 'UNFORMATTED_VALUE') с новым значением. Числа
+        сравниваются как числа, только если обе стороны - числа (см. 'GoogleSheetManager._as_number'): 5, 5.0
+        и '5.00' совпадают, а '00123' и 123 - нет. Логические значения совпадают со строками 'TRUE'/'FALSE'
+        без учета регистра. Пустая ячейка совпадает с пустой строкой и None.
+        """
+        current = '' if current is None else current
+        value = '' if value is None else value
+        if current == value and type(current) is type(value):
+            return True
+        current_number, number = cls._as_number(current), cls._as_number(value)
+        if current_number is not None and number is not None:
+            return current_number == number
+        if isinstance(current, bool) or isinstance(value, bool):
+            return str(current).upper() == str(value).upper()
+        return False
+
+    def _prepare_updates_by_sku(self, spreadsheet_id, worksheet_name, data, sku_column, columns_map,
+                                skip_unchanged=True, skus=None):
+        # Для сравнения нужны значения без форматирования: иначе '$5.00' или '5%' никогда не совпадут с новыми.
+        sheet_data = self._fetch_sheet_data(spreadsheet_id, worksheet_name, value_render_option='UNFORMATTED_VALUE')
+        if not sheet_data:
+            raise ValueError(f"No data found in the sheet '{worksheet_name}'")
+
+        headers = sheet_data[0]
+        if sku_column not in headers:
+            raise ValueError(f"SKU column '{sku_column}' not found in the sheet headers")
+
+        sku_index = headers.index(sku_column)
+        column_indices = self.map_column_indices(headers, columns_map)
+
+        # СКУ сравниваются как строки: таблица возвращает числовой СКУ как int, а файл кеша - как строку.
+        row_map = {}
+        for idx, row in enumerate(sheet_data[1:]):
+            if sku_index < len(row) and str(row[sku_index]) not in row_map:
+                row_map[str(row[sku_index])] = idx + 2
+
+        updates = []
+        skipped = 0
+        for row_data in data:
+            sku = str(row_data.get(sku_column))
+            if skus is not None and sku not in skus:
+                continue
+            if sku in row_map:
+                row_index = row_map[sku]
+                sheet_row = sheet_data[row_index - 1]
+                for key, value in row_data.items():
+                    if key == 'asin' and value == '':
+                        continue
+                    if key in column_indices:
+                        col_index = column_indices[key]
+                        if skip_unchanged and self._same_cell(
+                                sheet_row[col_index] if col_index < len(sheet_row) else '', value):
+                            skipped += 1
+                            continue
+                        col_letter = self._get_column_letter(col_index)
+                        range_str = f'{worksheet_name}!{col_letter}{row_index}'
+                        updates.append({'range': range_str, 'values': [[value]]})
+        self.skipped_writes = skipped
+        return updates
+
     def update_sheet_data_by_sku(
-            self, spreadsheet_id, worksheet_name, data, sku_column, columns_map, max_retries=10, retry_delay=60
+            self, spreadsheet_id, worksheet_name, data, sku_column, columns_map, max_retries=10, retry_delay=60,
+            skip_unchanged=True, skus=None
     ):
+        """
+        Обновляет ячейки строк таблицы, найденных по СКУ.
+        :param data: Строки с новыми значениями. Может быть генератором (например, 'CSV.iter_rows'): строки
+        проходятся один раз, даже если запрос к таблице приходится повторять.
+        :param skip_unchanged: Не отправлять ячейки, в которых таблица уже содержит то же значение. Значения
+        сравниваются с данными таблицы, прочитанными перед обновлением. Кол-во пропущенных ячеек сохраняется
+        в 'self.skipped_writes'.
+        :param skus: Множество СКУ (строками), строки которых нужно записать, например изменившиеся СКУ
+        из 'StateSnapshot'. Остальные строки пропускаются без сравнения. None - записываются все строки.
+        """
         retries = 0
+        updates = None
 
         while retries < max_retries:
             try:
-                sheet_data = self._fetch_sheet_data(spreadsheet_id, worksheet_name)
-                if not sheet_data:
-                    raise ValueError(f"No data found in the sheet '{worksheet_name}'")
-
-                headers = sheet_data[0]
-                if sku_column not in headers:
-                    raise ValueError(f"SKU column '{sku_column}' not found in the sheet headers")
-
-                sku_index = headers.index(sku_column)
-                column_indices = self.map_column_indices(headers, columns_map)
-
-                sku_list = [row[sku_column] for row in data if sku_column in row]
-
-                data_rows = sheet_data[1:]
-
-                row_map = {}
-                for idx, row in enumerate(data_rows):
-                    if sku_index < len(row) and row[sku_index] in sku_list:
-                        if row[sku_index] not in row_map:
-                            row_map[row[sku_index]] = idx + 2
-
-                updates = []
-                for row_data in data:
-                    sku = row_data.get(sku_column)
-                    if sku in row_map:
-                        row_index = row_map[sku]
-                        for key, value in row_data.items():
-                            if key == 'asin' and value == '':
-                                continue
-                            if key in column_indices:
-                                col_letter = self._get_column_letter(column_indices[key])
-                                range_str = f'{worksheet_name}!{col_letter}{row_index}'
-                                updates.append({'range': range_str, 'values': [[value]]})
+                if updates is None:
+                    updates = self._prepare_updates_by_sku(spreadsheet_id, worksheet_name, data, sku_column,
+                                                           columns_map, skip_unchanged, skus)
+                    if self.skipped_writes:
+                        print(f"Skipped {self.skipped_writes} unchanged cells in {worksheet_name}.")
 
                 if updates:
                     self._batch_update_in_chunks(spreadsheet_id, updates)
                     print(f"Updated {len(updates)} cells in {worksheet_name}.")
                     return True
+                elif self.skipped_writes:
+                    print("No updates were made because all matching cells are unchanged.")
+                    return False
                 else:
                     print("No updates were made because no matching SKU was found.")
                     return False
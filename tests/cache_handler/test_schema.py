@@ -0,0 +1,27 @@
+from checker_plus.cache_handler import CSV, TXT, schema_from_columns
+
+COLUMNS = {"sku": "SKU", "supplier_price": "price", "supplier_qty": "stock", "supplier_name": "name"}
+
+
+def test_csv_read_with_schema(tmp_path):
+    rows = [{"sku": "00123", "supplier_price": 5, "supplier_qty": 3, "supplier_name": "42"},
+            {"sku": "sku2", "supplier_price": "", "supplier_qty": "1.5", "supplier_name": "{no_page}"}]
+    proc_file = CSV(str(tmp_path / "process.csv"), schema=schema_from_columns(COLUMNS))
+    proc_file.append_to_file(rows, COLUMNS)
+
+    assert proc_file.read() == [
+        {"sku": "00123", "supplier_price": 5.0, "supplier_qty": 3, "supplier_name": "42"},
+        {"sku": "sku2", "supplier_price": "", "supplier_qty": 1.5, "supplier_name": "{no_page}"},
+    ]
+    assert CSV(proc_file.path).read()[0] == {"sku": 123, "supplier_price": 5, "supplier_qty": 3, "supplier_name": 42}
+
+
+def test_txt_iter_rows_with_schema(tmp_path):
+    txt_file = TXT(str(tmp_path / "process.txt"), schema=schema_from_columns(COLUMNS))
+    txt_file.create_file(list(COLUMNS))
+    txt_file.append_to_file([{"sku": "00123", "supplier_price": "5.5", "supplier_qty": "", "supplier_name": "Bob"}],
+                            {key: key for key in COLUMNS})
+
+    rows = txt_file.iter_rows()
+    assert next(rows) == {"sku": "00123", "supplier_price": 5.5, "supplier_qty": "", "supplier_name": "Bob"}
+    assert next(rows, None) is None
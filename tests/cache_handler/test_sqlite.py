@@ -0,0 +1,52 @@
+from checker_plus.cache_handler import SQLite
+from checker_plus.checkpoint import RunCheckpoint
+
+COLUMNS = ["sku", "supplier_price", "supplier_qty"]
+
+
+def test_sqlite_upsert_and_changed_rows(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    store = SQLite(path)
+    assert not store.file_exists()
+    store.begin_run()
+    store.open_writer(COLUMNS)
+    store.append_to_file([{"sku": "00123", "supplier_price": 5.5, "supplier_qty": 3},
+                          {"sku": "sku2", "supplier_price": 1.0, "supplier_qty": 0}], COLUMNS, sync=True)
+    assert store.read() == [{"sku": "00123", "supplier_price": 5.5, "supplier_qty": 3},
+                            {"sku": "sku2", "supplier_price": 1.0, "supplier_qty": 0}]
+
+    assert store.begin_run() == 2
+    assert store.read() == []
+    store.append_to_file([{"sku": "00123", "supplier_price": 6.0, "supplier_qty": 3},
+                          {"sku": "sku2", "supplier_price": 1.0, "supplier_qty": 0}], COLUMNS)
+    store.append_to_file([{"sku": "00123", "supplier_price": 6.0, "supplier_qty": 2}], COLUMNS)
+    assert [row["sku"] for row in store.iter_rows()] == ["00123", "sku2"]
+    assert list(store.iter_rows(changed_only=True)) == [{"sku": "00123", "supplier_price": 6.0, "supplier_qty": 2}]
+
+    reader = SQLite(path)
+    assert reader.run == 2
+    assert len(reader.read()) == 2
+    reader.close()
+    store.close()
+
+
+def test_sqlite_resume_with_checkpoint(tmp_path):
+    store = SQLite(str(tmp_path / "results.sqlite"))
+    store.begin_run()
+    store.create_file(COLUMNS)
+    store.append_to_file([{"sku": 1, "supplier_price": 5.5}], COLUMNS)
+    store.close()
+
+    store = SQLite(str(tmp_path / "results.sqlite"))
+    assert RunCheckpoint(str(tmp_path / "checkpoint.json")).completed(store) == {"1"}
+    store.close()
+
+
+def test_sqlite_sku_only_table(tmp_path):
+    store = SQLite(str(tmp_path / "results.sqlite"))
+    store.begin_run()
+    store.create_file(["sku"])
+    store.append_to_file([{"sku": "sku1"}], ["sku"])
+    assert store.columns == ["sku"]
+    assert store.read() == [{"sku": "sku1"}]
+    store.close()
@@ -0,0 +1,29 @@
+from checker_plus.cache_handler import CSV
+
+
+def test_writer_buffers_and_keeps_header(tmp_path):
+    proc_file = CSV(str(tmp_path / "process.csv"))
+    proc_file.create_file(["sku", "supplier_price"])
+    writer = proc_file.open_writer(["ignored"], flush_every=2)
+    assert writer.columns == ("sku", "supplier_price")
+
+    proc_file.append_to_file([{"sku": "sku1", "supplier_price": 5.5, "extra": 1}], ["sku", "supplier_price"])
+    with open(proc_file.path) as csvfile:
+        assert csvfile.read().splitlines() == ["sku,supplier_price"]
+
+    proc_file.append_to_file([{}, {"sku": "sku2"}], ["sku", "supplier_price"])
+    with open(proc_file.path) as csvfile:
+        assert csvfile.read().splitlines() == ["sku,supplier_price", "sku1,5.5", "sku2,"]
+
+    proc_file.append_to_file([{"sku": "sku3", "supplier_price": 1}], ["sku", "supplier_price"])
+    assert [row["sku"] for row in proc_file.read()] == ["sku1", "sku2", "sku3"]
+    proc_file.close_writer()
+    assert proc_file.writer is None
+
+
+def test_writer_creates_file(tmp_path):
+    errors_file = CSV(str(tmp_path / "errors.csv"))
+    errors_file.open_writer({"sku": "SKU", "error_type": "Error"})
+    errors_file.append_to_file([{"sku": "sku1", "error_type": "404"}], ["sku", "error_type"])
+    errors_file.close_writer()
+    assert errors_file.read() == [{"sku": "sku1", "error_type": 404}]
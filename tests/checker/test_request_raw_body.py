@@ -0,0 +1,27 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from checker_plus.checker import Checker
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("shop_config, expected_page", [
+    ({"raw_body": True}, b"<html>Response 200</html>"),
+    ({}, "<html>Response 200</html>"),
+])
+async def test_request_raw_body(shop_config, expected_page):
+    checker = Checker(proxies=[], user_agents=[], shop_config=shop_config, exceptions=[], exceptions_repricer=[])
+
+    response_mock = MagicMock()
+    response_mock.status = 200
+    response_mock.read = AsyncMock(return_value=b"<html>Response 200</html>")
+    response_mock.text = AsyncMock(return_value="<html>Response 200</html>")
+
+    mock_session_get = MagicMock()
+    mock_session_get.__aenter__.return_value = response_mock
+    mock_session_get.__aexit__.return_value = AsyncMock()
+
+    with patch("aiohttp.ClientSession.get", return_value=mock_session_get):
+        result = await checker.request("https://exemple.com", dict(url="http://0.0.0.0:8080", auth=None))
+    await checker.session_manager.close()
+
+    assert result == expected_page
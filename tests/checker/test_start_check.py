@@ -0,0 +1,209 @@
+import asyncio
+import pytest
+from checker_plus.checker import EbayChecker
+from checker_plus.cache_handler import CSV
+from checker_plus.planner import FetchPlanner
+from checker_plus.negative_cache import NegativeCache
+from checker_plus.snapshot import StateSnapshot
+
+
+@pytest.mark.asyncio
+async def test_start_check_writes_all_rows(tmp_path):
+    columns = {"sku": "sku", "supplier_link": "supplier link", "supplier_price": "supplier price",
+               "supplier_qty": "stock", "supplier_name": "supplier name"}
+    cache_file = CSV(str(tmp_path / "process.csv"))
+    errors_file = CSV(str(tmp_path / "errors.csv"))
+    cache_file.create_file(list(columns))
+    data = [{"sku": f"sku{i}", "supplier_link": "", "supplier_price": 1.0, "variation": ""} for i in range(12)]
+
+    checker = EbayChecker(data=data, proxies=["login:pass@127.0.0.1:8080"], user_agents=[],
+                          shop_config={"columns": columns, "strategy": "drop"}, exceptions=[],
+                          exceptions_repricer=[], cache_path=cache_file, errors_path=errors_file)
+    await checker.start_check(batch_size=5, concurrency=3)
+    await checker.end_check()
+
+    rows = cache_file.read()
+    assert sorted(row["sku"] for row in rows) == sorted(f"sku{i}" for i in range(12))
+    assert all(row["supplier_name"] == "{no_page}" for row in rows)
+    assert checker.report["pipeline"]["write"]["processed"] == 12
+
+
+@pytest.mark.asyncio
+async def test_start_check_retries_transient_errors(tmp_path):
+    columns = {"sku": "sku", "supplier_link": "supplier link", "supplier_price": "supplier price"}
+    cache_file = CSV(str(tmp_path / "process.csv"))
+    errors_file = CSV(str(tmp_path / "errors.csv"))
+    cache_file.create_file(list(columns))
+    data = [{"sku": f"sku{i}", "supplier_link": f"https://www.ebay.com/itm/{i}", "supplier_price": 1.0,
+             "variation": ""} for i in range(4)]
+    calls = {}
+
+    async def request(link, proxy, headers=None):
+        calls[link] = calls.get(link, 0) + 1
+        if link.endswith("/0"):
+            return f"403 Forbidden: {link}"
+        if link.endswith("/1") and calls[link] == 1:
+            return f"Timeout error: {link}"
+        return '<script>{"price":"5.00"}</script>'
+
+    checker = EbayChecker(data=data, proxies=["login:pass@127.0.0.1:8080", "login:pass@127.0.0.2:8080"],
+                          user_agents=[], exceptions=[], exceptions_repricer=[], cache_path=cache_file,
+                          errors_path=errors_file,
+                          shop_config={"columns": columns, "strategy": "drop", "parse_backend": {"type": "inline"},
+                                       "what_need_to_parse": {"supplier_price": True},
+                                       "retry": {"attempts": 3, "base_delay": 0.01}})
+    checker.request = request
+    await checker.start_check(batch_size=5, concurrency=2)
+    await checker.end_check()
+
+    rows = {row["sku"]: row for row in cache_file.read()}
+    assert calls["https://www.ebay.com/itm/0"] == 3
+    assert calls["https://www.ebay.com/itm/1"] == 2
+    assert rows["sku0"]["supplier_price"] == 1.0
+    assert rows["sku1"]["supplier_price"] == 5.0
+    assert checker.report["retry"]["items"] == 4
+    assert checker.report["retry"]["first_try_success_rate"] == 0.5
+    assert checker.report["retry"]["eventual_success_rate"] == 0.75
+    assert [row["sku"] for row in errors_file.read()] == ["sku0"]
+
+
+@pytest.mark.asyncio
+async def test_start_check_fetches_shared_item_once(tmp_path):
+    columns = {"sku": "sku", "supplier_link": "supplier link", "supplier_price": "supplier price"}
+    shop_config = {"columns": columns, "strategy": "drop", "parse_backend": {"type": "inline"},
+                   "what_need_to_parse": {"supplier_price": True}}
+    links = ["https://www.ebay.com/itm/123456789012", "https://www.ebay.com/itm/Some-Title/123456789012?hash=1",
+             "https://ebay.com/itm/123456789012", "https://www.ebay.com/itm/223456789012"]
+    calls = []
+
+    async def request(link, proxy, headers=None):
+        calls.append(link)
+        await asyncio.sleep(0.05)
+        return '<script>{"price":"5.00"}</script>'
+
+    planner = FetchPlanner()
+    for table in range(2):
+        cache_file = CSV(str(tmp_path / f"process{table}.csv"))
+        cache_file.create_file(list(columns))
+        data = [{"sku": f"sku{table}-{i}", "supplier_link": link, "supplier_price": 1.0, "variation": ""}
+                for i, link in enumerate(links)]
+        checker = EbayChecker(data=data, proxies=["login:pass@127.0.0.1:8080"], user_agents=[], exceptions=[],
+                              exceptions_repricer=[], cache_path=cache_file,
+                              errors_path=CSV(str(tmp_path / "errors.csv")), shop_config=shop_config,
+                              planner=planner)
+        checker.request = request
+        await checker.start_check(batch_size=5, concurrency=4)
+        await checker.end_check()
+        assert all(row["supplier_price"] == 5.0 for row in cache_file.read())
+        assert checker.report["retry"]["items"] == (2 if table == 0 else 0)
+
+    assert len(calls) == 2
+    assert planner.report() == {"unique": 2, "cached": 4, "coalesced": 2}
+
+
+@pytest.mark.asyncio
+async def test_start_check_releases_followers_when_owner_raises(tmp_path):
+    columns = {"sku": "sku", "supplier_link": "supplier link", "supplier_price": "supplier price"}
+    shop_config = {"columns": columns, "strategy": "drop", "parse_backend": {"type": "inline"},
+                   "what_need_to_parse": {"supplier_price": True}}
+    link = "https://www.ebay.com/itm/123456789012"
+    calls = []
+
+    async def request(link, proxy, headers=None):
+        calls.append(link)
+        await asyncio.sleep(0.05)
+        if len(calls) == 1:
+            raise RuntimeError("owner failed")
+        return '<script>{"price":"5.00"}</script>'
+
+    planner = FetchPlanner()
+    for table in range(2):
+        cache_file = CSV(str(tmp_path / f"process{table}.csv"))
+        cache_file.create_file(list(columns))
+        data = [{"sku": f"sku{table}-{i}", "supplier_link": link, "supplier_price": 1.0, "variation": ""}
+                for i in range(3)]
+        checker = EbayChecker(data=data, proxies=["login:pass@127.0.0.1:8080"], user_agents=[], exceptions=[],
+                              exceptions_repricer=[], cache_path=cache_file,
+                              errors_path=CSV(str(tmp_path / f"errors{table}.csv")), shop_config=shop_config,
+                              planner=planner)
+        checker.request = request
+        if table == 0:
+            with pytest.raises(RuntimeError):
+                await asyncio.wait_for(checker.start_check(batch_size=5, concurrency=3), 5)
+        else:
+            await asyncio.wait_for(checker.start_check(batch_size=5, concurrency=3), 5)
+            assert all(row["supplier_price"] == 5.0 for row in cache_file.read())
+        await checker.end_check()
+        assert planner.owners == {} and planner.followers == {}
+
+
+@pytest.mark.asyncio
+async def test_start_check_skips_dead_items(tmp_path):
+    columns = {"sku": "sku", "supplier_link": "supplier link", "supplier_price": "supplier price",
+               "supplier_qty": "stock", "supplier_name": "supplier name"}
+    shop_config = {"columns": columns, "strategy": "drop", "parse_backend": {"type": "inline"},
+                   "what_need_to_parse": {"supplier_price": True}}
+    pages = {"https://www.ebay.com/itm/123456789012": "<div>This listing was ended</div>",
+             "https://www.ebay.com/itm/223456789012": "404 Not Found: https://www.ebay.com/itm/223456789012",
+             "https://www.ebay.com/itm/323456789012": '<script>{"price":"5.00"}</script>'}
+    calls = []
+
+    async def request(link, proxy, headers=None):
+        calls.append(link)
+        return pages[link]
+
+    negative_cache = NegativeCache(str(tmp_path / "negative_cache.json"), {"probe_rate": 0})
+    for cycle in range(2):
+        cache_file = CSV(str(tmp_path / f"process{cycle}.csv"))
+        cache_file.create_file(list(columns))
+        data = [{"sku": f"sku{i}", "supplier_link": link, "supplier_price": 1.0, "supplier_qty": 3,
+                 "supplier_name": "", "variation": ""} for i, link in enumerate(pages)]
+        checker = EbayChecker(data=data, proxies=["login:pass@127.0.0.1:8080"], user_agents=[], exceptions=[],
+                              exceptions_repricer=[], cache_path=cache_file,
+                              errors_path=CSV(str(tmp_path / f"errors{cycle}.csv")), shop_config=shop_config,
+                              negative_cache=negative_cache)
+        checker.request = request
+        await checker.start_check(batch_size=5, concurrency=2)
+        await checker.end_check()
+        rows = {row["sku"]: row for row in cache_file.read()}
+        assert rows["sku0"]["supplier_name"] == "{out_of_stock}"
+        assert rows["sku0"]["supplier_qty"] == 0
+        assert rows["sku1"]["supplier_price"] == 1.0
+        assert rows["sku2"]["supplier_price"] == 5.0
+        assert checker.report["retry"]["items"] == (3 if cycle == 0 else 1)
+
+    assert sorted(calls) == sorted(pages) + ["https://www.ebay.com/itm/323456789012"]
+    assert negative_cache.report()["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_start_check_diffs_against_snapshot(tmp_path):
+    columns = {"sku": "sku", "supplier_link": "supplier link", "supplier_price": "supplier price"}
+    shop_config = {"columns": columns, "strategy": "drop", "parse_backend": {"type": "inline"},
+                   "what_need_to_parse": {"supplier_price": True}, "retry": {"attempts": 1}}
+    snapshot = StateSnapshot(str(tmp_path / "snapshot.bin"))
+    snapshot.update([{"sku": "sku0", "supplier_price": 5.0}, {"sku": "sku1", "supplier_price": 4.0},
+                     {"sku": "sku2", "supplier_price": 1.0}])
+    pages = {"https://www.ebay.com/itm/0": '<script>{"price":"5.00"}</script>',
+             "https://www.ebay.com/itm/1": '<script>{"price":"5.00"}</script>',
+             "https://www.ebay.com/itm/2": "Timeout error: https://www.ebay.com/itm/2"}
+
+    async def request(link, proxy, headers=None):
+        return pages[link]
+
+    cache_file = CSV(str(tmp_path / "process.csv"))
+    cache_file.create_file(list(columns))
+    data = [{"sku": f"sku{i}", "supplier_link": link, "supplier_price": 1.0, "variation": ""}
+            for i, link in enumerate(pages)]
+    checker = EbayChecker(data=data, proxies=["login:pass@127.0.0.1:8080"], user_agents=[], exceptions=[],
+                          exceptions_repricer=[], cache_path=cache_file, errors_path=CSV(str(tmp_path / "errors.csv")),
+                          shop_config=shop_config, snapshot=snapshot)
+    checker.request = request
+    await checker.start_check(batch_size=5, concurrency=2)
+    await checker.end_check()
+
+    assert checker.changed_skus == {"sku1"}
+    assert checker.report["snapshot"]["compared"] == 2
+    assert checker.report["snapshot"]["new_price"] == 1
+    assert snapshot.get("sku1")[0] == 5.0
+    assert snapshot.get("sku2")[0] == 1.0
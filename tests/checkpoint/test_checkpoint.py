@@ -0,0 +1,37 @@
+import os
+from checker_plus.cache_handler import CSV
+from checker_plus.checkpoint import RunCheckpoint
+
+
+def test_checkpoint_resume(tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    results = CSV(str(tmp_path / "process.csv"))
+    results.create_file(["sku", "supplier_price", "supplier_name"])
+    results.append_to_file([{"sku": "sku1", "supplier_price": 5.0, "supplier_name": "Bob"},
+                            {"sku": 2, "supplier_price": 6.0, "supplier_name": "Jimm"}],
+                           ["sku", "supplier_price", "supplier_name"], sync=True)
+    with open(results.path, "a", newline="") as csvfile:
+        csvfile.write("sku3,7.")
+
+    RunCheckpoint(path).start("shop:table1")
+    checkpoint = RunCheckpoint(path)
+    assert checkpoint.interrupted("shop:table1")
+    assert not checkpoint.interrupted("shop:table2")
+    assert checkpoint.completed(results) == {"sku1", "2"}
+    assert [row["sku"] for row in results.read()] == ["sku1", 2]
+
+    checkpoint.finish("shop:table1")
+    assert not RunCheckpoint(path).interrupted("shop:table1")
+
+
+def test_checkpoint_keeps_other_runs(tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    RunCheckpoint(path).start("shop:table2")
+
+    checkpoint = RunCheckpoint(path)
+    checkpoint.start("shop:table1")
+    checkpoint.finish("shop:table1")
+    assert RunCheckpoint(path).interrupted("shop:table2")
+
+    checkpoint.finish("shop:table2")
+    assert not os.path.isfile(path)
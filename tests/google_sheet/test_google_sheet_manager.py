@@ -215,5 +215,63 @@ class TestGoogleSheetManager(unittest.TestCase):
 
         self.assertEqual(actual_updates, expected_updates)
 
+    @patch.object(GoogleSheetManager, '_fetch_sheet_data')
+    @patch.object(GoogleSheetManager, '_batch_update_in_chunks')
+    def test_update_sheet_data_by_sku_skips_unchanged(self, mock_batch_update, mock_fetch_sheet_data):
+        mock_fetch_sheet_data.return_value = [
+            ['sku', 'supplier price', 'stock'],
+            ['00123', 5, 3],
+            ['12345', '4.50', '']
+        ]
+        data = iter([
+            {'sku': '00123', 'supplier_price': 5.0, 'supplier_qty': 2},
+            {'sku': '12345', 'supplier_price': 4.5, 'supplier_qty': ''}
+        ])
+        columns_map = {'sku': 'sku', 'supplier_price': 'supplier price', 'supplier_qty': 'stock'}
 
+        self.manager.update_sheet_data_by_sku("spreadsheet_id", "worksheet_name", data, 'sku', columns_map)
+
+        mock_batch_update.assert_called_once_with(
+            "spreadsheet_id", [{'range': 'worksheet_name!C2', 'values': [[2]]}])
+        self.assertEqual(self.manager.skipped_writes, 5)
+
+    def test_same_cell(self):
+        self.assertTrue(GoogleSheetManager._same_cell(5, '5.00'))
+        self.assertTrue(GoogleSheetManager._same_cell(4.5, 4.50))
+        self.assertTrue(GoogleSheetManager._same_cell(True, 'TRUE'))
+        self.assertTrue(GoogleSheetManager._same_cell('', None))
+        self.assertFalse(GoogleSheetManager._same_cell('00123', 123))
+        self.assertFalse(GoogleSheetManager._same_cell('$5.00', 5))
+        self.assertFalse(GoogleSheetManager._same_cell(True, 1))
+        self.assertFalse(GoogleSheetManager._same_cell('12days', 12))
+
+    @patch.object(GoogleSheetManager, '_fetch_sheet_data')
+    @patch.object(GoogleSheetManager, '_batch_update_in_chunks')
+    def test_update_sheet_data_by_sku_numeric_sku_cell(self, mock_batch_update, mock_fetch_sheet_data):
+        mock_fetch_sheet_data.return_value = [
+            ['sku', 'supplier price'],
+            [12345, 5]
+        ]
+        data = [{'sku': '12345', 'supplier_price': 6.5}]
+        columns_map = {'sku': 'sku', 'supplier_price': 'supplier price'}
+
+        self.assertTrue(
+            self.manager.update_sheet_data_by_sku("spreadsheet_id", "worksheet_name", data, 'sku', columns_map))
+        mock_batch_update.assert_called_once_with(
+            "spreadsheet_id", [{'range': 'worksheet_name!B2', 'values': [[6.5]]}])
+
+    @patch.object(GoogleSheetManager, '_fetch_sheet_data')
+    @patch.object(GoogleSheetManager, '_batch_update_in_chunks')
+    def test_update_sheet_data_by_sku_only_given_skus(self, mock_batch_update, mock_fetch_sheet_data):
+        mock_fetch_sheet_data.return_value = [
+            ['sku', 'supplier price'],
+            ['sku1', 5],
+            ['sku2', 5]
+        ]
+        data = [{'sku': 'sku1', 'supplier_price': 6.5}, {'sku': 'sku2', 'supplier_price': 7.5}]
+        columns_map = {'sku': 'sku', 'supplier_price': 'supplier price'}
 
+        self.manager.update_sheet_data_by_sku(
+            "spreadsheet_id", "worksheet_name", data, 'sku', columns_map, skus={'sku2'})
+        mock_batch_update.assert_called_once_with(
+            "spreadsheet_id", [{'range': 'worksheet_name!B3', 'values': [[7.5]]}])
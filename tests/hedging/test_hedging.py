@@ -0,0 +1,83 @@
+import time
+import pytest
+import asyncio
+from aiohttp import web
+from checker_plus.checker import Checker
+from checker_plus.hedging import HedgePolicy
+
+
+async def start_proxy_server(delay: float, body: str) -> tuple[web.AppRunner, int]:
+    async def handler(_request):
+        await asyncio.sleep(delay)
+        return web.Response(text=body, content_type="text/html")
+
+    app = web.Application()
+    app.router.add_route("GET", "/{tail:.*}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, site._server.sockets[0].getsockname()[1]
+
+
+async def hedged_request(hedging: dict, quarantine_fast: bool = False) -> tuple[Checker, str, float]:
+    slow_runner, slow_port = await start_proxy_server(0.5, "<html>slow</html>")
+    fast_runner, fast_port = await start_proxy_server(0.0, "<html>fast</html>")
+    checker = Checker(proxies=[f"login:pass@127.0.0.1:{slow_port}", f"login:pass@127.0.0.1:{fast_port}"],
+                      user_agents=[], shop_config={"hedging": hedging}, exceptions=[], exceptions_repricer=[])
+    for _ in range(20):
+        checker.hedge_policy.observe(0.05)
+    checker.hedge_policy.requests = 100
+    try:
+        await checker._prepare_proxies()
+        if quarantine_fast:
+            checker.proxy_pool.states[1].needs_probe = True
+        slow_proxy = checker.proxy_pool.states[0].proxy
+        started = time.monotonic()
+        page, served = await checker.request_served("http://ebay.test/itm/1", slow_proxy)
+        elapsed = time.monotonic() - started
+        assert served is checker.proxy_pool.states[1 if page == "<html>fast</html>" else 0]
+    finally:
+        await checker.session_manager.close()
+        await slow_runner.cleanup()
+        await fast_runner.cleanup()
+    return checker, page, elapsed
+
+
+@pytest.mark.asyncio
+async def test_hedge_wins_over_slow_proxy():
+    checker, page, elapsed = await hedged_request({"min_delay": 0.05})
+    assert page == "<html>fast</html>"
+    assert elapsed < 0.4
+    assert checker.hedge_policy.report()["hedge_wins"] == 1
+    assert checker.proxy_pool.states[1].requests == 1
+    assert checker.proxy_pool.states[0].requests == 0
+
+
+@pytest.mark.asyncio
+async def test_hedge_rate_cap():
+    checker, page, elapsed = await hedged_request({"min_delay": 0.05, "max_rate": 0.0})
+    assert page == "<html>slow</html>"
+    assert elapsed >= 0.5
+    assert checker.hedge_policy.hedges == 0
+
+
+@pytest.mark.asyncio
+async def test_hedge_skips_quarantined_proxy():
+    checker, page, elapsed = await hedged_request({"min_delay": 0.05}, quarantine_fast=True)
+    assert page == "<html>slow</html>"
+    assert checker.hedge_policy.hedges == 0
+    assert checker.proxy_pool.states[0].requests == 1
+    assert checker.proxy_pool.states[1].requests == 0
+
+
+def test_hedge_policy_delay_and_allow():
+    policy = HedgePolicy({"min_samples": 10, "min_delay": 0.1, "max_rate": 0.1})
+    for latency in range(1, 11):
+        policy.observe(latency / 10)
+    assert policy.delay() == 1.0
+    policy.requests = 20
+    assert policy.allow()
+    policy.hedges = 2
+    assert not policy.allow()
+    assert HedgePolicy().delay() is None
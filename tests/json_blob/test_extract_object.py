@@ -0,0 +1,29 @@
+import pytest
+from checker_plus.json_blob import extract_object, find_value, locate_object
+
+PAGE = ('<script>var cfg = {"a": 1}; $state = {"item":{"title":"Lamp {big}","price":"10.50",'
+        '"logistics":{"shippingRate":{"label":"Shipping","value":"4.99"}},'
+        '"qty":{"maxValue":"7"}}};</script><script>{"price":"99.99"}</script>')
+
+
+def test_locate_object_contains_all_positions():
+    positions = [PAGE.find('"price"'), PAGE.find('"maxValue"')]
+    start, end = locate_object(PAGE, positions)
+    assert PAGE[start:end].startswith('{"title":')
+    assert start < min(positions) and end > max(positions)
+
+
+def test_extract_object():
+    state = extract_object(PAGE, [PAGE.find('"price"'), PAGE.find('"shippingRate"')])
+    assert find_value(state, "price") == "10.50"
+    assert find_value(find_value(state, "shippingRate"), "value") == "4.99"
+    assert find_value(state, "maxValue") == "7"
+
+
+@pytest.mark.parametrize("page", [
+    '<script>{"price":"10.50","maxValue":"7",}</script>',
+    '<script>"price":"10.50"</script>',
+    '<script>{"price":"10.50"</script>',
+])
+def test_extract_object_invalid(page):
+    assert extract_object(page, [page.find('"price"')]) is None
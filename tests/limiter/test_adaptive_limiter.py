@@ -0,0 +1,105 @@
+import pytest
+import asyncio
+from checker_plus.checker import Checker
+from checker_plus.limiter import AdaptiveLimiter
+from checker_plus.proxy_pool import ProxyPool
+
+
+@pytest.mark.asyncio
+async def test_limits_in_flight():
+    limiter = AdaptiveLimiter({"initial": 3, "max": 3})
+    in_flight = 0
+    max_in_flight = 0
+
+    async def task():
+        nonlocal in_flight, max_in_flight
+        async with limiter:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+
+    await asyncio.gather(*(task() for _ in range(20)))
+    assert max_in_flight == 3
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_additive_increase_when_healthy_and_saturated():
+    limiter = AdaptiveLimiter({"initial": 4, "max": 6, "min_samples": 4})
+
+    async def task():
+        async with limiter:
+            await asyncio.sleep(0)
+            limiter.record("ok", 0.1)
+
+    await asyncio.gather(*(task() for _ in range(60)))
+    assert limiter.report()["limit"] == 6
+    assert limiter.increases >= 2
+
+
+def test_multiplicative_decrease_on_errors():
+    limiter = AdaptiveLimiter({"initial": 50, "min": 5, "min_samples": 10, "decrease_factor": 0.5})
+    for i in range(50):
+        limiter.record("forbidden" if i % 4 == 0 else "ok", 0.1)
+    assert limiter.report()["limit"] == 25
+    for _ in range(100):
+        limiter.record("timeout", 0.1)
+    report = limiter.report()
+    assert report["limit"] == 5
+    assert report["min_limit"] == 5 and report["max_limit"] == 50
+
+
+def test_decrease_on_latency():
+    limiter = AdaptiveLimiter({"initial": 20, "min_samples": 20, "max_p95_latency": 2.0})
+    for i in range(20):
+        limiter.record("ok", 5.0 if i >= 18 else 0.5)
+    assert limiter.decreases == 1
+    assert limiter.report()["limit"] == 14
+
+
+def test_skipped_rows_are_not_samples():
+    limiter = AdaptiveLimiter({"initial": 10, "min_samples": 2})
+    limiter.record(None)
+    limiter.record(None)
+    assert limiter.decreases == limiter.increases == 0
+
+
+def test_reclassify_keeps_window_size():
+    limiter = AdaptiveLimiter({"initial": 10, "min_samples": 10, "max_p95_latency": 2.0})
+    limiter.reclassify("proxy_ban")
+    assert limiter._failures == 0
+    for _ in range(5):
+        limiter.record("ok", 0.5)
+    limiter.reclassify("proxy_ban")
+    limiter.reclassify("ok")
+    assert limiter._failures == 1
+    assert limiter._latencies == [0.5] * 5
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_wait_does_not_hold_slot():
+    checker = Checker(proxies=[], user_agents=[], shop_config={}, exceptions=[], exceptions_repricer=[])
+    checker.proxy_pool = ProxyPool([{"url": "http://10.0.0.1:8080", "auth": None}])
+    checker.limiter = AdaptiveLimiter({"initial": 2, "max": 2})
+    token = asyncio.Event()
+    in_flight = []
+
+    class RateLimiter:
+        async def acquire(self, proxy_key=None):
+            await token.wait()
+
+    async def fetch(item_data, proxy, headers=None):
+        in_flight.append(checker.limiter.in_flight)
+        item_data["page"] = "<html></html>"
+        return item_data
+
+    checker.rate_limiter = RateLimiter()
+    checker.fetch = fetch
+    task = asyncio.create_task(checker.fetch_random_proxy({"sku": "sku1", "supplier_link": "http://ebay.test/itm/1"}))
+    await asyncio.sleep(0.01)
+    assert checker.limiter.in_flight == 0
+    token.set()
+    await task
+    assert in_flight == [1]
+    assert checker.limiter.in_flight == 0
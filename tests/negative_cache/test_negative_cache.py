@@ -0,0 +1,58 @@
+import pytest
+from checker_plus.negative_cache import NegativeCache
+
+DAY = 24 * 3600
+
+
+def test_negative_cache_ttl_and_backoff(tmp_path):
+    path = str(tmp_path / "negative_cache.json")
+    cache = NegativeCache(path, {"probe_rate": 0, "ttl": {"out_of_stock": DAY}})
+    cache.add("123456789012", "out_of_stock", ("{out_of_stock}", None), now=0)
+    assert cache.lookup("123456789012", now=DAY - 1)["exception"] == ["{out_of_stock}", None]
+    assert cache.lookup("123456789012", now=DAY) is None
+
+    cache.add("123456789012", "out_of_stock", ("{out_of_stock}", None), now=DAY)
+    assert cache.entries["123456789012"]["until"] == DAY + 2 * DAY
+
+    cache.save()
+    assert NegativeCache(path).entries == cache.entries
+    cache.discard("123456789012")
+    assert cache.lookup("123456789012", now=DAY) is None
+    assert cache.report() == {"entries": 0, "hits": 1, "probes": 0, "added": 2, "revived": 1}
+
+
+def test_negative_cache_probe_and_exceptions(tmp_path):
+    cache = NegativeCache(str(tmp_path / "negative_cache.json"), {"probe_rate": 1})
+    assert not cache.add_exception("123456789012", ("{supplier_not_in_usa}", "Поставщик не в США."))
+    assert not cache.add_exception("123456789012", None)
+    assert cache.add_exception("123456789012", ("{link_on_catalog}", "Ссылка на каталог товаров."))
+    assert cache.entries["123456789012"]["reason"] == "link_on_catalog"
+    assert cache.lookup("123456789012", now=0) is None
+    assert cache.probes == 1
+
+
+def test_negative_cache_max_entries(tmp_path):
+    path = str(tmp_path / "negative_cache.json")
+    cache = NegativeCache(path, {"max_entries": 2, "ttl": {"not_found": DAY}})
+    for i, now in enumerate([3 * DAY, 0, 2 * DAY]):
+        cache.add(str(i), "not_found", now=now)
+    cache.save()
+    assert sorted(NegativeCache(path).entries) == ["0", "2"]
+
+
+def test_negative_cache_save_keeps_old_file_on_failure(tmp_path, monkeypatch):
+    path = str(tmp_path / "negative_cache.json")
+    cache = NegativeCache(path)
+    cache.add("1", "not_found", now=0)
+    cache.save()
+
+    def crash(file_path, data):
+        with open(file_path, "w") as file:
+            file.write('{"2": ')
+        raise OSError("disk full")
+
+    monkeypatch.setattr("checker_plus.negative_cache.write_json", crash)
+    cache.add("2", "not_found", now=0)
+    with pytest.raises(OSError):
+        cache.save()
+    assert list(NegativeCache(path).entries) == ["1"]
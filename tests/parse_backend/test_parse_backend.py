@@ -0,0 +1,46 @@
+import pytest
+from checker_plus.parse_backend import create_parse_backend, InlineParseBackend, ProcessParseBackend
+from checker_plus.parser import ParseResult
+
+PAGE = """
+<title>Test Item | eBay</title>
+<script>{"price":"43.54","shippingRate":{"value":"8.95"},"maxValue":"322"}</script>
+<span class=ux-textspans>MPN</span><span class=ux-textspans>TEST57433577</span>
+"""
+FIELDS = {"supplier_price": True, "supplier_shipping": True, "supplier_qty": True, "part_number": True,
+          "title": False}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("config", [{"type": "inline"}, {"type": "process", "workers": 1}])
+async def test_parse_backend(config):
+    backend = create_parse_backend(config)
+    try:
+        result = await backend.parse(PAGE, "drop", FIELDS)
+    finally:
+        await backend.close()
+
+    assert result == ParseResult(
+        variation=False, exception=None, proxy_ban=False,
+        fields={"supplier_price": "43.54", "supplier_shipping": "8.95", "supplier_qty": "322",
+                "part_number": "TEST57433577"}
+    )
+
+
+@pytest.mark.asyncio
+async def test_process_backend_exception_page():
+    backend = ProcessParseBackend(workers=1)
+    try:
+        result = await backend.parse("<h1>This listing was ended</h1>", "drop", FIELDS)
+    finally:
+        await backend.close()
+
+    assert result.exception == ("{out_of_stock}", None)
+    assert result.fields == {}
+
+
+def test_create_parse_backend():
+    assert isinstance(create_parse_backend({"type": "inline"}), InlineParseBackend)
+    assert create_parse_backend({"workers": 3}).workers == 3
+    with pytest.raises(ValueError):
+        create_parse_backend({"type": "thread"})
@@ -0,0 +1,46 @@
+import pytest
+from checker_plus.parser import EbayParser
+
+PAGE = """
+<span class=ux-textspans>Brand</span><span class=ux-textspans>Acme</span>
+<span class=ux-textspans>Color Family</span><span class=ux-textspans>Warm</span>
+<span class=ux-textspans>Color</span><span class=ux-textspans>Red</span>
+<span class=ux-textspans>Manufacturer Part Number</span><span class=ux-textspans>AC-100</span>
+<span class=ux-textspans>Item Length {some data}</span><span class=ux-textspans>10 in</span>
+"""
+
+
+def test_get_item_specifics(valid_html):
+    item_specifics = EbayParser(valid_html)._get_item_specifics()
+    assert item_specifics["mpn {some data}"] == "TEST57433577"
+    assert item_specifics["item height {some data}"] == "test height"
+
+
+@pytest.mark.parametrize("labels, expected_value", [
+    (["Color"], "Red"),
+    (["MPN", "Manufacturer Part Number"], "AC-100"),
+    (["item length"], "10 in"),
+    (["Voltage"], None),
+])
+def test_get_item_specific(labels, expected_value):
+    assert EbayParser(PAGE)._get_item_specific(labels) == expected_value
+
+
+def test_get_dimensions_lwh_single_tokenization(valid_html):
+    parser = EbayParser(valid_html)
+    assert parser._get_dimensions_lwh() == "test length x test width x test height"
+    item_specifics = parser._item_specifics
+    parser._get_color()
+    assert parser._item_specifics is item_specifics
+
+
+def test_get_item_specifics_only_in_block():
+    page = ('<span class=ux-textspans>Color</span><span class=ux-textspans>Blue</span>'
+            '<div class="ux-layout-section--features">'
+            '<span class=ux-textspans>Color</span><span class=ux-textspans>Red</span></div>'
+            '<div class="x-item-description"><span class=ux-textspans>Voltage</span>'
+            '<span class=ux-textspans>220V</span></div>')
+    parser = EbayParser(page)
+    assert parser._get_color() == "Red"
+    assert parser._get_voltage() is None
+    assert list(parser._item_specifics) == ["color"]
@@ -0,0 +1,40 @@
+from checker_plus.parser import EbayParser
+
+PAGE = """
+<script>$state = {"item":{"price":"25.00","shippingRate":{"value":"3.10"},"maxValue":"12",
+"delivery":[{"_type":"TextSpan","text":"Get it between "},{"_type":"TextSpan","text":"Mon, Oct 20"},
+{"_type":"TextSpan","text":" and "},{"_type":"TextSpan","text":"Fri, Oct 24"}]}};</script>
+<script>{"related":{"shippingRate":{"value":"0.00"}},"value":"77.77"}</script>
+"""
+
+
+def test_item_state_values():
+    parser = EbayParser(PAGE)
+    assert parser._get_price() == "25.00"
+    assert parser._get_shipping_price() == "3.10"
+    assert parser._get_quantity() == "12"
+    assert parser._get_state_delivery_date(parser._get_item_state()) == "Fri, Oct 24"
+
+
+def test_item_state_decoded_once(monkeypatch):
+    calls = []
+    parser = EbayParser(PAGE)
+    original = EbayParser._get_item_state
+
+    def counting(self):
+        calls.append(self._item_state_loaded)
+        return original(self)
+
+    monkeypatch.setattr(EbayParser, "_get_item_state", counting)
+    parser._get_price()
+    parser._get_shipping_price()
+    parser._get_quantity()
+    assert calls == [False, True, True]
+
+
+def test_item_state_fallback_to_regex(valid_html):
+    parser = EbayParser(valid_html)
+    assert parser._get_item_state() is None
+    assert parser._get_price() == "43.54"
+    assert parser._get_shipping_price() == "8.95"
+    assert parser._get_quantity() == "322"
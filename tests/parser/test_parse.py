@@ -0,0 +1,27 @@
+import pytest
+from checker_plus.parser import EbayParser, parse_page
+
+
+def test_parse_variation(valid_html):
+    result = EbayParser(valid_html).parse("drop", {"supplier_price": True})
+    assert result.variation is True
+    assert result.fields == {}
+
+
+def test_parse_only_requested_fields():
+    page = '<script>"price":"12.50","maxValue":"3"</script>'
+    result = parse_page(page, "drop", {"supplier_price": True, "supplier_qty": False})
+    assert result.exception is None
+    assert result.fields == {"supplier_price": "12.50"}
+
+
+@pytest.mark.parametrize("page_chunk, expected_exception, expected_proxy_ban", [
+    ("<span>This item does not ship to United Kingdom</span>", ("{proxy_ban}", None), True),
+    ("<span>This item does not ship to USA</span>", ("{supplier_not_in_usa}", "Поставщик не в США."), False),
+    ('<div class="cat-wrapper"></div>',
+     ("{link_on_catalog}", "Ссылка на каталог товаров, а не на карточку товара."), False),
+])
+def test_parse_exceptions(page_chunk, expected_exception, expected_proxy_ban):
+    result = parse_page(page_chunk, "drop", {"supplier_price": True})
+    assert result.exception == expected_exception
+    assert result.proxy_ban is expected_proxy_ban
@@ -0,0 +1,38 @@
+import pytest
+from checker_plus.parser import EbayParser, parse_page
+
+FIELDS = {
+    "supplier_price": True, "supplier_shipping": True, "supplier_qty": True, "supplier_days": True,
+    "supplier_name": True, "part_number": True, "product_dimensions": True, "color": True, "title": True
+}
+
+PAGE = """<title>Лампа &amp; Co | eBay</title>
+<script>$state = {"item":{"price":"25.00","shippingRate":{"value":"3.10"},"maxValue":"12"}};</script>
+<div class="vim x-sellercard-atf">"_ssn":"продавец",</div>
+<span class=ux-textspans>Color</span><span class=ux-textspans>Красный</span>
+<span>This item does not ship to Canada</span>
+"""
+
+
+@pytest.mark.parametrize("page", [
+    PAGE,
+    PAGE.replace("does not ship to Canada", "ships to USA"),
+    "<h1>This listing was ended</h1>",
+    "<option value=-1>Choose</option>",
+])
+def test_parse_bytes_same_as_str(page):
+    assert parse_page(page.encode("utf-8"), "drop", FIELDS) == parse_page(page, "drop", FIELDS)
+
+
+def test_parse_bytes_fields():
+    result = parse_page(PAGE.replace("does not ship to Canada", "ships to USA").encode("utf-8"), "drop", FIELDS)
+    assert result.fields["title"] == "Лампа & Co"
+    assert result.fields["supplier_name"] == "продавец"
+    assert result.fields["color"] == "Красный"
+    assert result.fields["supplier_price"] == "25.00"
+
+
+def test_parse_bytes_page_fixture(valid_html):
+    parser = EbayParser(valid_html.encode("utf-8"))
+    assert parser._get_price() == "43.54"
+    assert parser._get_part_number() == "TEST57433577"
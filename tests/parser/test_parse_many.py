@@ -0,0 +1,38 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from checker_plus.parser import EbayParser, ParseResult, parse_pages
+
+PAGES = [
+    '<script>{"price":"10.50","maxValue":"3"}</script><span class=ux-textspans>MPN</span>'
+    '<span class=ux-textspans>X-1</span>',
+    None,
+    "<h1>This listing was ended</h1>",
+    "<option value=-1>Choose</option>",
+]
+FIELDS = {"supplier_price": True, "supplier_qty": True, "part_number": True, "supplier_name": False}
+EXPECTED = [
+    ParseResult(False, None, False, {"supplier_price": "10.50", "supplier_qty": "3", "part_number": "X-1"}),
+    None,
+    ParseResult(False, ("{out_of_stock}", None), False, {}),
+    ParseResult(True, None, False, {}),
+]
+
+
+def test_parse_many():
+    assert EbayParser.parse_many(PAGES, FIELDS, "drop") == EXPECTED
+
+
+def test_parse_many_only_requested_fields():
+    result = EbayParser.parse_many(PAGES[:1], {"supplier_price": True})
+    assert result[0].fields == {"supplier_price": "10.50"}
+
+
+@pytest.mark.parametrize("executor_class", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_parse_pages_in_executor(executor_class):
+    with executor_class(max_workers=2) as executor:
+        result = executor.submit(parse_pages, PAGES, "drop", FIELDS).result()
+    assert result == EXPECTED
+
+
+def test_parser_has_no_instance_dict():
+    assert not hasattr(EbayParser("<html></html>"), "__dict__")
@@ -0,0 +1,57 @@
+import pytest
+from checker_plus.parser import EbayParser, TriggerScanner
+
+
+@pytest.mark.parametrize("page_chunk, expected_classes", [
+    ("<h1>This listing was ended</h1><span>Local pickup only</span>", {"out_of_stock"}),
+    ("<select><option value=-1>Select</option></select><h1>CURRENTLY SOLD OUT</h1>",
+     {"variation"}),
+    ("<span>Local pickup only</span><span>does not ship to Canada</span>", {"not_ship_to_usa", "pick_up"}),
+    ('<div class="cat-wrapper"></div><span>local PICKUP only</span>', {"catalog_link"}),
+    ("<h1>This listing was ended</h1><span>does not ship to Canada</span>", {"out_of_stock", "not_ship_to_usa"}),
+    ("<span>Nothing here</span>", set()),
+])
+def test_trigger_scanner_scan(page_chunk, expected_classes):
+    found = EbayParser.TRIGGER_SCANNER.scan(page_chunk.lower())
+    assert set(found) == expected_classes
+
+
+def test_trigger_scanner_not_ship_country():
+    found = EbayParser.TRIGGER_SCANNER.scan("<span>this item does not ship to united kingdom</span>")
+    assert found["not_ship_to_usa"].group(1) == "united kingdom"
+
+
+def test_trigger_scanner_rejects_uppercase_escapes():
+    with pytest.raises(ValueError):
+        TriggerScanner({"bad": [r"\S+ listing"]}, decisive=set())
+
+
+@pytest.mark.parametrize("page_chunk, strategy", [
+    ("<span>This item does not ship to United Kingdom</span>", "drop"),
+    ("<span>This item does not ship to USA</span>", "drop"),
+    ("<span>This item does not ship to USA</span>", "listings"),
+    ("<span>Local pickup only</span>", "drop"),
+    ('<div class="cat-wrapper"></div>', "drop"),
+    ("<h1>This item is out of stock.</h1>", "listings"),
+    ("<h1>This item is out of stock.</h1><span>This item does not ship to Canada</span>", "drop"),
+])
+def test_look_triggers_matches_single_checks(page_chunk, strategy):
+    single_pass = EbayParser(page_chunk)
+    single_pass._look_triggers(strategy)
+
+    separate = EbayParser(page_chunk)
+    separate._look_out_of_stock_triggers()
+    separate._look_pick_up_trigger()
+    separate._look_catalog_trigger()
+    separate._look_not_shipping_to_usa_trigger(strategy)
+    separate._look_variation_trigger()
+
+    assert single_pass._check_exceptions() == separate._check_exceptions()
+    assert single_pass.proxy_ban is separate.proxy_ban
+
+
+def test_look_triggers_sets_proxy_ban_with_decisive_trigger():
+    parser = EbayParser("<h1>This listing was ended</h1><span>This item does not ship to Canada</span>")
+    parser._look_triggers("drop")
+    assert parser.out_of_stock
+    assert parser.proxy_ban
@@ -0,0 +1,99 @@
+import pytest
+import asyncio
+from checker_plus.pipeline import Pipeline
+
+
+async def fetch(item):
+    await asyncio.sleep(0)
+    item["page"] = f"<html>{item['sku']}</html>"
+    return item
+
+
+async def parse(item):
+    item["parsed"] = item.pop("page").upper()
+    return item
+
+
+@pytest.mark.asyncio
+async def test_pipeline_processes_all_items():
+    written = []
+    source = [{"sku": f"sku{i}"} for i in range(53)]
+    pipeline = Pipeline(source, fetch, parse, written.append, fetchers=5, parsers=2, queue_size=4, write_batch=10)
+
+    report = await pipeline.run()
+
+    rows = [row for batch in written for row in batch]
+    assert sorted(row["sku"] for row in rows) == sorted(row["sku"] for row in source)
+    assert all(row["parsed"] == f"<HTML>{row['sku'].upper()}</HTML>" for row in rows)
+    assert all(len(batch) <= 10 for batch in written)
+    assert report["fetch"]["processed"] == 53
+    assert report["parse"]["processed"] == 53
+    assert report["write"]["processed"] == 53
+
+
+@pytest.mark.asyncio
+async def test_pipeline_queues_are_bounded():
+    async def slow_parse(item):
+        await asyncio.sleep(0.001)
+        return item
+
+    source = [{"sku": f"sku{i}"} for i in range(100)]
+    pipeline = Pipeline(source, fetch, slow_parse, lambda rows: None, fetchers=20, parsers=1, queue_size=3)
+
+    report = await pipeline.run()
+
+    assert report["parse"]["max_queue"] <= 3
+    assert report["write"]["max_queue"] <= 3
+
+
+@pytest.mark.asyncio
+async def test_pipeline_fetch_does_not_wait_for_writer():
+    fetched = asyncio.Event()
+    source = [{"sku": f"sku{i}"} for i in range(5)]
+
+    async def tracked_fetch(item):
+        item = await fetch(item)
+        if item["sku"] == "sku4":
+            fetched.set()
+        return item
+
+    def write(rows):
+        # Запись идет в отдельном потоке, поэтому к этому моменту все страницы уже получены.
+        assert fetched.is_set()
+
+    pipeline = Pipeline(source, tracked_fetch, parse, write, fetchers=5, parsers=1, queue_size=10, write_batch=5)
+    await pipeline.run()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_stage_error():
+    async def broken_parse(item):
+        raise ValueError("broken page")
+
+    pipeline = Pipeline([{"sku": "sku1"}], fetch, broken_parse, lambda rows: None, fetchers=2, parsers=1)
+    with pytest.raises(ValueError, match="broken page"):
+        await pipeline.run()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_requeue():
+    written = []
+    attempts = {}
+    pipeline = None
+
+    async def flaky_fetch(item):
+        attempts[item["sku"]] = attempts.get(item["sku"], 0) + 1
+        if item["sku"] == "sku0" and attempts["sku0"] < 3:
+            pipeline.requeue(item, 0.01)
+            return None
+        return await fetch(item)
+
+    source = [{"sku": f"sku{i}"} for i in range(10)]
+    pipeline = Pipeline(source, flaky_fetch, parse, written.extend, fetchers=2, parsers=1, queue_size=2)
+    report = await pipeline.run()
+
+    assert sorted(row["sku"] for row in written) == sorted(row["sku"] for row in source)
+    assert written[-1]["sku"] == "sku0"
+    assert attempts["sku0"] == 3
+    assert report["requeued"] == 2
+    assert report["write"]["processed"] == 10
@@ -0,0 +1,37 @@
+from checker_plus.planner import FetchPlanner
+from checker_plus.parser import ParseResult
+
+
+def make_result(price: float) -> ParseResult:
+    return ParseResult(fields={"supplier_price": price}, exception=None, variation=False, proxy_ban=False)
+
+
+def test_planner_coalesces_and_caches():
+    planner = FetchPlanner()
+    resumed = []
+    owner, follower, late = {"sku": "sku1"}, {"sku": "sku2"}, {"sku": "sku3"}
+
+    assert planner.claim("item", owner, resumed.append) == ("owner", None)
+    assert planner.claim("item", follower, resumed.append) == ("follower", None)
+    assert resumed == []
+
+    result = make_result(5.0)
+    planner.complete("item", result)
+    assert resumed == [follower]
+    assert follower["page_result"] is result
+    assert planner.claim("item", late, resumed.append) == ("cached", result)
+    assert planner.report() == {"unique": 1, "cached": 1, "coalesced": 1}
+
+
+def test_planner_fail_is_not_cached():
+    planner = FetchPlanner()
+    resumed = []
+    owner, follower = {"sku": "sku1"}, {"sku": "sku2"}
+
+    planner.claim("item", owner, resumed.append)
+    planner.claim("item", follower, resumed.append)
+    planner.fail("item", "Timeout error: link")
+    assert resumed == [follower]
+    assert follower["page"] == "Timeout error: link"
+    assert follower["page_shared"]
+    assert planner.claim("item", {"sku": "sku3"}, resumed.append) == ("owner", None)
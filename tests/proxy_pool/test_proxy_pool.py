@@ -0,0 +1,141 @@
+import pytest
+from checker_plus.checker import Checker
+from checker_plus.proxy_pool import ProxyPool
+
+
+def create_pool(count=3, **config):
+    return ProxyPool([{"url": f"http://10.0.0.{i}:8080", "auth": None} for i in range(count)], config)
+
+
+def test_acquire_prefers_healthy_proxy():
+    pool = create_pool(2)
+    healthy, slow = pool.states
+    for _ in range(20):
+        pool.record(healthy, "ok", 0.2)
+        pool.record(slow, "ok", 8.0)
+    picks = [pool.acquire() for _ in range(1000)]
+    assert picks.count(healthy) > picks.count(slow) * 2
+
+
+def test_failures_in_row_quarantine_and_probe():
+    pool = create_pool(2, max_failures_in_row=3, quarantine=0)
+    bad = pool.states[0]
+    for _ in range(3):
+        pool.record(bad, "timeout", 1.0)
+    assert bad.needs_probe
+    assert bad.timeouts == 3
+    assert pool.report()["quarantined"] == 1
+
+    # Карантин закончился: следующий запрос - пробный на этот прокси.
+    assert pool.acquire() is bad
+    assert bad.probing
+    assert pool.acquire() is pool.states[1]
+
+    pool.record(bad, "forbidden", 1.0)
+    assert bad.needs_probe and bad.strikes == 2
+
+    assert pool.acquire() is bad
+    pool.record(bad, "ok", 0.5)
+    assert not bad.needs_probe and bad.strikes == 0
+
+
+def test_release_keeps_probe_available():
+    pool = create_pool(2, max_failures_in_row=1, quarantine=0)
+    bad = pool.states[0]
+    pool.record(bad, "timeout")
+    assert pool.acquire() is bad
+    pool.release(bad)
+    assert not bad.probing and bad.needs_probe
+    assert pool.acquire() is bad
+
+
+def create_probing_checker():
+    checker = Checker(proxies=[], user_agents=[], shop_config={}, exceptions=["skip"], exceptions_repricer=[])
+    checker.proxy_pool = create_pool(2, max_failures_in_row=1, quarantine=0)
+    bad = checker.proxy_pool.states[0]
+    checker.proxy_pool.record(bad, "timeout")
+    return checker, bad
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("item_data", [{"sku": "sku1", "supplier_link": ""}, {"sku": "skip", "supplier_link": "l"}])
+async def test_probe_not_taken_without_request(item_data):
+    checker, bad = create_probing_checker()
+    item_data = await checker.fetch_random_proxy(item_data)
+    assert item_data["page"] is None and "page_proxy" not in item_data
+    assert not bad.probing
+    assert checker.proxy_pool.acquire() is bad
+
+
+@pytest.mark.asyncio
+async def test_probe_released_when_fetch_raises():
+    checker, bad = create_probing_checker()
+    checker.proxy_pool.states[1].needs_probe = True
+    checker.proxy_pool.states[1].quarantined_until = float("inf")
+
+    async def fail(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    checker.fetch = fail
+    with pytest.raises(RuntimeError):
+        await checker.fetch_random_proxy({"sku": "sku1", "supplier_link": "http://ebay.test/itm/1"})
+    assert not bad.probing and bad.needs_probe
+    assert checker.proxy_pool.acquire() is bad
+
+
+@pytest.mark.asyncio
+async def test_probe_released_when_page_served_by_hedge():
+    checker, bad = create_probing_checker()
+    checker.proxy_pool.states[1].needs_probe = True
+    checker.proxy_pool.states[1].quarantined_until = float("inf")
+    hedge = create_pool(1).states[0]
+
+    async def fetch(item_data, proxy, headers=None):
+        item_data["page"], item_data["page_proxy"] = "<html></html>", hedge
+        return item_data
+
+    checker.fetch = fetch
+    item_data = await checker.fetch_random_proxy({"sku": "sku1", "supplier_link": "http://ebay.test/itm/1"})
+    assert item_data["page_proxy"] is hedge
+    assert not bad.probing and bad.needs_probe
+    assert checker.proxy_pool.acquire() is bad
+
+
+def test_low_success_rate_quarantine():
+    pool = create_pool(1, min_samples=10, min_success_rate=0.5, max_failures_in_row=100)
+    state = pool.states[0]
+    for i in range(10):
+        pool.record(state, "ok" if i % 3 == 0 else "proxy_ban")
+    assert state.needs_probe
+    assert state.proxy_bans == 6
+
+
+def test_all_quarantined_returns_earliest():
+    pool = create_pool(2, max_failures_in_row=1, quarantine=100)
+    pool.record(pool.states[0], "timeout")
+    pool.record(pool.states[1], "timeout")
+    assert pool.acquire() is pool.states[0]
+
+
+@pytest.mark.asyncio
+async def test_proxy_auth_does_not_grow():
+    checker = Checker(proxies=["login:pass@127.0.0.1:8080", "login:pass@127.0.0.2:8080"], user_agents=[],
+                      shop_config={}, exceptions=[], exceptions_repricer=[])
+    await checker.proxy_auth()
+    await checker.proxy_auth()
+    await checker._prepare_proxies()
+    assert len(checker.auth_proxies) == 2
+    assert len(checker.proxy_pool) == 2
+
+
+@pytest.mark.parametrize("page, outcome", [
+    ("<html></html>", "ok"),
+    (b"<html></html>", "ok"),
+    ("403 Forbidden: link", "forbidden"),
+    ("Timeout error: link", "timeout"),
+    ("Server error 502: link", "server_error"),
+    (None, None),
+])
+def test_page_outcome(page, outcome):
+    checker = Checker(proxies=[], user_agents=[], shop_config={}, exceptions=[], exceptions_repricer=[])
+    assert checker.page_outcome(page) == outcome
@@ -0,0 +1,70 @@
+import time
+import pytest
+import asyncio
+from aiohttp import web
+from checker_plus.checker import Checker
+from checker_plus.rate_limit import TokenBucket
+
+
+async def start_proxy_server(hits: list) -> tuple[web.AppRunner, int]:
+    """
+    Mock сервер, который играет роль прокси: получает запрос на любой адрес и запоминает время запроса.
+    """
+    async def handler(_request):
+        hits.append(time.monotonic())
+        return web.Response(text="<html></html>", content_type="text/html")
+
+    app = web.Application()
+    app.router.add_route("GET", "/{tail:.*}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, site._server.sockets[0].getsockname()[1]
+
+
+def achieved_rate(hits: list) -> float:
+    return (len(hits) - 1) / (hits[-1] - hits[0])
+
+
+async def run_checker(rate_limit: dict, proxies_count: int, requests: int) -> list:
+    hits = [[] for _ in range(proxies_count)]
+    servers = [await start_proxy_server(proxy_hits) for proxy_hits in hits]
+    checker = Checker(proxies=[f"login:pass@127.0.0.1:{port}" for _, port in servers], user_agents=[],
+                      shop_config={"rate_limit": rate_limit}, exceptions=[], exceptions_repricer=[])
+    try:
+        await checker._prepare_proxies()
+        items = [{"sku": f"sku{i}", "supplier_link": f"http://ebay.test/itm/{i}"} for i in range(requests)]
+        await asyncio.gather(*(checker.fetch_random_proxy(item_data) for item_data in items))
+    finally:
+        await checker.session_manager.close()
+        for runner, _ in servers:
+            await runner.cleanup()
+    return hits
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_rate():
+    bucket = TokenBucket(rate=100, burst=5)
+    started = time.monotonic()
+    await asyncio.gather(*(bucket.acquire() for _ in range(55)))
+    elapsed = time.monotonic() - started
+    # 5 токенов есть сразу, остальные 50 появляются со скоростью 100 в секунду.
+    assert 0.45 <= elapsed < 0.7
+
+
+@pytest.mark.asyncio
+async def test_global_rate_against_mock_server():
+    hits = await run_checker({"global_rate": 40}, proxies_count=2, requests=30)
+    all_hits = sorted(hit for proxy_hits in hits for hit in proxy_hits)
+    assert len(all_hits) == 30
+    assert 40 * 0.75 <= achieved_rate(all_hits) <= 40 * 1.1
+
+
+@pytest.mark.asyncio
+async def test_per_proxy_rate_against_mock_server():
+    hits = await run_checker({"global_rate": 1000, "per_proxy_rate": 20}, proxies_count=2, requests=30)
+    assert sum(len(proxy_hits) for proxy_hits in hits) == 30
+    for proxy_hits in hits:
+        if len(proxy_hits) > 5:
+            assert achieved_rate(proxy_hits) <= 20 * 1.1
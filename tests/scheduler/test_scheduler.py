@@ -0,0 +1,59 @@
+from checker_plus.scheduler import CheckScheduler
+
+HOUR = 3600
+DAY = 24 * HOUR
+LINK = "https://www.ebay.com/itm/123456789012"
+
+
+def make_row(price: float, qty: int = 10, link: str = LINK) -> dict:
+    return {"sku": "sku1", "supplier_link": link, "supplier_price": price, "supplier_shipping": 0.0,
+            "supplier_qty": qty}
+
+
+def test_scheduler_backs_off_stable_items(tmp_path):
+    scheduler = CheckScheduler(str(tmp_path / "schedule.json"))
+    assert scheduler.due([make_row(5.0)], now=0) == [make_row(5.0)]
+
+    scheduler.observe([make_row(5.0)], now=0)
+    assert scheduler.history["sku1"]["next_due"] == HOUR
+    assert not scheduler.is_due(make_row(5.0), now=HOUR - 1)
+
+    scheduler.observe([make_row(5.0)], now=40 * DAY)
+    assert scheduler.history["sku1"]["next_due"] == 40 * DAY + 7 * DAY
+
+    scheduler.observe([make_row(6.0)], now=47 * DAY)
+    assert scheduler.history["sku1"]["next_due"] == 47 * DAY + HOUR
+
+
+def test_scheduler_low_stock_new_link_and_failed(tmp_path):
+    path = str(tmp_path / "schedule.json")
+    scheduler = CheckScheduler(path)
+    scheduler.observe([make_row(5.0, qty=2)], now=0)
+    scheduler.observe([make_row(5.0, qty=2)], now=40 * DAY)
+    assert scheduler.history["sku1"]["next_due"] == 40 * DAY + 3 * HOUR
+
+    assert scheduler.is_due(make_row(5.0, link="https://www.ebay.com/itm/223456789012"), now=40 * DAY)
+
+    scheduler.observe([make_row(9.0)], failed=["sku1"], now=41 * DAY)
+    assert scheduler.history["sku1"]["values"]["supplier_price"] == 5.0
+
+    scheduler.save()
+    assert CheckScheduler(path).history == scheduler.history
+
+
+def test_scheduler_out_of_stock_is_not_low_stock(tmp_path):
+    scheduler = CheckScheduler(str(tmp_path / "schedule.json"))
+    scheduler.observe([make_row(5.0, qty=0)], now=0)
+    scheduler.observe([make_row(5.0, qty=0)], now=40 * DAY)
+    assert scheduler.history["sku1"]["next_due"] == 40 * DAY + 7 * DAY
+
+
+def test_scheduler_save_prunes_oldest_checked(tmp_path):
+    path = tmp_path / "schedule.json"
+    scheduler = CheckScheduler(str(path), {"max_entries": 2})
+    for i in range(3):
+        scheduler.observe([{**make_row(5.0), "sku": f"sku{i}"}], now=i * HOUR)
+    scheduler.save()
+    assert set(scheduler.history) == {"sku1", "sku2"}
+    assert set(CheckScheduler(str(path)).history) == {"sku1", "sku2"}
+    assert not (tmp_path / "schedule.json.tmp").exists()
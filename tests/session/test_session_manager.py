@@ -0,0 +1,33 @@
+import pytest
+from checker_plus.session import SessionManager
+
+
+@pytest.mark.asyncio
+async def test_get_session_reuses_session():
+    manager = SessionManager()
+    first = await manager.get_session()
+    second = await manager.get_session()
+    assert first is second
+    await manager.close()
+    assert first.closed
+
+
+@pytest.mark.asyncio
+async def test_get_session_after_close():
+    manager = SessionManager()
+    first = await manager.get_session()
+    await manager.close()
+    second = await manager.get_session()
+    assert second is not first
+    assert not second.closed
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_session_config():
+    manager = SessionManager({"limit": 7, "limit_per_host": 3})
+    session = await manager.get_session()
+    assert session.connector.limit == 7
+    assert session.connector.limit_per_host == 3
+    assert manager.config["ttl_dns_cache"] == SessionManager.DEFAULT_CONFIG["ttl_dns_cache"]
+    await manager.close()
@@ -0,0 +1,60 @@
+import math
+import struct
+from checker_plus.snapshot import StateSnapshot, to_number
+
+
+def make_row(sku, price, qty, days="3days"):
+    return {"sku": sku, "supplier_price": price, "supplier_shipping": "0.00", "supplier_qty": qty,
+            "supplier_days": days}
+
+
+def test_to_number():
+    assert to_number("5.50") == 5.5
+    assert to_number("13days") == 13.0
+    assert to_number(2) == 2.0
+    assert math.isnan(to_number(""))
+    assert math.isnan(to_number(None))
+
+
+def test_snapshot_diff_update_and_mmap(tmp_path):
+    path = str(tmp_path / "snapshot.bin")
+    snapshot = StateSnapshot(path)
+    counters, changed = snapshot.diff([make_row("00123", "5.00", 3)])
+    assert changed == {"00123"}
+    assert counters["new_sku"] == 1
+    snapshot.update([make_row("00123", "5.00", 3), make_row("sku2", "", 0)])
+    snapshot.save()
+
+    snapshot = StateSnapshot(path)
+    assert len(snapshot) == 2
+    assert snapshot.get("00123") == (5.0, 0.0, 3.0, 3.0)
+    assert math.isnan(snapshot.get("sku2")[0])
+
+    counters, changed = snapshot.diff([make_row("00123", "6.00", 0), make_row("sku2", "", 2), make_row("sku3", 1, 1)])
+    assert changed == {"00123", "sku2", "sku3"}
+    assert counters == {"compared": 3, "new_sku": 1, "unchanged": 0, "new_price": 1, "new_ship_price": 0,
+                        "new_qty": 2, "new_days": 0, "stock_new": 1, "nones_new": 1}
+
+    snapshot.update([make_row("00123", "6.00", 0)])
+    snapshot.save()
+    snapshot = StateSnapshot(path)
+    assert snapshot.get("00123") == (6.0, 0.0, 0.0, 3.0)
+    assert snapshot.diff([make_row("00123", "6.00", 0)])[0]["unchanged"] == 1
+    snapshot.close()
+
+
+def test_snapshot_file_format(tmp_path):
+    path = str(tmp_path / "snapshot.bin")
+    snapshot = StateSnapshot(path)
+    snapshot.update([make_row("sku\n1", "5.00", 3), make_row("sku 2", "1.50", 1)])
+    snapshot.save()
+
+    with open(path, "rb") as file:
+        data = file.read()
+    assert data[StateSnapshot.HEADER.size:StateSnapshot.HEADER.size + 16] == struct.pack("<2d", 5.0, 1.5)
+    assert data.endswith(struct.pack("<I", 5) + b"sku\n1" + struct.pack("<I", 5) + b"sku 2")
+
+    snapshot = StateSnapshot(path)
+    assert snapshot.skus == ["sku\n1", "sku 2"]
+    assert snapshot.get("sku\n1") == (5.0, 0.0, 3.0, 3.0)
+    snapshot.close()
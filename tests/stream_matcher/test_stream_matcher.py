@@ -0,0 +1,105 @@
+import pytest
+from aiohttp import web
+from checker_plus.checker import Checker
+from checker_plus.parser import parse_page
+from checker_plus.stream_matcher import StreamMatcher
+
+FIELDS = {"supplier_price": True, "supplier_qty": True, "title": True, "color": True}
+
+PAGE = (b'<title>Lamp | eBay</title>'
+        b'<script>$state = {"item":{"price":"25.00","shippingRate":{"value":"3.10"},"maxValue":"12"}};</script>'
+        b'<span class=ux-textspans>Color</span><span class=ux-textspans>Red</span>'
+        b'<footer>' + b'x' * 200_000 + b'</footer>')
+
+
+def feed_all(matcher: StreamMatcher, page: bytes, chunk_size: int) -> int:
+    for start in range(0, len(page), chunk_size):
+        if matcher.feed(page[start:start + chunk_size]):
+            return start + chunk_size
+    return len(page)
+
+
+def test_stops_after_fields_and_stop_marker():
+    matcher = StreamMatcher(FIELDS)
+    read = feed_all(matcher, PAGE, 64)
+    assert read < 1000
+    assert parse_page(bytes(matcher.buffer), "drop", FIELDS) == parse_page(PAGE, "drop", FIELDS)
+
+
+def test_reads_to_end_while_field_missing():
+    page = PAGE.replace(b"Color", b"Colour")
+    matcher = StreamMatcher(FIELDS)
+    assert feed_all(matcher, page, 64) == len(page)
+
+
+def test_stops_on_decisive_trigger_split_between_chunks():
+    page = b"<h1>This listing was ended</h1><footer>" + b"x" * 10_000
+    matcher = StreamMatcher(FIELDS)
+    assert feed_all(matcher, page, 10) < 100
+    assert matcher.decisive_seen
+    assert parse_page(bytes(matcher.buffer), "drop", FIELDS).exception == ("{out_of_stock}", None)
+
+
+def test_decisive_trigger_keeps_scanning_always_triggers():
+    page = (b"<h1>This listing was ended</h1>" + b"x" * 5_000 + b"<span>does not ship to Canada</span>"
+            + b"x" * 5_000 + b"<footer>" + b"x" * 10_000)
+    matcher = StreamMatcher(FIELDS)
+    read = feed_all(matcher, page, 64)
+    assert 5_000 < read < 6_000
+    streamed = parse_page(bytes(matcher.buffer), "drop", FIELDS)
+    assert streamed.proxy_ban
+    assert streamed == parse_page(page, "drop", FIELDS)
+
+
+def test_decisive_trigger_without_stop_marker_reads_whole_page():
+    page = b"<h1>This listing was ended</h1>" + b"x" * 10_000
+    matcher = StreamMatcher(FIELDS, stop_markers=[])
+    assert feed_all(matcher, page, 64) == len(page)
+
+
+def test_fields_checked_once_after_stop_marker(monkeypatch):
+    calls = []
+    original = StreamMatcher._fields_resolved
+
+    def counted(self):
+        calls.append(len(self.buffer))
+        return original(self)
+
+    monkeypatch.setattr(StreamMatcher, "_fields_resolved", counted)
+    page = PAGE.replace(b"Color", b"Colour")
+    assert feed_all(StreamMatcher(FIELDS), page, 64) == len(page)
+    assert len(calls) == 1
+
+
+def test_no_stop_markers_reads_whole_page():
+    matcher = StreamMatcher(FIELDS, stop_markers=[])
+    assert feed_all(matcher, PAGE, 4096) == len(PAGE)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("raw_body", [True, False])
+async def test_request_streamed(raw_body):
+    async def handler(_request):
+        return web.Response(body=PAGE, content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/itm/1", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    checker = Checker(proxies=[], user_agents=[], exceptions=[], exceptions_repricer=[], shop_config={
+        "raw_body": raw_body, "what_need_to_parse": FIELDS, "stream": {"chunk_size": 1024}
+    })
+    try:
+        page = await checker.request(f"http://127.0.0.1:{port}/itm/1", None)
+    finally:
+        await checker.session_manager.close()
+        await runner.cleanup()
+
+    assert isinstance(page, bytes if raw_body else str)
+    assert len(page) < len(PAGE)
+    assert checker.report["stream"]["early_stops"] == 1
+    assert parse_page(page, "drop", FIELDS) == parse_page(PAGE, "drop", FIELDS)
@@ -0,0 +1,101 @@
+import time
+import pytest
+import asyncio
+from aiohttp import web
+from checker_plus.checker import Checker
+from checker_plus.timeouts import TimeoutPolicy
+
+
+def test_deadline_default_then_adaptive():
+    policy = TimeoutPolicy({"min_samples": 5, "multiplier": 2.0, "first_byte": {"min": 0.5}})
+    assert policy.deadline("proxy1", "first_byte") == 15.0
+    for _ in range(5):
+        policy.observe("proxy1", "first_byte", 1.0)
+    assert policy.deadline("proxy1", "first_byte") == 2.0
+    # У нового прокси своих замеров нет, берутся общие.
+    assert policy.deadline("proxy2", "first_byte") == 2.0
+    for _ in range(5):
+        policy.observe("proxy2", "first_byte", 0.01)
+    assert policy.deadline("proxy2", "first_byte") == 0.5
+
+
+def test_client_timeout_excludes_pool_wait():
+    timeout = TimeoutPolicy.client_timeout({"connect": 2.0, "first_byte": 5.0, "read": 30.0})
+    assert timeout.connect is None
+    assert timeout.sock_connect == 2.0
+    assert timeout.sock_read == 5.0
+    assert timeout.total is None
+
+
+def test_deadline_clamped_and_histogram():
+    policy = TimeoutPolicy({"min_samples": 1})
+    policy.observe(None, "connect", 0.001)
+    policy.observe(None, "read", 100)
+    timeouts = policy.timeouts(None)
+    assert timeouts == {"connect": 1.0, "first_byte": 15.0, "read": 30.0}
+    report = policy.report()
+    assert report["connect"]["histogram"] == {"<=1s": 1}
+    assert report["first_byte"]["histogram"] == {"<=20s": 1}
+    assert report["read"]["histogram"] == {"<=30s": 1}
+
+
+async def start_server(handler) -> tuple[web.AppRunner, str]:
+    app = web.Application()
+    app.router.add_get("/itm/{item_id}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+
+async def request(handler, timeouts: dict) -> tuple[Checker, str, float]:
+    runner, base_url = await start_server(handler)
+    checker = Checker(proxies=[], user_agents=[], shop_config={"timeouts": timeouts}, exceptions=[],
+                      exceptions_repricer=[])
+    try:
+        started = time.monotonic()
+        page = await checker.request(f"{base_url}/itm/1", None)
+        elapsed = time.monotonic() - started
+    finally:
+        await checker.session_manager.close()
+        await runner.cleanup()
+    return checker, page, elapsed
+
+
+@pytest.mark.asyncio
+async def test_silent_server_fails_on_first_byte():
+    async def handler(_request):
+        await asyncio.sleep(1)
+        return web.Response(text="late")
+
+    checker, page, elapsed = await request(handler, {"first_byte": {"default": 0.2, "min": 0.1}})
+    assert page.startswith("Timeout error (first_byte)")
+    assert elapsed < 1
+    assert checker.timeout_policy.report()["first_byte"]["expired"] == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_body_fails_on_read():
+    async def handler(request):
+        response = web.StreamResponse()
+        await response.prepare(request)
+        for _ in range(20):
+            await response.write(b"x" * 100)
+            await asyncio.sleep(0.05)
+        return response
+
+    checker, page, elapsed = await request(handler, {"read": {"default": 0.2, "min": 0.1}})
+    assert page.startswith("Timeout error (read)")
+    assert elapsed < 0.6
+
+
+@pytest.mark.asyncio
+async def test_successful_request_observes_phases():
+    async def handler(_request):
+        return web.Response(text="<html></html>")
+
+    checker, page, _ = await request(handler, {})
+    assert page == "<html></html>"
+    policy = checker.timeout_policy
+    assert all(len(policy.samples[phase][None]) == 1 for phase in ("connect", "first_byte", "read"))
@@ -0,0 +1,15 @@
+import pytest
+from checker_plus.utils import get_ebay_item_id
+
+
+@pytest.mark.parametrize("link, expect_result", [
+    ("https://www.ebay.com/itm/123456789012", "123456789012"),
+    ("https://www.ebay.com/itm/Some-Item-Title/123456789012?hash=item1c&var=0", "123456789012"),
+    ("https://ebay.com/itm/123456789012#desc", "123456789012"),
+    ("https://cgi.ebay.com/ws/eBayISAPI.dll?ViewItem&item=123456789012", "123456789012"),
+    ("https://www.ebay.com/str/some-store", None),
+    ("", None),
+    (None, None),
+])
+def test_get_ebay_item_id(link, expect_result):
+    assert get_ebay_item_id(link) == expect_result